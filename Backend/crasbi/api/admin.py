@@ -1,10 +1,86 @@
+from django.conf import settings
 from django.contrib import admin
-from .models import SourceConnection, Job, JobExecution
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+from .models import SourceConnection, Job, JobExecution, JobExecutionArchive, JobExecutionRollup
+from .estimation import estimated_row_count
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for very large tables: an unfiltered changelist takes its total
+    from catalog statistics instead of a full COUNT(*). Filtered changelists
+    are counted exactly, using the filter's index, so their totals and last
+    pages stay correct.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimated_row_count(queryset.model, queryset.db)
+            if estimate is not None:
+                return estimate
+        return queryset.order_by().count()
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Changelist settings for tables with millions of rows"""
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False  # Skips the second, unfiltered COUNT(*)
+    deferred_fields = []  # Large text columns loaded only when a single object is opened
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if self.deferred_fields:
+            queryset = queryset.defer(*self.deferred_fields)
+        return queryset
+
+
+def cached_lookups(key, load):
+    """Filter choices from a small table, cached instead of queried per changelist"""
+    return cache.get_or_set(f"admin-lookups:{key}", lambda: list(load()), settings.ADMIN_FILTER_CACHE_SECONDS)
+
+
+class SourceNameFilter(admin.SimpleListFilter):
+    """source_name choices from the connections table, not SELECT DISTINCT over the executions"""
+    title = 'source'
+    parameter_name = 'source_name'
+
+    def lookups(self, request, model_admin):
+        names = cached_lookups(
+            'source-names',
+            lambda: SourceConnection.objects.order_by('source_name').values_list('source_name', flat=True).distinct()
+        )
+        return [(name, name) for name in names]
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(source_name=self.value())
+        return queryset
+
+
+class SourceFilter(admin.SimpleListFilter):
+    """Source choices from (id, name) pairs instead of loading every SourceConnection"""
+    title = 'source'
+    parameter_name = 'source_id'
+
+    def lookups(self, request, model_admin):
+        return cached_lookups(
+            'source-ids',
+            lambda: SourceConnection.objects.order_by('source_name').values_list('id', 'source_name')
+        )
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(source_id=self.value())
+        return queryset
 
 @admin.register(SourceConnection)
 class SourceConnectionAdmin(admin.ModelAdmin):
-    list_display = ['source_name', 'db_type', 'host', 'port', 'username', 'is_active', 'inserted_by', 'created_at']
-    list_filter = ['db_type', 'is_active', 'created_at', 'updated_at']
+    list_display = ['source_name', 'db_type', 'host', 'port', 'username', 'is_active', 'is_destination', 'inserted_by', 'created_at']
+    list_filter = ['db_type', 'is_active', 'is_destination', 'created_at', 'updated_at']
     search_fields = ['source_name', 'host', 'username']
     ordering = ['-created_at']
     readonly_fields = ['created_at', 'updated_at', 'inserted_by']
@@ -12,13 +88,17 @@ class SourceConnectionAdmin(admin.ModelAdmin):
     
     fieldsets = (
         ('Connection Details', {
-            'fields': ('source_name', 'db_type', 'host', 'port')
+            'fields': ('source_name', 'db_type', 'host', 'port', 'database')
         }),
         ('Authentication', {
             'fields': ('username', 'password')
         }),
         ('Status', {
-            'fields': ('is_active',)
+            'fields': ('is_active', 'is_destination')
+        }),
+        ('Extract Throttling', {
+            'fields': ('max_concurrent_connections', 'max_rows_per_second', 'max_bytes_per_second', 'extract_windows'),
+            'classes': ('collapse',)
         }),
         ('Metadata', {
             'fields': ('inserted_by', 'created_at', 'updated_at'),
@@ -32,19 +112,22 @@ class SourceConnectionAdmin(admin.ModelAdmin):
         super().save_model(request, obj, form, change)
 
 @admin.register(Job)
-class JobAdmin(admin.ModelAdmin):
+class JobAdmin(LargeTableAdmin):
     list_display = ['job_name', 'source', 'source_table', 'target_table', 'created_by', 'created_at']
-    list_filter = ['source', 'created_at', 'updated_at']
-    search_fields = ['job_name', 'source_table', 'target_table']
+    list_filter = [SourceFilter, 'created_at']
+    list_select_related = ['source']
+    search_fields = ['^job_name', '^source_table', '^target_table']
     ordering = ['-created_at']
     readonly_fields = ['created_at', 'updated_at']
+    raw_id_fields = ['source', 'target_connection']
+    deferred_fields = ['job_query', 'insert_sql', 'column_mapping', 'transforms', 'quality_checks']
     
     fieldsets = (
         ('Job Details', {
             'fields': ('job_name', 'source')
         }),
         ('Tables', {
-            'fields': ('source_table', 'target_table')
+            'fields': ('source_table', 'target_table', 'target_connection')
         }),
         ('Query', {
             'fields': ('job_query',)
@@ -56,12 +139,16 @@ class JobAdmin(admin.ModelAdmin):
     )
 
 @admin.register(JobExecution)
-class JobExecutionAdmin(admin.ModelAdmin):
+class JobExecutionAdmin(LargeTableAdmin):
+    # Only denormalized columns are listed, so no joins are needed
     list_display = ['job_name', 'source_name', 'status', 'records_processed', 'execution_time_seconds', 'executed_by', 'executed_at']
-    list_filter = ['status', 'executed_at', 'completed_at', 'source_name']
-    search_fields = ['job_name', 'source_name', 'executed_by']
+    list_filter = ['status', 'executed_at', SourceNameFilter]
+    list_select_related = False
+    search_fields = ['^job_name', '^source_name', '=executed_by']
     ordering = ['-executed_at']
     readonly_fields = ['executed_at', 'completed_at', 'execution_time_seconds']
+    raw_id_fields = ['job']
+    deferred_fields = ['error_message', 'execution_log', 'query_plan', 'transform_timings', 'quality_report', 'anomalies']
     
     fieldsets = (
         ('Execution Details', {
@@ -82,3 +169,32 @@ class JobExecutionAdmin(admin.ModelAdmin):
     def has_add_permission(self, request):
         # Job executions are created automatically by the ETL process
         return False
+
+@admin.register(JobExecutionArchive)
+class JobExecutionArchiveAdmin(LargeTableAdmin):
+    list_display = ['job_name', 'source_name', 'status', 'records_processed', 'execution_time_seconds', 'executed_at', 'archived_at']
+    list_filter = ['status']
+    search_fields = ['^job_name', '^source_name', '=executed_by']
+    ordering = ['-executed_at']
+    exclude = ['payload']
+    deferred_fields = ['payload']
+
+    def has_add_permission(self, request):
+        # Archived executions are written by the retention policy
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+@admin.register(JobExecutionRollup)
+class JobExecutionRollupAdmin(admin.ModelAdmin):
+    list_display = ['job_name', 'source_name', 'day', 'status', 'executions', 'total_records', 'total_execution_seconds']
+    list_filter = ['status']
+    search_fields = ['job_name', 'source_name']
+    ordering = ['-day']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
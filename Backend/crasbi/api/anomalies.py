@@ -0,0 +1,92 @@
+import math
+from django.conf import settings
+from django.db import transaction
+from .models import Job
+
+
+# (metric, direction of the deviation) -> anomaly kind; deviations not listed are not flagged
+ANOMALY_KINDS = {
+    ('duration', 'high'): 'duration_spike',
+    ('throughput', 'low'): 'throughput_collapse',
+    ('rows', 'low'): 'row_count_drop',
+    ('rows', 'high'): 'row_count_spike',
+}
+
+
+def execution_metrics(execution):
+    """Duration, rows/sec and row count of a completed execution"""
+    duration = execution.execution_time_seconds
+    rows = execution.records_processed
+    metrics = {'duration': duration, 'rows': rows}
+    if duration and rows is not None:
+        metrics['throughput'] = rows / duration
+    return metrics
+
+
+def detect_anomalies(baseline, samples, metrics):
+    """
+    Compare an execution's metrics with a job's baseline. A metric is flagged
+    when it is more than ETL_ANOMALY_Z_SCORE standard deviations from the
+    moving mean and also more than ETL_ANOMALY_MIN_CHANGE of the mean away,
+    so a job whose runs barely vary is not flagged for a few seconds' noise.
+    """
+    if not baseline or samples < settings.ETL_ANOMALY_MIN_SAMPLES:
+        return []
+    anomalies = []
+    for metric, value in metrics.items():
+        stats = baseline.get(metric)
+        if stats is None or value is None:
+            continue
+        mean, std = stats['mean'], math.sqrt(stats['var'])
+        difference = value - mean
+        kind = ANOMALY_KINDS.get((metric, 'high' if difference > 0 else 'low'))
+        if kind is None:
+            continue
+        if abs(difference) > settings.ETL_ANOMALY_Z_SCORE * std and abs(difference) > settings.ETL_ANOMALY_MIN_CHANGE * abs(mean):
+            anomalies.append({
+                'kind': kind,
+                'metric': metric,
+                'value': round(value, 3),
+                'baseline': round(mean, 3),
+                'deviations': round(abs(difference) / std, 1) if std else None,
+            })
+    return anomalies
+
+
+def fold_into_baseline(baseline, metrics, alpha):
+    """Exponentially weighted mean and variance per metric, updated from one execution"""
+    baseline = dict(baseline or {})
+    for metric, value in metrics.items():
+        if value is None:
+            continue
+        stats = baseline.get(metric)
+        if stats is None:
+            baseline[metric] = {'mean': value, 'var': 0.0}
+            continue
+        difference = value - stats['mean']
+        increment = alpha * difference
+        baseline[metric] = {
+            'mean': stats['mean'] + increment,
+            'var': (1 - alpha) * (stats['var'] + difference * increment),
+        }
+    return baseline
+
+
+def update_runtime_baseline(job, execution):
+    """
+    Flag a completed execution against the job's runtime baseline, then fold
+    it into the baseline. Runs in constant time per execution: history is
+    never rescanned. The baseline is re-read under a row lock so concurrent
+    runs of the same job fold in one after the other instead of overwriting
+    each other. Returns the list of anomalies (empty when none).
+    """
+    metrics = execution_metrics(execution)
+    with transaction.atomic():
+        locked = Job.objects.select_for_update().only('id', 'runtime_baseline', 'runtime_baseline_samples').get(pk=job.pk)
+        anomalies = detect_anomalies(locked.runtime_baseline, locked.runtime_baseline_samples, metrics)
+        locked.runtime_baseline = fold_into_baseline(locked.runtime_baseline, metrics, settings.ETL_ANOMALY_BASELINE_ALPHA)
+        locked.runtime_baseline_samples += 1
+        locked.save(update_fields=['runtime_baseline', 'runtime_baseline_samples'])
+    job.runtime_baseline = locked.runtime_baseline
+    job.runtime_baseline_samples = locked.runtime_baseline_samples
+    return anomalies
@@ -0,0 +1,127 @@
+import sys
+from array import array
+import numpy as np
+
+
+# Python types held in typed array buffers; everything else stays a list of objects,
+# with repeated strings sharing one object
+ARRAY_TYPECODES = {
+    int: 'q',
+    float: 'd',
+    bool: 'b',
+}
+
+# NumPy dtype viewing each array typecode's buffer
+NUMPY_DTYPES = {
+    'q': np.int64,
+    'd': np.float64,
+    'b': np.int8,
+}
+
+
+class TypedColumn:
+    """
+    One column stored as a typed array plus a null mask (1 = NULL), so a batch
+    of numbers costs 8 bytes per value instead of a Python object per value.
+    Iterates as plain Python values with None for NULLs, so per-value code
+    can treat it like a list, while numpy() exposes the same buffers to
+    vectorized transforms without copying.
+    """
+
+    __slots__ = ('data', 'nulls', 'null_count', 'is_bool')
+
+    def __init__(self, data, nulls, null_count, is_bool=False):
+        self.data = data
+        self.nulls = nulls
+        self.null_count = null_count
+        self.is_bool = is_bool
+
+    @classmethod
+    def from_values(cls, typecode, values, is_bool=False):
+        """Pack values into an array; raises TypeError/OverflowError if they don't fit the typecode"""
+        nulls = bytearray(value is None for value in values)
+        null_count = nulls.count(1)
+        if null_count:
+            data = array(typecode, [0 if value is None else value for value in values])
+        else:
+            data = array(typecode, values)
+        return cls(data, nulls, null_count, is_bool)
+
+    @classmethod
+    def from_numpy(cls, typecode, values, nulls, is_bool=False):
+        """Copy NumPy values and a boolean null mask into a new column of the given typecode"""
+        data = array(typecode, np.ascontiguousarray(values, dtype=NUMPY_DTYPES[typecode]).tobytes())
+        nulls = np.ascontiguousarray(nulls, dtype=np.uint8)
+        return cls(data, bytearray(nulls.tobytes()), int(np.count_nonzero(nulls)), is_bool)
+
+    def numpy(self):
+        """
+        (values, nulls) as read-only NumPy views of the buffers; values under
+        a NULL are 0. Boolean columns come back as a bool array.
+        """
+        values = np.frombuffer(self.data, dtype=NUMPY_DTYPES[self.data.typecode])
+        if self.is_bool:
+            values = values.view(np.bool_)
+        nulls = np.frombuffer(self.nulls, dtype=np.bool_)
+        values.flags.writeable = False
+        nulls.flags.writeable = False
+        return values, nulls
+
+    def __len__(self):
+        return len(self.data)
+
+    def __iter__(self):
+        values = map(bool, self.data) if self.is_bool else iter(self.data)
+        if not self.null_count:
+            return values
+        return (None if null else value for value, null in zip(values, self.nulls))
+
+    def __getitem__(self, index):
+        if self.nulls[index]:
+            return None
+        value = self.data[index]
+        return bool(value) if self.is_bool else value
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def compress(self, mask):
+        """Rows where the boolean mask is true"""
+        values, nulls = self.numpy()
+        mask = np.asarray(mask, dtype=np.bool_)
+        return TypedColumn.from_numpy(self.data.typecode, values[mask], nulls[mask], self.is_bool)
+
+    @property
+    def nbytes(self):
+        return self.data.itemsize * len(self.data) + len(self.nulls)
+
+
+def _compact_strings(values):
+    # Share one str object between equal values (repeated codes, names):
+    # drivers return a fresh object per row even when the value repeats
+    shared = {}
+    intern = shared.setdefault
+    return [None if value is None else intern(value, value) for value in values]
+
+
+def pack_column(values, type_code):
+    """Store a column's values in the most compact buffer its type allows"""
+    typecode = ARRAY_TYPECODES.get(type_code)
+    if typecode is not None:
+        try:
+            return TypedColumn.from_values(typecode, values, type_code is bool)
+        except (TypeError, OverflowError):
+            # Values that don't match the declared type (mixed results, >64-bit ints)
+            pass
+    if type_code is str:
+        return _compact_strings(values)
+    return list(values)
+
+
+def column_nbytes(column):
+    """Approximate memory held by one column buffer"""
+    if isinstance(column, TypedColumn):
+        return column.nbytes
+    distinct = {id(value): value for value in column}
+    return sys.getsizeof(column) + sum(map(sys.getsizeof, distinct.values()))
+
@@ -0,0 +1,250 @@
+import json
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from .models import SourceConnection, Job
+from .transforms import TransformPipeline, TransformError
+from .quality import validate_quality_checks, QualityCheckError
+
+
+# Ids per IN (...) query; SQL Server allows at most 2100 parameters per statement
+ID_CHUNK_SIZE = 1000
+
+REQUIRED_FIELDS = ['job_name', 'source_table', 'target_table', 'job_query']
+
+# Plain values checked against the model fields before anything is looked up or written
+STRING_FIELDS = {
+    'job_name': Job, 'source_table': Job, 'target_table': Job, 'job_query': Job,
+    'source_name': SourceConnection, 'target_connection_name': SourceConnection,
+}
+ID_FIELDS = ['id', 'source', 'target_connection']
+BOOLEAN_FIELDS = ['profile_query', 'profile_execution']
+
+UPDATE_FIELDS = [
+    'job_name', 'source', 'source_table', 'target_table', 'target_connection',
+    'job_query', 'transforms', 'quality_checks', 'profile_query', 'profile_execution',
+    'updated_at',
+]
+
+
+class NDJSONParser(BaseParser):
+    """Parses newline delimited JSON (one job definition per line) into a list"""
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        items = []
+        for number, line in enumerate(stream, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError as e:
+                raise ParseError(f"Line {number}: {e}")
+        return items
+
+
+def export_jobs(queryset):
+    """
+    Yield one NDJSON line per job without loading the whole catalog into
+    memory. Connections are referenced by name so a catalog exported from one
+    environment can be imported into another.
+    """
+    rows = queryset.values(
+        'job_name', 'source__source_name', 'source_table', 'target_table',
+        'target_connection__source_name', 'job_query', 'transforms', 'quality_checks', 'profile_query',
+        'profile_execution',
+    ).order_by('id').iterator(chunk_size=2000)
+    for row in rows:
+        yield json.dumps({
+            'job_name': row['job_name'],
+            'source_name': row['source__source_name'],
+            'source_table': row['source_table'],
+            'target_table': row['target_table'],
+            'target_connection_name': row['target_connection__source_name'],
+            'job_query': row['job_query'],
+            'transforms': row['transforms'],
+            'quality_checks': row['quality_checks'],
+            'profile_query': row['profile_query'],
+            'profile_execution': row['profile_execution'],
+        }) + '\n'
+
+
+def _resolve_connections(items):
+    """Load every referenced connection in one query, indexed by id and by (unique) name"""
+    ids = set()
+    names = set()
+    for item in items:
+        for id_key, name_key in (('source', 'source_name'), ('target_connection', 'target_connection_name')):
+            if item.get(id_key) is not None:
+                ids.add(item[id_key])
+            elif item.get(name_key):
+                names.add(item[name_key])
+
+    by_id = {}
+    by_name = {}
+    if ids or names:
+        for connection in SourceConnection.objects.filter(Q(id__in=ids) | Q(source_name__in=names)):
+            by_id[connection.id] = connection
+            by_name.setdefault(connection.source_name, []).append(connection)
+    return by_id, by_name
+
+
+def _lookup_connection(item, id_key, name_key, by_id, by_name, errors):
+    if item.get(id_key) is not None:
+        connection = by_id.get(item[id_key])
+        if connection is None:
+            errors[id_key] = f"Invalid {id_key} id {item[id_key]}."
+        return connection
+    name = item.get(name_key)
+    if not name:
+        return None
+    matches = by_name.get(name, [])
+    if len(matches) != 1:
+        errors[name_key] = f"{'No' if not matches else 'More than one'} connection named {name}."
+        return None
+    return matches[0]
+
+
+def _existing_jobs(items, by_id, by_name):
+    """
+    Jobs that items may update: every job of the referenced sources plus any
+    job referenced by id, fetched with id lists kept under the SQL Server
+    parameter limit
+    """
+    source_ids = set(by_id)
+    source_ids.update(connection.id for matches in by_name.values() for connection in matches)
+    jobs = {job.id: job for job in Job.objects.filter(source_id__in=source_ids)}
+    missing_ids = sorted({
+        item['id'] for item in items
+        if isinstance(item, dict) and item.get('id') is not None and item['id'] not in jobs
+    })
+    for start in range(0, len(missing_ids), ID_CHUNK_SIZE):
+        for job in Job.objects.filter(id__in=missing_ids[start:start + ID_CHUNK_SIZE]):
+            jobs[job.id] = job
+    return jobs
+
+
+def _field_errors(item):
+    """Type and length errors of one job definition, using the model's max_length"""
+    errors = {}
+    for field, model in STRING_FIELDS.items():
+        value = item.get(field)
+        if value is None:
+            continue
+        if not isinstance(value, str):
+            errors[field] = 'Must be a string.'
+            continue
+        # Connection names are matched against SourceConnection.source_name
+        max_length = model._meta.get_field('source_name' if model is SourceConnection else field).max_length
+        if max_length and len(value) > max_length:
+            errors[field] = f'Ensure this field has no more than {max_length} characters.'
+    for field in ID_FIELDS:
+        value = item.get(field)
+        if value is not None and (not isinstance(value, int) or isinstance(value, bool)):
+            errors[field] = 'Must be an integer id.'
+    for field in BOOLEAN_FIELDS:
+        if field in item and not isinstance(item[field], bool):
+            errors[field] = 'Must be true or false.'
+    return errors
+
+
+def prepare_bulk_jobs(items, created_by):
+    """
+    Validate every job definition up front and split them into new and
+    existing jobs. Existing jobs are matched by id, or else by
+    (source, job_name). Returns (to_create, to_update, errors).
+    """
+    if not isinstance(items, list):
+        return [], [], [{'non_field_errors': ['Expected a list of job definitions.']}]
+
+    field_errors = [_field_errors(item) if isinstance(item, dict) else None for item in items]
+    # Only well-typed items are used for lookups (a list id is not hashable, for one)
+    valid_items = [item for item, errors in zip(items, field_errors) if errors == {}]
+    by_id, by_name = _resolve_connections(valid_items)
+    existing_by_id = _existing_jobs(valid_items, by_id, by_name)
+    existing_by_name = {(job.source_id, job.job_name): job for job in existing_by_id.values()}
+
+    now = timezone.now()
+    to_create = []
+    to_update = []
+    all_errors = []
+    seen = set()
+
+    for index, item in enumerate(items):
+        errors = {}
+        if not isinstance(item, dict):
+            all_errors.append({'index': index, 'errors': {'non_field_errors': 'Expected an object.'}})
+            continue
+        if field_errors[index]:
+            all_errors.append({'index': index, 'errors': field_errors[index]})
+            continue
+
+        for field in REQUIRED_FIELDS:
+            if not item.get(field):
+                errors[field] = 'This field is required.'
+        source = _lookup_connection(item, 'source', 'source_name', by_id, by_name, errors)
+        if source is None and 'source' not in errors and 'source_name' not in errors:
+            errors['source'] = 'source or source_name is required.'
+        target_connection = _lookup_connection(item, 'target_connection', 'target_connection_name', by_id, by_name, errors)
+        if target_connection is not None and not target_connection.is_destination:
+            errors['target_connection'] = f"{target_connection.source_name} is not marked as a destination."
+        transforms = item.get('transforms')
+        if transforms:
+            try:
+                TransformPipeline(transforms)
+            except (TransformError, TypeError, AttributeError) as e:
+                errors['transforms'] = str(e)
+        quality_checks = item.get('quality_checks')
+        try:
+            validate_quality_checks(quality_checks)
+        except QualityCheckError as e:
+            errors['quality_checks'] = str(e)
+
+        job = None
+        if item.get('id') is not None:
+            job = existing_by_id.get(item['id'])
+            if job is None:
+                errors['id'] = f"Job {item['id']} does not exist."
+        elif source is not None:
+            job = existing_by_name.get((source.id, item.get('job_name')))
+
+        key = (source.id if source else None, item.get('job_name'))
+        if key in seen:
+            errors['job_name'] = 'Duplicate job_name for this source in the same request.'
+        seen.add(key)
+
+        if errors:
+            all_errors.append({'index': index, 'errors': errors})
+            continue
+
+        values = {
+            'job_name': item['job_name'],
+            'source': source,
+            'source_table': item['source_table'],
+            'target_table': item['target_table'],
+            'target_connection': target_connection,
+            'job_query': item['job_query'],
+            'transforms': transforms or None,
+            'quality_checks': quality_checks or None,
+            'profile_query': bool(item.get('profile_query', False)),
+            'profile_execution': bool(item.get('profile_execution', False)),
+        }
+        if job is None:
+            to_create.append(Job(created_by=created_by, **values))
+        else:
+            for field, value in values.items():
+                setattr(job, field, value)
+            job.updated_at = now
+            to_update.append(job)
+
+    return to_create, to_update, all_errors
+
+
+def save_bulk_jobs(to_create, to_update, batch_size):
+    """Write all jobs with batched inserts and updates in a single transaction"""
+    with transaction.atomic():
+        Job.objects.bulk_create(to_create, batch_size=batch_size)
+        Job.objects.bulk_update(to_update, UPDATE_FIELDS, batch_size=batch_size)
@@ -0,0 +1,84 @@
+import queue
+import threading
+from contextlib import contextmanager
+import pyodbc
+from django.conf import settings
+
+
+class ConnectionPool:
+    """
+    Small thread-safe pool of pyodbc connections for one connection string.
+    Idle connections are reused; a connection that raised while checked out
+    is discarded instead of being returned to the pool.
+    """
+
+    def __init__(self, connection_string, max_idle):
+        self.connection_string = connection_string
+        self._idle = queue.LifoQueue(maxsize=max_idle)
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return pyodbc.connect(self.connection_string)
+
+    def _release(self, conn):
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    @contextmanager
+    def connection(self):
+        conn = self._acquire()
+        try:
+            yield conn
+        except BaseException:
+            conn.close()
+            raise
+        else:
+            self._release(conn)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def odbc_connection_string(source_connection):
+    """Build the ODBC connection string for a source connection"""
+    if source_connection.db_type == 'sqlserver':
+        return (
+            f"DRIVER={{ODBC Driver 18 for SQL Server}};"
+            f"SERVER={source_connection.host},{source_connection.port};"
+            f"DATABASE={source_connection.database};"
+            f"UID={source_connection.username};"
+            f"PWD={source_connection.password};"
+            f"Encrypt=yes;TrustServerCertificate=yes;"
+        )
+    else:
+        # Add support for other database types as needed
+        raise ValueError(f"Database type {source_connection.db_type} not yet supported")
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(connection_string):
+    """Return the process-wide pool for a connection string"""
+    with _pools_lock:
+        pool = _pools.get(connection_string)
+        if pool is None:
+            pool = _pools[connection_string] = ConnectionPool(connection_string, settings.ETL_CONNECTION_POOL_SIZE)
+        return pool
+
+
+def close_pools():
+    """Close every idle pooled connection"""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
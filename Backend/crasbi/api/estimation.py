@@ -0,0 +1,147 @@
+import heapq
+from datetime import timedelta
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Avg, Count, Sum
+from django.utils import timezone
+from .models import JobExecution
+from .schema import quote_identifier, split_table_name
+
+
+def catalog_table_stats(cursor, db_type, table_name):
+    """
+    Row count and size estimate for a source table from catalog statistics,
+    without scanning the table. Returns (rows, bytes) or None if unavailable.
+    """
+    schema_name, table = split_table_name(table_name)
+    if db_type == 'sqlserver':
+        cursor.execute(
+            "SELECT SUM(CASE WHEN ps.index_id IN (0, 1) THEN ps.row_count ELSE 0 END), "
+            "SUM(ps.used_page_count) * 8192 "
+            "FROM sys.dm_db_partition_stats ps "
+            "WHERE ps.object_id = OBJECT_ID(?)",
+            f"{schema_name}.{table}"
+        )
+    elif db_type == 'postgresql':
+        cursor.execute(
+            "SELECT c.reltuples::bigint, pg_total_relation_size(c.oid) "
+            "FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace "
+            "WHERE n.nspname = ? AND c.relname = ?",
+            'public' if schema_name == 'dbo' else schema_name, table
+        )
+    elif db_type == 'mysql':
+        # A MySQL schema is a database: an unqualified name means the connection's own
+        cursor.execute(
+            "SELECT TABLE_ROWS, DATA_LENGTH + INDEX_LENGTH FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = COALESCE(?, DATABASE()) AND TABLE_NAME = ?",
+            None if schema_name == 'dbo' else schema_name, table
+        )
+    else:
+        return None
+
+    row = cursor.fetchone()
+    if not row or row[0] is None:
+        return None
+    return int(row[0]), int(row[1] or 0)
+
+
+def sampled_row_count(cursor, db_type, table_name, percent=1):
+    """Approximate row count from a block sample of the table, or None if the dialect has no TABLESAMPLE"""
+    if db_type == 'sqlserver':
+        cursor.execute(f"SELECT COUNT_BIG(*) FROM {quote_identifier(table_name)} TABLESAMPLE ({percent} PERCENT)")
+    elif db_type == 'postgresql':
+        cursor.execute(f"SELECT COUNT(*) FROM {quote_identifier(table_name, db_type)} TABLESAMPLE SYSTEM ({percent})")
+    else:
+        return None
+    row = cursor.fetchone()
+    if not row or row[0] is None:
+        return None
+    return int(row[0] * 100 / percent)
+
+
+def historical_throughput(job_ids):
+    """
+    Aggregate recent completed executions per job in a single query.
+    Returns {job_id: {'rows_per_second', 'avg_rows', 'samples'}}.
+    """
+    since = timezone.now() - timedelta(days=settings.ETL_ESTIMATE_HISTORY_DAYS)
+    stats = (
+        JobExecution.objects
+        .filter(job_id__in=job_ids, status='completed', executed_at__gte=since, execution_time_seconds__gt=0)
+        .values('job_id')
+        .annotate(
+            total_rows=Sum('records_processed'),
+            total_seconds=Sum('execution_time_seconds'),
+            avg_rows=Avg('records_processed'),
+            samples=Count('id'),
+        )
+    )
+    result = {}
+    for entry in stats:
+        total_rows = entry['total_rows'] or 0
+        result[entry['job_id']] = {
+            'rows_per_second': total_rows / entry['total_seconds'] if entry['total_seconds'] else None,
+            'avg_rows': entry['avg_rows'],
+            'samples': entry['samples'],
+        }
+    return result
+
+
+def makespan(runtimes, workers):
+    """Completion time of a longest-processing-time-first schedule on the given number of workers"""
+    loads = [0.0] * max(workers, 1)
+    for runtime in sorted(runtimes, reverse=True):
+        lightest = heapq.heappop(loads)
+        heapq.heappush(loads, lightest + runtime)
+    return max(loads) if loads else 0.0
+
+
+def plan_concurrency(runtimes, target_window_seconds=None, max_concurrency=None):
+    """
+    Smallest worker count whose schedule fits the target window, capped at
+    max_concurrency. Returns (concurrency, predicted_makespan, fits_window).
+    """
+    max_concurrency = max_concurrency or settings.ETL_MAX_CONCURRENCY
+    runtimes = [runtime for runtime in runtimes if runtime]
+    if not runtimes:
+        return 1, 0.0, True
+    limit = min(max_concurrency, len(runtimes))
+    if not target_window_seconds:
+        return limit, makespan(runtimes, limit), True
+
+    for workers in range(1, limit + 1):
+        predicted = makespan(runtimes, workers)
+        if predicted <= target_window_seconds:
+            return workers, predicted, True
+    return limit, makespan(runtimes, limit), False
+
+
+# Row count of a metadata table from catalog statistics, per Django database vendor
+ESTIMATED_COUNT_QUERIES = {
+    'microsoft': (
+        "SELECT SUM(row_count) FROM sys.dm_db_partition_stats "
+        "WHERE object_id = OBJECT_ID(%s) AND index_id IN (0, 1)"
+    ),
+    'postgresql': "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)",
+    'mysql': (
+        "SELECT TABLE_ROWS FROM information_schema.TABLES "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s"
+    ),
+}
+
+
+def estimated_row_count(model, using=DEFAULT_DB_ALIAS):
+    """
+    Approximate row count of a model's table without a COUNT(*) scan, or
+    None when the backend has no catalog estimate (or the table was never analyzed)
+    """
+    connection = connections[using]
+    query = ESTIMATED_COUNT_QUERIES.get(connection.vendor)
+    if query is None:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(query, [model._meta.db_table])
+        row = cursor.fetchone()
+    if not row or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
@@ -0,0 +1,131 @@
+from rest_framework import serializers
+from .models import SourceConnection, JobExecution
+
+
+# One shared field instance per type: converting a whole column reuses it
+# instead of building a serializer and its fields for every row
+_datetime = serializers.DateTimeField().to_representation
+
+
+def _choices(choices):
+    labels = dict(choices)
+    return lambda value: labels.get(value, value)
+
+
+class FastListSerializer:
+    """
+    Serializes list responses from plain values_list() rows. Each column is
+    declared as (output key, ORM lookup, converter) in the same order and with
+    the same conversions as the ModelSerializer it mirrors, so the output is
+    identical but skips per-row serializer instances and per-field dispatch.
+    A converter of None passes the database value through unchanged: the
+    backend already returns the python type the serializer field would emit.
+    """
+
+    def __init__(self, columns):
+        self.keys = [key for key, _lookup, _convert in columns]
+        self.lookups = [lookup for _key, lookup, _convert in columns]
+        self.converters = [(index, convert) for index, (_key, _lookup, convert) in enumerate(columns) if convert]
+        self.constants = {}
+
+    def with_constant(self, key, value):
+        """Copy of this serializer that also emits a fixed trailing key (e.g. a field that is always None)"""
+        clone = FastListSerializer([])
+        clone.keys, clone.lookups, clone.converters = self.keys, self.lookups, self.converters
+        clone.constants = {**self.constants, key: value}
+        return clone
+
+    def values(self, queryset):
+        """
+        Narrow a queryset to the columns this serializer needs. Keys derived
+        from the same column (a choice and its label) repeat its lookup.
+        """
+        return queryset.values_list(*self.lookups)
+
+    def serialize(self, rows):
+        keys = self.keys
+        converters = self.converters
+        has_constants = bool(self.constants)
+        data = []
+        append = data.append
+        for row in rows:
+            if converters:
+                row = list(row)
+                for index, convert in converters:
+                    value = row[index]
+                    if value is not None:
+                        row[index] = convert(value)
+            item = dict(zip(keys, row))
+            if has_constants:
+                item.update(self.constants)
+            append(item)
+        return data
+
+
+# Mirrors SourceConnectionSerializer on list GETs, where connection_string is removed
+SOURCE_CONNECTION_LIST = FastListSerializer([
+    ('id', 'id', None),
+    ('source_name', 'source_name', None),
+    ('db_type', 'db_type', None),
+    ('db_type_display', 'db_type', _choices(SourceConnection.DB_TYPE_CHOICES)),
+    ('host', 'host', None),
+    ('port', 'port', None),
+    ('database', 'database', None),
+    ('username', 'username', None),
+    ('is_active', 'is_active', None),
+    ('is_destination', 'is_destination', None),
+    ('max_concurrent_connections', 'max_concurrent_connections', None),
+    ('max_rows_per_second', 'max_rows_per_second', None),
+    ('max_bytes_per_second', 'max_bytes_per_second', None),
+    ('extract_windows', 'extract_windows', None),
+    ('created_at', 'created_at', _datetime),
+    ('updated_at', 'updated_at', _datetime),
+    ('inserted_by_username', 'inserted_by', None),
+])
+
+# Without a request in context (ETL active_sources) the serializer keeps connection_string as None
+SOURCE_CONNECTION_LIST_NO_REQUEST = SOURCE_CONNECTION_LIST.with_constant('connection_string', None)
+
+# Mirrors JobSerializer
+JOB_LIST = FastListSerializer([
+    ('id', 'id', None),
+    ('job_name', 'job_name', None),
+    ('source', 'source_id', None),
+    ('source_name', 'source__source_name', None),
+    ('source_table', 'source_table', None),
+    ('target_table', 'target_table', None),
+    ('target_connection', 'target_connection_id', None),
+    ('job_query', 'job_query', None),
+    ('transforms', 'transforms', None),
+    ('quality_checks', 'quality_checks', None),
+    ('profile_query', 'profile_query', None),
+    ('profile_execution', 'profile_execution', None),
+    ('query_time_baseline', 'query_time_baseline', None),
+    ('created_at', 'created_at', _datetime),
+    ('updated_at', 'updated_at', _datetime),
+    ('inserted_by_username', 'created_by', None),
+])
+
+# Mirrors JobExecutionSummarySerializer
+JOB_EXECUTION_SUMMARY_COLUMNS = [
+    ('id', 'id', None),
+    ('source_name', 'source_name', None),
+    ('job_name', 'job_name', None),
+    ('status', 'status', None),
+    ('status_display', 'status', _choices(JobExecution.STATUS_CHOICES)),
+    ('execution_time_seconds', 'execution_time_seconds', None),
+    ('records_processed', 'records_processed', None),
+    ('executed_by', 'executed_by', None),
+    ('executed_at', 'executed_at', _datetime),
+    ('query_time_seconds', 'query_time_seconds', None),
+    ('is_query_regression', 'is_query_regression', None),
+    ('quality_passed', 'quality_passed', None),
+    ('is_anomaly', 'is_anomaly', None),
+]
+JOB_EXECUTION_SUMMARY = FastListSerializer(JOB_EXECUTION_SUMMARY_COLUMNS)
+
+# Mirrors JobExecutionAnomalySerializer
+JOB_EXECUTION_ANOMALIES = FastListSerializer(JOB_EXECUTION_SUMMARY_COLUMNS + [
+    ('read_rows_per_second', 'read_rows_per_second', None),
+    ('anomalies', 'anomalies', None),
+])
@@ -0,0 +1,149 @@
+import queue
+import threading
+import time
+from contextlib import nullcontext
+from django.conf import settings
+from itertools import islice
+from .transforms import TransformPipeline
+from .tuning import insert_tuner
+from .quality import QualityProfile, check_quality
+
+
+END_OF_STREAM = object()
+
+
+class ExtractFailed(Exception):
+    """Sent to loaders when the source extract fails part way through"""
+
+
+class TargetLoader(threading.Thread):
+    """
+    Loads one job's target from a bounded queue of extracted batches.
+    Runs on its own thread and writer connection so target inserts overlap
+    with source fetches. The whole load is one target transaction: it is
+    committed after the last batch, and rolled back when the extract or the
+    load fails or the job's quality checks reject the data. Touches no
+    Django models: the caller records the outcome on the JobExecution once
+    the thread has finished. A loader writing back into the source holds one
+    of the source's connection slots (connection_slot) for its whole load.
+    """
+
+    def __init__(self, job, pool, description, resolve_target, insert_rows, queue_depth, count_target_rows=None,
+                 connection_slot=None):
+        super().__init__(name=f"etl-loader-{job.id}", daemon=True)
+        self.job = job
+        self.initial_fingerprint = job.schema_fingerprint
+        self.pool = pool
+        self.description = description
+        self.resolve_target = resolve_target
+        self.insert_rows = insert_rows
+        self.pipeline = TransformPipeline(job.transforms)
+        self.insert_tuner = insert_tuner(job)
+        self.count_target_rows = count_target_rows
+        self.connection_slot = connection_slot
+        self.quality = QualityProfile() if settings.ETL_QUALITY_CHECKS else None
+        self.target_rows_before = None
+        self.target_rows_added = None
+        self.violations = []
+        self.batches = queue.Queue(maxsize=queue_depth)
+        self.records_loaded = 0
+        self.load_time = 0.0
+        self.write_time = 0.0
+        self.error = None
+
+    def put(self, batch):
+        """Hand a ColumnBatch to the loader, blocking while its queue is full"""
+        self.batches.put(batch)
+
+    def finish(self):
+        self.batches.put(END_OF_STREAM)
+
+    def abort(self, error):
+        self.batches.put(ExtractFailed(str(error)))
+
+    @property
+    def write_rows_per_second(self):
+        return self.records_loaded / self.write_time if self.write_time else None
+
+    def _transform(self, batch):
+        if not self.pipeline or not len(batch):
+            return batch
+        # The extracted batch is shared with every loader of the same query
+        return self.pipeline.apply(batch.copy())
+
+    def _write(self, cursor, insert_sql, batch):
+        # Insert in chunks of the tuned size, timing each executemany
+        rows = batch.iter_rows()
+        remaining = len(batch)
+        while remaining:
+            size = min(self.insert_tuner.size, remaining)
+            write_started = time.perf_counter()
+            self.insert_rows(cursor, insert_sql, islice(rows, size))
+            elapsed = time.perf_counter() - write_started
+            self.insert_tuner.record(size, elapsed)
+            self.write_time += elapsed
+            self.records_loaded += size
+            remaining -= size
+
+    def _drain(self):
+        # Keep consuming so the reader never blocks on a failed loader
+        while True:
+            item = self.batches.get()
+            if item is END_OF_STREAM or isinstance(item, ExtractFailed):
+                return
+
+    def _load(self, cursor):
+        insert_sql = None
+        while True:
+            batch = self.batches.get()
+            if batch is END_OF_STREAM:
+                break
+            if isinstance(batch, ExtractFailed):
+                raise batch
+            started = time.perf_counter()
+            batch = self._transform(batch)
+            if len(batch):
+                if insert_sql is None:
+                    insert_sql = self.resolve_target(self.job, cursor, batch.description)
+                    if self.quality is not None and self.count_target_rows:
+                        self.target_rows_before = self.count_target_rows(self.job, cursor)
+                if self.quality is not None:
+                    self.quality.add(batch)
+                self._write(cursor, insert_sql, batch)
+            self.load_time += time.perf_counter() - started
+        if self.target_rows_before is not None:
+            # Cheap catalog row count instead of a COUNT(*) scan of the target;
+            # it includes this transaction's uncommitted rows
+            rows_after = self.count_target_rows(self.job, cursor)
+            if rows_after is not None:
+                self.target_rows_added = rows_after - self.target_rows_before
+        if self.quality is not None:
+            self.violations = check_quality(self.job.quality_checks, self.quality, self.target_rows_added)
+
+    def _rollback(self, cursor):
+        try:
+            cursor.rollback()
+        except Exception as e:
+            # The pool discards the connection, which rolls back on close
+            print(f"   ⚠️ Rollback on {self.job.target_table} failed: {str(e)}")
+
+    def run(self):
+        try:
+            slot = self.connection_slot() if self.connection_slot is not None else nullcontext()
+            with slot, self.pool.connection() as conn:
+                cursor = conn.cursor()
+                try:
+                    self._load(cursor)
+                except BaseException:
+                    self._rollback(cursor)
+                    raise
+                if self.violations:
+                    self._rollback(cursor)
+                else:
+                    cursor.commit()
+                cursor.close()
+        except ExtractFailed as e:
+            self.error = e
+        except BaseException as e:
+            self.error = e
+            self._drain()
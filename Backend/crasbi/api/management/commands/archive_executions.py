@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from api.retention import archive_executions
+
+
+class Command(BaseCommand):
+    help = 'Move finished job executions older than the retention window into the archive table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.ETL_RETENTION_DAYS,
+                            help='Archive executions older than this many days')
+        parser.add_argument('--batch-size', type=int, default=settings.ETL_ARCHIVE_BATCH_SIZE,
+                            help='Executions moved per transaction')
+        parser.add_argument('--max-batches', type=int, default=None,
+                            help='Stop after this many batches (useful for bounded scheduler runs)')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only report how many executions would be archived')
+
+    def handle(self, *args, **options):
+        stats = archive_executions(
+            older_than_days=options['days'],
+            batch_size=options['batch_size'],
+            max_batches=options['max_batches'],
+            dry_run=options['dry_run'],
+        )
+        if stats['dry_run']:
+            self.stdout.write(f"{stats['archived']} executions would be archived")
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"Archived {stats['archived']} executions in {stats['batches']} batches"
+            ))
@@ -0,0 +1,68 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from api.models import SourceConnection, Job, JobExecution
+from api.serializers import JobSerializer, JobExecutionSummarySerializer
+from api.fast_serialization import JOB_LIST, JOB_EXECUTION_SUMMARY
+
+
+class Command(BaseCommand):
+    help = 'Compare ModelSerializer and fast list serialization on generated rows (rolled back afterwards)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000,
+                            help='Jobs and executions generated for the benchmark')
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='Runs per serializer; the best time is reported')
+
+    def _best(self, repeat, render):
+        best = None
+        body = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            body = render()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best, body
+
+    def _compare(self, label, queryset, serializer_class, fast_serializer, repeat):
+        renderer = JSONRenderer()
+        serializer_time, expected = self._best(
+            repeat, lambda: renderer.render(serializer_class(queryset.all(), many=True).data)
+        )
+        fast_time, body = self._best(
+            repeat, lambda: renderer.render(fast_serializer.serialize(fast_serializer.values(queryset.all())))
+        )
+        if body != expected:
+            raise CommandError(f"{label}: fast serialization output differs from {serializer_class.__name__}")
+        self.stdout.write(
+            f"{label}: serializer {serializer_time:.3f}s, fast {fast_time:.3f}s "
+            f"({serializer_time / fast_time:.1f}x, {len(body)} bytes identical)"
+        )
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        with transaction.atomic():
+            source = SourceConnection.objects.create(
+                source_name='benchmark', db_type='sqlserver', host='localhost',
+                port=1433, username='benchmark', password='benchmark', inserted_by='benchmark'
+            )
+            Job.objects.bulk_create([
+                Job(job_name=f'benchmark_{i}', source=source, source_table=f'src_{i}',
+                    target_table=f'dw_{i}', job_query=f'SELECT * FROM src_{i}', created_by='benchmark')
+                for i in range(rows)
+            ], batch_size=1000)
+            job = Job.objects.filter(source=source).first()
+            JobExecution.objects.bulk_create([
+                JobExecution(job=job, source_name=source.source_name, job_name=job.job_name,
+                             status='completed' if i % 10 else 'failed', execution_time_seconds=i / 7,
+                             records_processed=i * 3, executed_by='benchmark')
+                for i in range(rows)
+            ], batch_size=1000)
+
+            self._compare('jobs', Job.objects.filter(source=source).select_related('source'),
+                          JobSerializer, JOB_LIST, options['repeat'])
+            self._compare('executions', JobExecution.objects.filter(job__source=source),
+                          JobExecutionSummarySerializer, JOB_EXECUTION_SUMMARY, options['repeat'])
+            transaction.set_rollback(True)
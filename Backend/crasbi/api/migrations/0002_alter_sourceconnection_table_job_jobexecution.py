@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Brings the migration state up to the tables the SQL scripts already
+    # created (source_connection, bi_jobs, bi_job_executions). Marked initial
+    # so `migrate --fake-initial` skips it on a database where they exist.
+
+    initial = True
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelTable(
+            name='sourceconnection',
+            table='source_connection',
+        ),
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('job_name', models.CharField(max_length=255)),
+                ('source_table', models.CharField(max_length=255)),
+                ('target_table', models.CharField(max_length=255)),
+                ('job_query', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(blank=True, null=True)),
+                ('created_by', models.CharField(max_length=100)),
+                ('source', models.ForeignKey(db_column='source_id', on_delete=django.db.models.deletion.CASCADE, related_name='jobs', to='api.sourceconnection')),
+            ],
+            options={
+                'verbose_name': 'Job',
+                'verbose_name_plural': 'Jobs',
+                'db_table': 'bi_jobs',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='JobExecution',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('source_name', models.CharField(max_length=255)),
+                ('job_name', models.CharField(max_length=255)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed'), ('cancelled', 'Cancelled')], default='pending', max_length=20)),
+                ('execution_time_seconds', models.FloatField(blank=True, null=True)),
+                ('records_processed', models.IntegerField(blank=True, null=True)),
+                ('executed_by', models.CharField(max_length=100)),
+                ('executed_at', models.DateTimeField(auto_now_add=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('error_message', models.TextField(blank=True, null=True)),
+                ('execution_log', models.TextField(blank=True, null=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='executions', to='api.job')),
+            ],
+            options={
+                'verbose_name': 'Job Execution',
+                'verbose_name_plural': 'Job Executions',
+                'db_table': 'bi_job_executions',
+                'ordering': ['-executed_at'],
+            },
+        ),
+    ]
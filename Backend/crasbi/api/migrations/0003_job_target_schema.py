@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_alter_sourceconnection_table_job_jobexecution'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='schema_fingerprint',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='column_mapping',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='insert_sql',
+            field=models.TextField(blank=True, null=True),
+        ),
+    ]
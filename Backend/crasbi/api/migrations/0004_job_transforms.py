@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_job_target_schema'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='transforms',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobexecution',
+            name='transform_timings',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_job_transforms'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobExecutionArchive',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('original_id', models.IntegerField(unique=True)),
+                ('job_id', models.IntegerField(db_index=True)),
+                ('source_name', models.CharField(max_length=255)),
+                ('job_name', models.CharField(max_length=255)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed'), ('cancelled', 'Cancelled')], max_length=20)),
+                ('execution_time_seconds', models.FloatField(blank=True, null=True)),
+                ('records_processed', models.IntegerField(blank=True, null=True)),
+                ('executed_by', models.CharField(max_length=100)),
+                ('executed_at', models.DateTimeField(db_index=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('payload', models.BinaryField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Archived Job Execution',
+                'verbose_name_plural': 'Archived Job Executions',
+                'db_table': 'bi_job_executions_archive',
+                'ordering': ['-executed_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='JobExecutionRollup',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('job_id', models.IntegerField()),
+                ('source_name', models.CharField(max_length=255)),
+                ('job_name', models.CharField(max_length=255)),
+                ('day', models.DateField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed'), ('cancelled', 'Cancelled')], max_length=20)),
+                ('executions', models.IntegerField(default=0)),
+                ('total_records', models.BigIntegerField(default=0)),
+                ('total_execution_seconds', models.FloatField(default=0)),
+                ('min_execution_seconds', models.FloatField(blank=True, null=True)),
+                ('max_execution_seconds', models.FloatField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Job Execution Rollup',
+                'verbose_name_plural': 'Job Execution Rollups',
+                'db_table': 'bi_job_execution_rollups',
+                'ordering': ['-day'],
+                'unique_together': {('job_id', 'day', 'status')},
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_execution_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='profile_query',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='query_time_baseline',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='query_time_samples',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='jobexecution',
+            name='is_query_regression',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='jobexecution',
+            name='query_plan',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobexecution',
+            name='query_time_seconds',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_query_profiling'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobexecution',
+            name='extract_fanout',
+            field=models.IntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='jobexecution',
+            name='load_time_seconds',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_extract_fanout'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='target_connection',
+            field=models.ForeignKey(blank=True, db_column='target_connection_id', limit_choices_to={'is_destination': True}, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='target_jobs', to='api.sourceconnection'),
+        ),
+        migrations.AddField(
+            model_name='jobexecution',
+            name='read_rows_per_second',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobexecution',
+            name='write_rows_per_second',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='sourceconnection',
+            name='is_destination',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_target_connection'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='fetch_batch_size',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='insert_batch_size',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+    ]
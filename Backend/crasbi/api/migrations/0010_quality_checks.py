@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_adaptive_batch_size'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='quality_checks',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobexecution',
+            name='quality_passed',
+            field=models.BooleanField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobexecution',
+            name='quality_report',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_quality_checks'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobexecution',
+            name='throttle_wait_seconds',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='sourceconnection',
+            name='extract_windows',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='sourceconnection',
+            name='max_bytes_per_second',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='sourceconnection',
+            name='max_concurrent_connections',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='sourceconnection',
+            name='max_rows_per_second',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
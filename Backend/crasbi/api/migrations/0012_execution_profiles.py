@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_source_throttling'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExecutionProfile',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('duration_seconds', models.FloatField()),
+                ('cpu_samples', models.IntegerField(default=0)),
+                ('sample_interval', models.FloatField()),
+                ('peak_memory_bytes', models.BigIntegerField(blank=True, null=True)),
+                ('payload', models.BinaryField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Execution Profile',
+                'verbose_name_plural': 'Execution Profiles',
+                'db_table': 'bi_execution_profiles',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='profile_execution',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='jobexecution',
+            name='profile',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='executions', to='api.executionprofile'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_execution_profiles'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobexecution',
+            index=models.Index(fields=['-executed_at'], name='bi_exec_executed_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobexecution',
+            index=models.Index(fields=['status', '-executed_at'], name='bi_exec_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobexecution',
+            index=models.Index(fields=['source_name', '-executed_at'], name='bi_exec_source_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobexecution',
+            index=models.Index(fields=['job_name'], name='bi_exec_job_name_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_execution_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='runtime_baseline',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='runtime_baseline_samples',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='jobexecution',
+            name='anomalies',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobexecution',
+            name='is_anomaly',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='jobexecution',
+            index=models.Index(fields=['is_anomaly', '-executed_at'], name='bi_exec_anomaly_idx'),
+        ),
+    ]
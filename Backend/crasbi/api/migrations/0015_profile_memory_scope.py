@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 03:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_runtime_baselines'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='executionprofile',
+            name='memory_scope',
+            field=models.CharField(choices=[('execution', 'This execution only'), ('process', 'Whole process (overlapping profiled runs)')], default='execution', max_length=20),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 04:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_profile_memory_scope'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sourceconnection',
+            name='database',
+            field=models.CharField(default='TestingDB19082025', max_length=128),
+        ),
+    ]
@@ -2,7 +2,9 @@ from django.db import models
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 import hashlib
+import json
 import os
+import zlib
 
 class SourceConnection(models.Model):
     DB_TYPE_CHOICES = [
@@ -21,9 +23,15 @@ class SourceConnection(models.Model):
     db_type = models.CharField(max_length=50, choices=DB_TYPE_CHOICES)
     host = models.CharField(max_length=255)
     port = models.IntegerField()
+    database = models.CharField(max_length=128, default='TestingDB19082025')  # Database the ODBC connection opens
     username = models.CharField(max_length=100)
     password = models.CharField(max_length=255)
     is_active = models.BooleanField(default=True)
+    is_destination = models.BooleanField(default=False)  # Can be used as a job's target connection
+    max_concurrent_connections = models.PositiveIntegerField(null=True, blank=True)  # Source connections open at once: extracts and loads into the source
+    max_rows_per_second = models.FloatField(null=True, blank=True)                   # Extract rate limit across all jobs
+    max_bytes_per_second = models.FloatField(null=True, blank=True)                  # Extract byte rate limit across all jobs
+    extract_windows = models.JSONField(null=True, blank=True)                        # Local times extracts may start, e.g. [{"start": "22:00", "end": "06:00"}]
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(null=True, blank=True)
     inserted_by = models.CharField(max_length=100)
@@ -85,7 +93,29 @@ class Job(models.Model):
     )
     source_table = models.CharField(max_length=255)
     target_table = models.CharField(max_length=255)
+    target_connection = models.ForeignKey(
+        SourceConnection,
+        on_delete=models.PROTECT,
+        db_column='target_connection_id',
+        related_name='target_jobs',
+        null=True,
+        blank=True,
+        limit_choices_to={'is_destination': True}
+    )  # Destination database; loads go to the source database when empty
     job_query = models.TextField()  # NVARCHAR(MAX)
+    schema_fingerprint = models.CharField(max_length=64, null=True, blank=True)  # Hash of the last seen source result shape
+    column_mapping = models.JSONField(null=True, blank=True)                     # Cached source -> target column mapping
+    insert_sql = models.TextField(null=True, blank=True)                         # Cached INSERT statement for the mapping
+    transforms = models.JSONField(null=True, blank=True)                         # In-flight transform steps run between extract and load
+    quality_checks = models.JSONField(null=True, blank=True)                     # Data quality thresholds that fail the execution
+    profile_query = models.BooleanField(default=False)                           # Capture the source execution plan on every run
+    profile_execution = models.BooleanField(default=False)                       # Capture a CPU/memory profile of every run
+    query_time_baseline = models.FloatField(null=True, blank=True)               # Moving average of the query phase in seconds
+    query_time_samples = models.IntegerField(default=0)                          # Executions folded into the baseline
+    runtime_baseline = models.JSONField(null=True, blank=True)                   # Moving mean/variance of duration, throughput and row count
+    runtime_baseline_samples = models.IntegerField(default=0)                    # Completed executions folded into runtime_baseline
+    fetch_batch_size = models.IntegerField(null=True, blank=True)                # Learned fetchmany size, warm start for the next run
+    insert_batch_size = models.IntegerField(null=True, blank=True)               # Learned rows per executemany on the target
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(null=True, blank=True)
     created_by = models.CharField(max_length=100)
@@ -120,12 +150,137 @@ class JobExecution(models.Model):
     completed_at = models.DateTimeField(null=True, blank=True)        # When execution completed
     error_message = models.TextField(null=True, blank=True)           # Error details if failed
     execution_log = models.TextField(null=True, blank=True)           # Detailed execution log
+    transform_timings = models.JSONField(null=True, blank=True)       # Seconds spent in each transform step
+    query_time_seconds = models.FloatField(null=True, blank=True)     # Time spent executing and fetching job_query
+    query_plan = models.TextField(null=True, blank=True)              # Source execution plan when profiling was on
+    is_query_regression = models.BooleanField(default=False)          # Query phase exceeded the job's baseline threshold
+    load_time_seconds = models.FloatField(null=True, blank=True)      # Time spent transforming and loading this job's target
+    extract_fanout = models.IntegerField(default=1)                   # Number of jobs fed by the same source extract
+    read_rows_per_second = models.FloatField(null=True, blank=True)   # Source side throughput of the extract
+    write_rows_per_second = models.FloatField(null=True, blank=True)  # Target side insert throughput
+    throttle_wait_seconds = models.FloatField(null=True, blank=True)  # Time the extract waited on the source's throttle
+    profile = models.ForeignKey(
+        'ExecutionProfile',
+        on_delete=models.SET_NULL,
+        related_name='executions',
+        null=True,
+        blank=True
+    )  # CPU/memory profile of the run, shared by jobs fed by the same extract
+    quality_report = models.JSONField(null=True, blank=True)          # Row/null counts, min/max and checksum of the loaded data
+    quality_passed = models.BooleanField(null=True, blank=True)       # Whether the job's quality checks passed (None when not run)
+    anomalies = models.JSONField(null=True, blank=True)               # Metrics that deviated from the job's runtime baseline
+    is_anomaly = models.BooleanField(default=False)                   # Any metric deviated from the job's runtime baseline
 
     class Meta:
         db_table = 'bi_job_executions'
         verbose_name = 'Job Execution'
         verbose_name_plural = 'Job Executions'
         ordering = ['-executed_at']
+        indexes = [
+            # Back the default ordering and the admin/API filters on large tables
+            models.Index(fields=['-executed_at'], name='bi_exec_executed_at_idx'),
+            models.Index(fields=['status', '-executed_at'], name='bi_exec_status_idx'),
+            models.Index(fields=['source_name', '-executed_at'], name='bi_exec_source_idx'),
+            models.Index(fields=['job_name'], name='bi_exec_job_name_idx'),
+            models.Index(fields=['is_anomaly', '-executed_at'], name='bi_exec_anomaly_idx'),
+        ]
 
     def __str__(self):
         return f"{self.job_name} - {self.status} ({self.executed_at})"
+
+class JobExecutionArchive(models.Model):
+    id = models.AutoField(primary_key=True)
+    original_id = models.IntegerField(unique=True)                    # Id the execution had in bi_job_executions
+    job_id = models.IntegerField(db_index=True)                       # Plain id so archives outlive deleted jobs
+    source_name = models.CharField(max_length=255)
+    job_name = models.CharField(max_length=255)
+    status = models.CharField(max_length=20, choices=JobExecution.STATUS_CHOICES)
+    execution_time_seconds = models.FloatField(null=True, blank=True)
+    records_processed = models.IntegerField(null=True, blank=True)
+    executed_by = models.CharField(max_length=100)
+    executed_at = models.DateTimeField(db_index=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    payload = models.BinaryField(null=True, blank=True)               # zlib compressed JSON of the other execution columns
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'bi_job_executions_archive'
+        verbose_name = 'Archived Job Execution'
+        verbose_name_plural = 'Archived Job Executions'
+        ordering = ['-executed_at']
+
+    def __str__(self):
+        return f"{self.job_name} - {self.status} ({self.executed_at}) [archived]"
+
+    @staticmethod
+    def compress_payload(data):
+        return zlib.compress(json.dumps(data, default=str).encode('utf-8'), 9)
+
+    def get_payload(self):
+        """Decompress the archived payload columns"""
+        if not self.payload:
+            return {}
+        return json.loads(zlib.decompress(bytes(self.payload)).decode('utf-8'))
+
+class JobExecutionRollup(models.Model):
+    id = models.AutoField(primary_key=True)
+    job_id = models.IntegerField()
+    source_name = models.CharField(max_length=255)
+    job_name = models.CharField(max_length=255)
+    day = models.DateField()                                          # Day the executions started on
+    status = models.CharField(max_length=20, choices=JobExecution.STATUS_CHOICES)
+    executions = models.IntegerField(default=0)
+    total_records = models.BigIntegerField(default=0)
+    total_execution_seconds = models.FloatField(default=0)
+    min_execution_seconds = models.FloatField(null=True, blank=True)
+    max_execution_seconds = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'bi_job_execution_rollups'
+        verbose_name = 'Job Execution Rollup'
+        verbose_name_plural = 'Job Execution Rollups'
+        ordering = ['-day']
+        unique_together = ['job_id', 'day', 'status']
+
+    def __str__(self):
+        return f"{self.job_name} - {self.day} {self.status} ({self.executions})"
+
+class ExecutionProfile(models.Model):
+    MEMORY_SCOPE_CHOICES = [
+        ('execution', 'This execution only'),
+        ('process', 'Whole process (overlapping profiled runs)'),
+    ]
+
+    id = models.AutoField(primary_key=True)
+    duration_seconds = models.FloatField()                            # Wall time covered by the profile
+    cpu_samples = models.IntegerField(default=0)                      # Stack samples taken
+    sample_interval = models.FloatField()                             # Seconds between samples
+    peak_memory_bytes = models.BigIntegerField(null=True, blank=True) # Peak traced Python memory during the run
+    memory_scope = models.CharField(max_length=20, choices=MEMORY_SCOPE_CHOICES, default='execution')  # Whose allocations the memory figures cover
+    payload = models.BinaryField()                                    # zlib compressed JSON of collapsed stacks and top allocations
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'bi_execution_profiles'
+        verbose_name = 'Execution Profile'
+        verbose_name_plural = 'Execution Profiles'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Profile {self.id} ({self.cpu_samples} samples, {self.created_at})"
+
+    @classmethod
+    def from_profile(cls, profile):
+        """Build (unsaved) from ExecutionProfiler.stop() output"""
+        return cls(
+            duration_seconds=profile['duration_seconds'],
+            cpu_samples=profile['cpu_samples'],
+            sample_interval=profile['sample_interval'],
+            peak_memory_bytes=profile['peak_memory_bytes'],
+            memory_scope=profile['memory_scope'],
+            payload=zlib.compress(json.dumps({'cpu': profile['cpu'], 'memory': profile['memory']}).encode('utf-8'), 9),
+        )
+
+    def get_payload(self):
+        """Decompress the collapsed stacks and allocation list"""
+        return json.loads(zlib.decompress(bytes(self.payload)).decode('utf-8'))
@@ -0,0 +1,210 @@
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from django.conf import settings
+from django.db import transaction
+from .models import Job
+
+
+def _fetch_plan_text(cursor):
+    return '\n'.join(str(column) for row in cursor.fetchall() for column in row if column is not None)
+
+
+def _sqlserver_plan(cursor, query):
+    # SHOWPLAN_XML must be the only statement in its batch and makes the
+    # server return the estimated plan instead of executing the query
+    cursor.execute("SET SHOWPLAN_XML ON")
+    try:
+        cursor.execute(query)
+        return _fetch_plan_text(cursor)
+    finally:
+        cursor.execute("SET SHOWPLAN_XML OFF")
+
+
+def _postgresql_plan(cursor, query):
+    cursor.execute(f"EXPLAIN (FORMAT JSON) {query}")
+    return _fetch_plan_text(cursor)
+
+
+def _mysql_plan(cursor, query):
+    cursor.execute(f"EXPLAIN FORMAT=JSON {query}")
+    return _fetch_plan_text(cursor)
+
+
+def _oracle_plan(cursor, query):
+    cursor.execute(f"EXPLAIN PLAN FOR {query}")
+    cursor.execute("SELECT PLAN_TABLE_OUTPUT FROM TABLE(DBMS_XPLAN.DISPLAY())")
+    return _fetch_plan_text(cursor)
+
+
+def _sqlite_plan(cursor, query):
+    cursor.execute(f"EXPLAIN QUERY PLAN {query}")
+    return _fetch_plan_text(cursor)
+
+
+PLAN_CAPTURE = {
+    'sqlserver': _sqlserver_plan,
+    'postgresql': _postgresql_plan,
+    'mysql': _mysql_plan,
+    'oracle': _oracle_plan,
+    'sqlite': _sqlite_plan,
+}
+
+
+def capture_query_plan(cursor, db_type, query):
+    """Return the estimated execution plan for the query in the source's own dialect"""
+    capture = PLAN_CAPTURE.get(db_type)
+    if capture is None:
+        raise ValueError(f"Query plans are not supported for database type {db_type}")
+    return capture(cursor, query.strip().rstrip(';'))
+
+
+def update_query_baseline(job, query_time):
+    """
+    Compare the query phase time against the job's baseline and fold it into
+    the exponentially weighted baseline. Returns True when the execution is a
+    regression (slower than baseline * ETL_QUERY_REGRESSION_FACTOR once the
+    baseline has enough samples). The baseline is re-read under a row lock,
+    as in update_runtime_baseline, so overlapping runs of the job each fold
+    their sample in.
+    """
+    with transaction.atomic():
+        locked = Job.objects.select_for_update().only('id', 'query_time_baseline', 'query_time_samples').get(pk=job.pk)
+        is_regression = (
+            locked.query_time_baseline is not None
+            and locked.query_time_samples >= settings.ETL_QUERY_BASELINE_MIN_SAMPLES
+            and query_time > locked.query_time_baseline * settings.ETL_QUERY_REGRESSION_FACTOR
+        )
+
+        if locked.query_time_baseline is None:
+            locked.query_time_baseline = query_time
+        else:
+            alpha = settings.ETL_QUERY_BASELINE_ALPHA
+            locked.query_time_baseline = alpha * query_time + (1 - alpha) * locked.query_time_baseline
+        locked.query_time_samples += 1
+        locked.save(update_fields=['query_time_baseline', 'query_time_samples'])
+    job.query_time_baseline = locked.query_time_baseline
+    job.query_time_samples = locked.query_time_samples
+    return is_regression
+
+
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_profilers = set()
+_tracemalloc_owned = False
+
+
+def _start_tracemalloc(profiler):
+    """
+    tracemalloc is process wide, so concurrent profiled runs share one
+    session: the first run starts it and the last one stops it, and tracing
+    someone else started is left alone. Its peak and snapshot then cover
+    every thread, so a run that overlaps another one (or tracing it did not
+    start) has its memory figures marked as process-wide.
+    """
+    global _tracemalloc_owned
+    with _tracemalloc_lock:
+        if not _tracemalloc_profilers:
+            _tracemalloc_owned = not tracemalloc.is_tracing()
+            if _tracemalloc_owned:
+                tracemalloc.start(settings.ETL_PROFILE_MEMORY_FRAMES)
+        if _tracemalloc_profilers or not _tracemalloc_owned:
+            profiler.memory_scope = 'process'
+        for other in _tracemalloc_profilers:
+            other.memory_scope = 'process'
+        _tracemalloc_profilers.add(profiler)
+
+
+def _stop_tracemalloc(profiler):
+    with _tracemalloc_lock:
+        _tracemalloc_profilers.discard(profiler)
+        if not _tracemalloc_profilers and _tracemalloc_owned:
+            tracemalloc.stop()
+
+
+def _collapsed_stack(frame, max_depth=64):
+    names = []
+    while frame is not None and len(names) < max_depth:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class ExecutionProfiler:
+    """
+    Sampling CPU profiler plus allocation snapshot for one ETL extract.
+    A background thread records the stacks of the tracked threads (the
+    request thread and its loaders) every ETL_PROFILE_SAMPLE_INTERVAL
+    seconds, so the profiled code runs without tracing hooks. Samples are
+    wall-clock: time blocked on the database or a full queue shows up too. Memory is
+    traced with tracemalloc only while the profiler runs; memory_scope says
+    whether the memory figures belong to this run alone ('execution') or to
+    the whole process ('process', when profiled runs overlapped). Nothing is
+    created at all when profiling is off.
+    """
+
+    def __init__(self, interval=None):
+        self.interval = interval or settings.ETL_PROFILE_SAMPLE_INTERVAL
+        self.threads = set()
+        self.stacks = Counter()
+        self.samples = 0
+        self.started = None
+        self.memory_scope = 'execution'
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, name='etl-profiler', daemon=True)
+
+    def track(self, thread):
+        self.threads.add(thread.ident)
+
+    def start(self):
+        self.track(threading.current_thread())
+        _start_tracemalloc(self)
+        self.started = time.perf_counter()
+        self._sampler.start()
+        return self
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for ident in list(self.threads):
+                frame = frames.get(ident)
+                if frame is not None:
+                    self.stacks[_collapsed_stack(frame)] += 1
+            self.samples += 1
+
+    def stop(self):
+        """Stop sampling and return the profile as a JSON-serializable dict"""
+        self._stop.set()
+        self._sampler.join()
+        duration = time.perf_counter() - self.started
+        try:
+            snapshot = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            ])
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            _stop_tracemalloc(self)
+
+        allocations = [
+            {
+                'file': stat.traceback[0].filename,
+                'line': stat.traceback[0].lineno,
+                'size_bytes': stat.size,
+                'count': stat.count,
+            }
+            for stat in snapshot.statistics('lineno')[:settings.ETL_PROFILE_TOP_ALLOCATIONS]
+        ]
+        return {
+            'duration_seconds': round(duration, 3),
+            'sample_interval': self.interval,
+            'cpu_samples': self.samples,
+            'peak_memory_bytes': peak,
+            'memory_scope': self.memory_scope,
+            # Collapsed stacks ("frame;frame;frame count"), readable by flamegraph.pl and speedscope
+            'cpu': '\n'.join(f"{stack} {count}" for stack, count in self.stacks.most_common()),
+            'memory': allocations,
+        }
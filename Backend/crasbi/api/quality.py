@@ -0,0 +1,166 @@
+import datetime
+import numbers
+import zlib
+from .batches import TypedColumn
+
+
+class QualityCheckError(ValueError):
+    """Raised when a job's quality_checks definition is invalid"""
+
+
+QUALITY_CHECK_KEYS = ('min_rows', 'max_rows', 'max_null_ratio', 'not_null', 'ranges', 'max_row_count_difference')
+
+# Longest string kept for a min/max value in the stored report
+REPORT_VALUE_LENGTH = 100
+
+
+def validate_quality_checks(checks):
+    """Check the shape of a job's quality_checks thresholds; raises QualityCheckError"""
+    if checks in (None, {}):
+        return checks
+    if not isinstance(checks, dict):
+        raise QualityCheckError("Quality checks must be an object.")
+    unknown = [key for key in checks if key not in QUALITY_CHECK_KEYS]
+    if unknown:
+        raise QualityCheckError(f"Unknown quality checks: {', '.join(unknown)}")
+    for key in ('min_rows', 'max_rows', 'max_row_count_difference'):
+        if key in checks and (not isinstance(checks[key], int) or checks[key] < 0):
+            raise QualityCheckError(f"{key} must be a non-negative integer.")
+    ratio = checks.get('max_null_ratio')
+    ratios = ratio.values() if isinstance(ratio, dict) else ([] if ratio is None else [ratio])
+    if any(not isinstance(value, numbers.Real) or not 0 <= value <= 1 for value in ratios):
+        raise QualityCheckError("max_null_ratio must be a number between 0 and 1, or an object of them per column.")
+    if not isinstance(checks.get('not_null', []), list):
+        raise QualityCheckError("not_null must be a list of columns.")
+    ranges = checks.get('ranges', {})
+    if not isinstance(ranges, dict) or any(
+        not isinstance(bounds, dict) or set(bounds) - {'min', 'max'} for bounds in ranges.values()
+    ):
+        raise QualityCheckError("ranges must map columns to {'min': ..., 'max': ...}.")
+    return checks
+
+
+class ColumnProfile:
+    __slots__ = ('nulls', 'min', 'max', 'comparable')
+
+    def __init__(self):
+        self.nulls = 0
+        self.min = None
+        self.max = None
+        self.comparable = True
+
+    def add(self, column):
+        if isinstance(column, TypedColumn):
+            self.nulls += column.null_count
+            values = column.data if not column.null_count else [v for v in column if v is not None]
+        else:
+            values = [v for v in column if v is not None]
+            self.nulls += len(column) - len(values)
+        if not values or not self.comparable:
+            return
+        try:
+            low, high = min(values), max(values)
+            if self.min is None or low < self.min:
+                self.min = low
+            if self.max is None or high > self.max:
+                self.max = high
+        except TypeError:
+            # Mixed types in one column have no order; keep counts only
+            self.comparable = False
+            self.min = self.max = None
+
+
+class QualityProfile:
+    """
+    Data quality metrics accumulated batch by batch as rows stream to the
+    target: row count, per-column null count and min/max, and an
+    order-independent checksum (sum of per-row CRC32s), so verifying a load
+    needs no second scan of either side.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.checksum = 0
+        self.columns = {}
+
+    def add(self, batch):
+        if not len(batch):
+            return
+        self.rows += len(batch)
+        for name, column in zip(batch.column_names, batch.columns):
+            self.columns.setdefault(name, ColumnProfile()).add(column)
+        crc32 = zlib.crc32
+        self.checksum = (self.checksum + sum(crc32(repr(row).encode()) for row in batch.iter_rows())) % (1 << 64)
+
+    def report(self):
+        return {
+            'rows': self.rows,
+            'checksum': f"{self.checksum:016x}",
+            'columns': {
+                name: {'nulls': column.nulls, 'min': _report_value(column.min), 'max': _report_value(column.max)}
+                for name, column in self.columns.items()
+            },
+        }
+
+
+def _report_value(value):
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray)):
+        return value.hex()[:REPORT_VALUE_LENGTH]
+    return str(value)[:REPORT_VALUE_LENGTH]
+
+
+def _threshold(bound, observed):
+    """Bring a JSON threshold to the observed value's type so they compare"""
+    if isinstance(observed, datetime.datetime) and isinstance(bound, str):
+        return datetime.datetime.fromisoformat(bound)
+    if isinstance(observed, datetime.date) and isinstance(bound, str):
+        return datetime.date.fromisoformat(bound)
+    return bound
+
+
+def check_quality(checks, profile, target_rows_added=None):
+    """Compare a profile (and the target's row count change) against a job's thresholds; returns violations"""
+    checks = checks or {}
+    violations = []
+    if 'min_rows' in checks and profile.rows < checks['min_rows']:
+        violations.append(f"{profile.rows} rows loaded, expected at least {checks['min_rows']}")
+    if 'max_rows' in checks and profile.rows > checks['max_rows']:
+        violations.append(f"{profile.rows} rows loaded, expected at most {checks['max_rows']}")
+
+    # Catalog row counts are approximate and other writers change them too, so
+    # the target count is only enforced when the job asks for it
+    if target_rows_added is not None and 'max_row_count_difference' in checks:
+        difference = abs(target_rows_added - profile.rows)
+        if difference > checks['max_row_count_difference']:
+            violations.append(f"target row count grew by {target_rows_added} but {profile.rows} rows were loaded")
+
+    ratio = checks.get('max_null_ratio')
+    for name, column in profile.columns.items():
+        limit = ratio.get(name) if isinstance(ratio, dict) else ratio
+        if limit is not None and profile.rows and column.nulls / profile.rows > limit:
+            violations.append(f"{name}: {column.nulls / profile.rows:.1%} nulls exceeds {limit:.1%}")
+
+    for name in checks.get('not_null', []):
+        column = profile.columns.get(name)
+        if column is None:
+            violations.append(f"{name}: column not in the loaded data")
+        elif column.nulls:
+            violations.append(f"{name}: {column.nulls} nulls in a not_null column")
+
+    for name, bounds in checks.get('ranges', {}).items():
+        column = profile.columns.get(name)
+        if column is None:
+            violations.append(f"{name}: column not in the loaded data")
+            continue
+        try:
+            if 'min' in bounds and column.min is not None and column.min < _threshold(bounds['min'], column.min):
+                violations.append(f"{name}: minimum {_report_value(column.min)} is below {bounds['min']}")
+            if 'max' in bounds and column.max is not None and column.max > _threshold(bounds['max'], column.max):
+                violations.append(f"{name}: maximum {_report_value(column.max)} is above {bounds['max']}")
+        except (TypeError, ValueError):
+            violations.append(f"{name}: range {bounds} cannot be compared with {type(column.min).__name__} values")
+    return violations
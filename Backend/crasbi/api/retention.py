@@ -0,0 +1,129 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from .models import JobExecution, JobExecutionArchive, JobExecutionRollup, ExecutionProfile
+
+
+# Only finished executions are archived; running/pending rows are still being written
+ARCHIVABLE_STATUSES = ['completed', 'failed', 'cancelled']
+
+# Columns JobExecutionArchive keeps as its own columns; everything else goes in the payload
+ARCHIVE_COLUMNS = [
+    'job_id', 'source_name', 'job_name', 'status', 'execution_time_seconds',
+    'records_processed', 'executed_by', 'executed_at', 'completed_at',
+]
+
+# Derived from the model so columns added to JobExecution are archived too
+ARCHIVE_FIELDS = [field.attname for field in JobExecution._meta.concrete_fields]
+
+# The profile is deleted with its last execution, so its id is not kept
+PAYLOAD_FIELDS = [field for field in ARCHIVE_FIELDS if field not in ('id', 'profile_id', *ARCHIVE_COLUMNS)]
+
+
+def archivable_executions(older_than_days=None):
+    """Finished executions older than the retention window"""
+    days = settings.ETL_RETENTION_DAYS if older_than_days is None else older_than_days
+    cutoff = timezone.now() - timedelta(days=days)
+    return JobExecution.objects.filter(executed_at__lt=cutoff, status__in=ARCHIVABLE_STATUSES)
+
+
+def _rollup_batch(rows):
+    """Aggregate a batch of execution rows by (job_id, day, status)"""
+    totals = {}
+    for row in rows:
+        key = (row['job_id'], timezone.localtime(row['executed_at']).date(), row['status'])
+        entry = totals.setdefault(key, {
+            'source_name': row['source_name'],
+            'job_name': row['job_name'],
+            'executions': 0,
+            'total_records': 0,
+            'total_execution_seconds': 0.0,
+            'min_execution_seconds': None,
+            'max_execution_seconds': None,
+        })
+        seconds = row['execution_time_seconds']
+        entry['executions'] += 1
+        entry['total_records'] += row['records_processed'] or 0
+        if seconds is not None:
+            entry['total_execution_seconds'] += seconds
+            entry['min_execution_seconds'] = seconds if entry['min_execution_seconds'] is None else min(entry['min_execution_seconds'], seconds)
+            entry['max_execution_seconds'] = seconds if entry['max_execution_seconds'] is None else max(entry['max_execution_seconds'], seconds)
+    return totals
+
+
+def _merge_rollups(totals):
+    """Fold batch aggregates into the stored rollups with one read, one bulk update and one bulk insert"""
+    if not totals:
+        return
+    job_ids = {key[0] for key in totals}
+    days = {key[1] for key in totals}
+    existing = {
+        (rollup.job_id, rollup.day, rollup.status): rollup
+        for rollup in JobExecutionRollup.objects.select_for_update().filter(job_id__in=job_ids, day__in=days)
+    }
+
+    to_update = []
+    to_create = []
+    for (job_id, day, status), entry in totals.items():
+        rollup = existing.get((job_id, day, status))
+        if rollup is None:
+            to_create.append(JobExecutionRollup(job_id=job_id, day=day, status=status, **entry))
+            continue
+        rollup.executions += entry['executions']
+        rollup.total_records += entry['total_records']
+        rollup.total_execution_seconds += entry['total_execution_seconds']
+        for field, pick in (('min_execution_seconds', min), ('max_execution_seconds', max)):
+            values = [v for v in (getattr(rollup, field), entry[field]) if v is not None]
+            setattr(rollup, field, pick(values) if values else None)
+        to_update.append(rollup)
+
+    if to_update:
+        JobExecutionRollup.objects.bulk_update(to_update, [
+            'executions', 'total_records', 'total_execution_seconds',
+            'min_execution_seconds', 'max_execution_seconds',
+        ])
+    if to_create:
+        JobExecutionRollup.objects.bulk_create(to_create)
+
+
+def archive_executions(older_than_days=None, batch_size=None, max_batches=None, dry_run=False):
+    """
+    Move finished executions past the retention window into
+    bi_job_executions_archive in batches, keeping daily rollups.
+    Each batch is archived, rolled up and deleted in its own transaction.
+    """
+    batch_size = batch_size or settings.ETL_ARCHIVE_BATCH_SIZE
+    queryset = archivable_executions(older_than_days).order_by('id')
+    stats = {'archived': 0, 'batches': 0, 'dry_run': dry_run}
+
+    if dry_run:
+        stats['archived'] = queryset.count()
+        return stats
+
+    last_id = 0
+    while max_batches is None or stats['batches'] < max_batches:
+        with transaction.atomic():
+            rows = list(queryset.filter(id__gt=last_id).values(*ARCHIVE_FIELDS)[:batch_size])
+            if not rows:
+                break
+            JobExecutionArchive.objects.bulk_create([
+                JobExecutionArchive(
+                    original_id=row['id'],
+                    **{field: row[field] for field in ARCHIVE_COLUMNS},
+                    payload=JobExecutionArchive.compress_payload({field: row[field] for field in PAYLOAD_FIELDS}),
+                )
+                for row in rows
+            ])
+            _merge_rollups(_rollup_batch(rows))
+            ids = [row['id'] for row in rows]
+            JobExecution.objects.filter(id__in=ids).delete()
+            # Profiles are large and only useful next to their executions
+            profile_ids = {row['profile_id'] for row in rows if row['profile_id']}
+            if profile_ids:
+                ExecutionProfile.objects.filter(id__in=profile_ids, executions__isnull=True).delete()
+        last_id = ids[-1]
+        stats['archived'] += len(rows)
+        stats['batches'] += 1
+
+    return stats
@@ -0,0 +1,145 @@
+import datetime
+import decimal
+import hashlib
+import uuid
+
+
+# SQL Server column types inferred from the python type codes pyodbc reports
+# in cursor.description
+SQLSERVER_TYPE_MAP = {
+    bool: 'BIT',
+    int: 'BIGINT',
+    float: 'FLOAT',
+    decimal.Decimal: 'DECIMAL',
+    str: 'NVARCHAR',
+    bytes: 'VARBINARY',
+    bytearray: 'VARBINARY',
+    datetime.datetime: 'DATETIME2',
+    datetime.date: 'DATE',
+    datetime.time: 'TIME',
+    uuid.UUID: 'UNIQUEIDENTIFIER',
+}
+
+
+def quote_identifier(name, db_type='sqlserver'):
+    """Quote a (possibly schema qualified) identifier for SQL Server, or with ANSI double quotes for PostgreSQL"""
+    parts = [part.strip().strip('[]"') for part in str(name).split('.')]
+    if db_type == 'postgresql':
+        return '.'.join('"' + part.replace('"', '""') + '"' for part in parts)
+    return '.'.join(f"[{part.replace(']', ']]')}]" for part in parts)
+
+
+def split_table_name(table_name):
+    """Split 'schema.table' into (schema, table), defaulting to dbo"""
+    parts = [part.strip().strip('[]') for part in str(table_name).split('.')]
+    if len(parts) == 1:
+        return 'dbo', parts[0]
+    return parts[-2], parts[-1]
+
+
+def describe_columns(description):
+    """Turn a DB-API cursor.description into plain column metadata dicts"""
+    columns = []
+    for name, type_code, _display_size, internal_size, precision, scale, null_ok in description:
+        columns.append({
+            'name': name,
+            'type': getattr(type_code, '__name__', str(type_code)),
+            'sql_type': infer_sql_type(type_code, internal_size, precision, scale),
+            'nullable': True if null_ok is None else bool(null_ok),
+        })
+    return columns
+
+
+def infer_sql_type(type_code, internal_size=None, precision=None, scale=None):
+    """Infer a SQL Server column type from DB-API column metadata"""
+    base = SQLSERVER_TYPE_MAP.get(type_code, 'NVARCHAR')
+    if base == 'DECIMAL':
+        if not precision:
+            # Unknown shape (a computed column): keep fractional digits rather than round them away
+            return "DECIMAL(38,10)"
+        return f"DECIMAL({precision},{scale or 0})"
+    if base in ('NVARCHAR', 'VARBINARY'):
+        if not internal_size or internal_size <= 0 or internal_size > 4000:
+            return f"{base}(MAX)"
+        return f"{base}({internal_size})"
+    return base
+
+
+def schema_fingerprint(target_table, description, target_connection_id=None):
+    """Stable hash of the source result shape and the table (and database) it is loaded into"""
+    parts = [str(target_table), str(target_connection_id)]
+    for column in description:
+        name, type_code, _display_size, internal_size, precision, scale, null_ok = column
+        parts.append(
+            f"{name}:{getattr(type_code, '__name__', type_code)}:{internal_size}:{precision}:{scale}:{null_ok}"
+        )
+    return hashlib.sha256('|'.join(parts).encode('utf-8')).hexdigest()
+
+
+def fetch_target_columns(cursor, target_table):
+    """Return the existing column names of the target table, or None if it does not exist"""
+    schema_name, table_name = split_table_name(target_table)
+    cursor.execute(
+        "SELECT COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS "
+        "WHERE TABLE_SCHEMA = ? AND TABLE_NAME = ? ORDER BY ORDINAL_POSITION",
+        schema_name, table_name
+    )
+    rows = cursor.fetchall()
+    if not rows:
+        return None
+    return [row[0] for row in rows]
+
+
+def build_create_table_sql(target_table, columns):
+    """CREATE TABLE statement for the inferred columns"""
+    column_defs = ', '.join(
+        f"{quote_identifier(column['name'])} {column['sql_type']} {'NULL' if column['nullable'] else 'NOT NULL'}"
+        for column in columns
+    )
+    return f"CREATE TABLE {quote_identifier(target_table)} ({column_defs})"
+
+
+def build_alter_table_sql(target_table, columns):
+    """ALTER TABLE statement adding the given columns (always nullable, existing rows have no value)"""
+    column_defs = ', '.join(
+        f"{quote_identifier(column['name'])} {column['sql_type']} NULL"
+        for column in columns
+    )
+    return f"ALTER TABLE {quote_identifier(target_table)} ADD {column_defs}"
+
+
+def build_insert_sql(target_table, column_names):
+    """Parameterised INSERT statement for the mapped columns"""
+    columns = ','.join(quote_identifier(name) for name in column_names)
+    placeholders = ','.join(['?' for _ in column_names])
+    return f"INSERT INTO {quote_identifier(target_table)} ({columns}) VALUES ({placeholders})"
+
+
+def ensure_target_table(cursor, target_table, description):
+    """
+    Create or extend the target table so it can receive the source columns.
+    Returns (column_mapping, insert_sql, ddl_statements).
+    """
+    columns = describe_columns(description)
+    existing = fetch_target_columns(cursor, target_table)
+    ddl_statements = []
+
+    if existing is None:
+        ddl_statements.append(build_create_table_sql(target_table, columns))
+    else:
+        existing_lower = {name.lower() for name in existing}
+        missing = [column for column in columns if column['name'].lower() not in existing_lower]
+        if missing:
+            ddl_statements.append(build_alter_table_sql(target_table, missing))
+
+    for statement in ddl_statements:
+        cursor.execute(statement)
+    if ddl_statements:
+        cursor.commit()
+
+    column_mapping = [
+        {'source': column['name'], 'target': column['name'], 'sql_type': column['sql_type']}
+        for column in columns
+    ]
+    insert_sql = build_insert_sql(target_table, [column['target'] for column in column_mapping])
+    return column_mapping, insert_sql, ddl_statements
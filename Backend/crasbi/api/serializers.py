@@ -1,5 +1,10 @@
 from rest_framework import serializers
-from .models import SourceConnection, Job, JobExecution
+from .models import SourceConnection, Job, JobExecution, JobExecutionArchive, JobExecutionRollup
+from .transforms import TransformPipeline, TransformError
+from .quality import validate_quality_checks, QualityCheckError
+from django.conf import settings
+from .throttling import validate_extract_windows, per_worker_connections
+from .retention import PAYLOAD_FIELDS
 
 class SourceConnectionSerializer(serializers.ModelSerializer):
     db_type_display = serializers.CharField(source='get_db_type_display', read_only=True)
@@ -9,8 +14,9 @@ class SourceConnectionSerializer(serializers.ModelSerializer):
     class Meta:
         model = SourceConnection
         fields = [
-            'id', 'source_name', 'db_type', 'db_type_display', 'host', 'port', 
-            'username', 'password', 'is_active', 'created_at', 'updated_at', 
+            'id', 'source_name', 'db_type', 'db_type_display', 'host', 'port', 'database',
+            'username', 'password', 'is_active', 'is_destination', 'max_concurrent_connections',
+            'max_rows_per_second', 'max_bytes_per_second', 'extract_windows', 'created_at', 'updated_at', 
             'inserted_by_username', 'connection_string'
         ]
         read_only_fields = ['id', 'created_at', 'inserted_by_username']
@@ -25,6 +31,19 @@ class SourceConnectionSerializer(serializers.ModelSerializer):
             return obj.get_connection_string()
         return None
 
+    def validate_extract_windows(self, value):
+        try:
+            return validate_extract_windows(value)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+
+    def validate_max_concurrent_connections(self, value):
+        try:
+            per_worker_connections(value, max(1, settings.ETL_THROTTLE_WORKER_PROCESSES))
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+        return value
+
     def create(self, validated_data):
         # Set inserted_by from request user or default value
         request = self.context.get('request')
@@ -59,9 +78,27 @@ class JobSerializer(serializers.ModelSerializer):
         model = Job
         fields = [
             'id', 'job_name', 'source', 'source_name', 'source_table', 'target_table',
-            'job_query', 'created_at', 'updated_at', 'inserted_by_username'
+            'target_connection', 'job_query', 'transforms', 'quality_checks', 'profile_query',
+            'profile_execution', 'query_time_baseline', 'created_at', 'updated_at', 'inserted_by_username'
         ]
-        read_only_fields = ['id', 'created_at', 'inserted_by_username']
+        read_only_fields = ['id', 'created_at', 'inserted_by_username', 'query_time_baseline']
+
+    def validate_transforms(self, value):
+        if value in (None, []):
+            return value
+        if not isinstance(value, list):
+            raise serializers.ValidationError("Transforms must be a list of steps.")
+        try:
+            TransformPipeline(value)
+        except TransformError as e:
+            raise serializers.ValidationError(str(e))
+        return value
+
+    def validate_quality_checks(self, value):
+        try:
+            return validate_quality_checks(value)
+        except QualityCheckError as e:
+            raise serializers.ValidationError(str(e))
 
     def create(self, validated_data):
         request = self.context.get('request')
@@ -89,7 +126,11 @@ class JobDetailSerializer(serializers.ModelSerializer):
     class Meta:
         model = Job
         fields = '__all__'
-        read_only_fields = ['id', 'created_at']
+        read_only_fields = [
+            'id', 'created_at', 'schema_fingerprint', 'column_mapping', 'insert_sql',
+            'query_time_baseline', 'query_time_samples', 'fetch_batch_size', 'insert_batch_size',
+            'runtime_baseline', 'runtime_baseline_samples'
+        ]
 
 class JobExecutionSerializer(serializers.ModelSerializer):
     source_name = serializers.CharField(read_only=True)
@@ -101,7 +142,10 @@ class JobExecutionSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'job', 'source_name', 'job_name', 'status', 'status_display',
             'execution_time_seconds', 'records_processed', 'executed_by', 
-            'executed_at', 'completed_at', 'error_message', 'execution_log'
+            'executed_at', 'completed_at', 'error_message', 'execution_log',
+            'transform_timings', 'query_time_seconds', 'query_plan', 'is_query_regression',
+            'load_time_seconds', 'extract_fanout', 'read_rows_per_second', 'write_rows_per_second',
+            'throttle_wait_seconds', 'quality_report', 'quality_passed', 'profile', 'anomalies', 'is_anomaly'
         ]
         read_only_fields = ['id', 'source_name', 'job_name', 'executed_at', 'completed_at']
 
@@ -114,6 +158,42 @@ class JobExecutionSummarySerializer(serializers.ModelSerializer):
         model = JobExecution
         fields = [
             'id', 'source_name', 'job_name', 'status', 'status_display',
-            'execution_time_seconds', 'records_processed', 'executed_by', 'executed_at'
+            'execution_time_seconds', 'records_processed', 'executed_by', 'executed_at',
+            'query_time_seconds', 'is_query_regression', 'quality_passed', 'is_anomaly'
         ]
         read_only_fields = ['id', 'source_name', 'job_name', 'executed_at']
+
+class JobExecutionAnomalySerializer(JobExecutionSummarySerializer):
+    class Meta(JobExecutionSummarySerializer.Meta):
+        fields = JobExecutionSummarySerializer.Meta.fields + ['read_rows_per_second', 'anomalies']
+
+class JobExecutionArchiveSerializer(serializers.ModelSerializer):
+    status_display = serializers.CharField(source='get_status_display', read_only=True)
+
+    class Meta:
+        model = JobExecutionArchive
+        fields = [
+            'id', 'original_id', 'job_id', 'source_name', 'job_name', 'status', 'status_display',
+            'execution_time_seconds', 'records_processed', 'executed_by', 'executed_at',
+            'completed_at', 'archived_at'
+        ]
+        read_only_fields = fields
+
+class JobExecutionArchiveDetailSerializer(JobExecutionArchiveSerializer):
+    """Archived execution plus every column kept in its compressed payload"""
+
+    def to_representation(self, obj):
+        data = super().to_representation(obj)
+        payload = obj.get_payload()
+        # Archives written before a column existed report it as None
+        data.update({field: payload.get(field) for field in PAYLOAD_FIELDS})
+        return data
+
+class JobExecutionRollupSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = JobExecutionRollup
+        fields = [
+            'id', 'job_id', 'source_name', 'job_name', 'day', 'status', 'executions',
+            'total_records', 'total_execution_seconds', 'min_execution_seconds', 'max_execution_seconds'
+        ]
+        read_only_fields = fields
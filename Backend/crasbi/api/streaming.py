@@ -0,0 +1,204 @@
+import csv
+import io
+import math
+import sys
+import time
+from contextlib import ExitStack
+from django.core.serializers.json import DjangoJSONEncoder
+from .connections import get_pool
+
+
+class RowEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder (dates, Decimals, UUIDs) plus binary columns as hex"""
+
+    def default(self, o):
+        if isinstance(o, (bytes, bytearray, memoryview)):
+            return bytes(o).hex()
+        return super().default(o)
+
+
+class ResultTruncated(Exception):
+    """Raised after the last CSV chunk of a cut-off export so the response ends abnormally"""
+
+
+class QueryResultStream:
+    """
+    Runs a job's query on its source and hands the result set out one
+    fetchmany() batch at a time, so a preview or export holds at most one
+    batch in memory however large the result is. The source throttle applies
+    as for an extract. Reading stops at max_rows or after max_seconds, and
+    truncated says why ('row_limit' or 'time_limit'). The time limit is also
+    set as the ODBC query timeout, so a single slow execute or fetch cannot
+    outlast it. When rows are left unread (limit reached, client
+    disconnected) the statement is cancelled on the source, and after a
+    disconnect the connection is discarded rather than pooled.
+    """
+
+    def __init__(self, job, connection_string, throttle, max_rows, max_seconds, batch_size):
+        self.job = job
+        self.connection_string = connection_string
+        self.throttle = throttle
+        self.max_rows = max_rows
+        self.max_seconds = max_seconds
+        self.batch_size = batch_size
+        self.cursor = None
+        self.description = None
+        self.rows_sent = 0
+        self.truncated = None
+        self.closed = False
+        self._resources = ExitStack()
+
+    @property
+    def column_names(self):
+        return [column[0] for column in self.description]
+
+    def open(self):
+        """Take a connection slot and run the query; errors raise here, before any response is sent"""
+        try:
+            self.throttle.check_window()
+            self._resources.enter_context(self.throttle.connection_slot())
+            conn = self._resources.enter_context(get_pool(self.connection_string).connection())
+            self.started = time.monotonic()
+            # pyodbc applies the connection timeout to cursors created after it is set;
+            # restore it so the pooled connection keeps no limit for later extracts
+            previous_timeout = conn.timeout
+            conn.timeout = max(1, math.ceil(self.max_seconds))
+            try:
+                self.cursor = conn.cursor()
+            finally:
+                conn.timeout = previous_timeout
+            self.cursor.execute(self.job.job_query)
+            self.description = self.cursor.description
+        except BaseException:
+            self._close(*sys.exc_info())
+            raise
+        return self
+
+    def batches(self):
+        """Yield lists of rows until the result, max_rows or max_seconds runs out"""
+        try:
+            while self.rows_sent < self.max_rows:
+                if self._out_of_time():
+                    break
+                try:
+                    rows = self.cursor.fetchmany(min(self.batch_size, self.max_rows - self.rows_sent))
+                except Exception:
+                    # The query timeout fired during the fetch
+                    if self._out_of_time():
+                        break
+                    raise
+                if not rows:
+                    break
+                self.rows_sent += len(rows)
+                self.throttle.consume(len(rows))
+                yield rows
+            else:
+                # The limit may fall exactly on the end of the result
+                if self.cursor.fetchone():
+                    self.truncated = 'row_limit'
+        except BaseException:
+            # GeneratorExit when the response is closed before the end (client went away)
+            self._close(*sys.exc_info())
+            raise
+        self._close(None, None, None)
+
+    def _out_of_time(self):
+        if time.monotonic() - self.started < self.max_seconds:
+            return False
+        print(f"   ⏱️ Streaming {self.job.job_name} stopped after {self.max_seconds}s")
+        self.truncated = 'time_limit'
+        return True
+
+    def close(self):
+        """Release the source connection if streaming did not run to the end"""
+        self._close(GeneratorExit, GeneratorExit(), None)
+
+    def _close(self, exc_type, exc_value, traceback):
+        if self.closed:
+            return
+        self.closed = True
+        if self.cursor is not None and (exc_type is not None or self.truncated):
+            # Stop the source working on rows nobody will read
+            try:
+                self.cursor.cancel()
+            except Exception as e:
+                print(f"   ⚠️ Could not cancel streaming query for {self.job.job_name}: {str(e)}")
+        if self.cursor is not None:
+            try:
+                self.cursor.close()
+            except Exception:
+                pass
+        if exc_type is not None:
+            print(f"   🔌 Streaming {self.job.job_name} ended after {self.rows_sent} rows: {exc_type.__name__}")
+        # An exception makes the pool discard the connection instead of reusing it
+        self._resources.__exit__(exc_type, exc_value, traceback)
+
+
+def ndjson_chunks(stream):
+    """
+    One NDJSON object per row, keyed by column name; one chunk per fetched
+    batch. A cut-off result ends with a {"truncated": true, "rows": n,
+    "reason": ...} line, which no row can produce.
+    """
+    names = stream.column_names
+    encode = RowEncoder().encode
+    for rows in stream.batches():
+        yield ''.join(encode(dict(zip(names, row))) + '\n' for row in rows)
+    if stream.truncated:
+        yield encode({'truncated': True, 'rows': stream.rows_sent, 'reason': stream.truncated}) + '\n'
+
+
+def csv_chunks(stream):
+    """
+    A CSV header line, then one chunk of CSV rows per fetched batch. CSV has
+    no room for a marker, so a cut-off result raises ResultTruncated after
+    the last rows: the server then drops the connection without the final
+    chunk and the client sees an incomplete download.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush():
+        value = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return value
+
+    writer.writerow(stream.column_names)
+    yield flush()
+    for rows in stream.batches():
+        writer.writerows(rows)
+        yield flush()
+    if stream.truncated:
+        raise ResultTruncated(f"Export stopped at {stream.rows_sent} rows ({stream.truncated})")
+
+
+class StreamedChunks:
+    """
+    Response content for StreamingHttpResponse, which closes it when the
+    response ends. Closing releases the stream even if the client went away
+    before the first chunk was generated.
+    """
+
+    def __init__(self, chunks, stream):
+        self.chunks = chunks
+        self.stream = stream
+
+    def __iter__(self):
+        return self.chunks
+
+    def close(self):
+        self.chunks.close()
+        self.stream.close()
+
+
+STREAM_FORMATS = {
+    'ndjson': (ndjson_chunks, 'application/x-ndjson'),
+    'csv': (csv_chunks, 'text/csv'),
+}
+
+
+def stream_content(stream, output):
+    """Encoded chunks of an opened QueryResultStream in the given output format"""
+    encode, content_type = STREAM_FORMATS[output]
+    return StreamedChunks(encode(stream), stream), content_type
@@ -2,7 +2,40 @@ from django.test import TestCase
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
-from .models import SourceConnection
+from .models import SourceConnection, Job, JobExecution, JobExecutionArchive, JobExecutionRollup, ExecutionProfile
+from .schema import infer_sql_type, schema_fingerprint, build_create_table_sql, describe_columns
+from .transforms import TransformPipeline, ColumnBatch, TransformError
+from .batches import TypedColumn
+from .tuning import BatchSizeTuner, fetch_tuner, insert_tuner
+from .throttling import get_throttle, reset_throttles, in_extract_window, validate_extract_windows, ThrottleTimeout
+from .quality import QualityProfile, QualityCheckError, check_quality, validate_quality_checks
+from .views import ETLViewSet
+from .retention import archive_executions
+from .profiling import capture_query_plan, update_query_baseline, ExecutionProfiler
+from .anomalies import update_runtime_baseline
+from .streaming import ResultTruncated
+from django.test import override_settings
+from unittest import mock
+from .connections import close_pools
+from crasbi import db_routing
+from crasbi.db_routing import (
+    ReplicaRouter, ReplicaRoutingMiddleware, PIN_COOKIE, read_only, use_primary, reset_replica_lag
+)
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.http import HttpResponse
+from django.test import RequestFactory
+from .admin import EstimatedCountPaginator
+from .estimation import plan_concurrency, sampled_row_count, catalog_table_stats
+from django.utils import timezone
+from datetime import timedelta
+import decimal
+import json
+import time
+import tracemalloc
 
 # Create your tests here.
 
@@ -62,3 +95,1097 @@ class SourceConnectionAPITest(APITestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 1)
+
+
+class FakeCursor:
+    """Minimal pyodbc cursor stand-in that records executed statements"""
+    def __init__(self, description, catalog_rows=None, query_rows=None):
+        self.description = description
+        self.catalog_rows = catalog_rows or []
+        self.query_rows = query_rows or {}
+        self.statements = []
+        self.inserted = []
+        self.cancelled = False
+        self.committed = None
+        self.rolled_back = False
+        self._last = []
+
+    def execute(self, sql, *params):
+        self.statements.append(sql)
+        if 'INFORMATION_SCHEMA' in sql:
+            self._last = self.catalog_rows
+        else:
+            self._last = list(self.query_rows.get(sql, []))
+        return self
+
+    def executemany(self, sql, rows):
+        self.statements.append(sql)
+        self.inserted.append((sql, list(rows)))
+
+    def fetchall(self):
+        return self._last
+
+    def fetchone(self):
+        return self._last[0] if self._last else None
+
+    def fetchmany(self, size):
+        batch, self._last = self._last[:size], self._last[size:]
+        return batch
+
+    def cancel(self):
+        self.cancelled = True
+
+    def commit(self):
+        self.committed = len(self.inserted)
+
+    def rollback(self):
+        self.rolled_back = True
+
+    def close(self):
+        pass
+
+class FakeConnection:
+    """pyodbc connection stand-in; every cursor it hands out is kept for assertions"""
+    opened = []
+    timeout = 0
+
+    def __init__(self, description, query_rows, connection_string=None):
+        self.connection_string = connection_string
+        self.description = description
+        self.query_rows = query_rows
+        self.cursors = []
+        FakeConnection.opened.append(self)
+
+    def cursor(self):
+        cursor = FakeCursor(self.description, query_rows=self.query_rows)
+        self.cursors.append(cursor)
+        return cursor
+
+    def close(self):
+        pass
+
+class FakeSourceTestCase(APITestCase):
+    """
+    Base for tests that run jobs against a fake source: resets pools,
+    throttles and FakeConnection.opened, creates self.source (and self.job
+    unless job_name is None) and patches pyodbc.connect so every connection
+    answers query_rows(). Subclasses set the class attributes they need and
+    may assign self.rows before running.
+    """
+    description = [('id', int, None, 10, 10, 0, False)]
+    query = 'SELECT id FROM events'
+    rows = []
+    source_name = 'Test Source'
+    source_host = 'localhost'
+    job_name = 'Events'
+    source_table = 'events'
+    target_table = 'dw_events'
+
+    def setUp(self):
+        FakeConnection.opened = []
+        close_pools()
+        reset_throttles()
+        self.source = self.create_source(self.source_name)
+        self.job = self.create_job() if self.job_name else None
+        patcher = mock.patch('api.connections.pyodbc.connect', side_effect=self.connect)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def create_source(self, source_name, **fields):
+        fields = {'db_type': 'sqlserver', 'host': self.source_host, 'port': 1433, **fields}
+        return SourceConnection.objects.create(
+            source_name=source_name, username='u', password='p', inserted_by='system', **fields
+        )
+
+    def create_job(self, **fields):
+        fields = {
+            'job_name': self.job_name, 'source': self.source, 'source_table': self.source_table,
+            'target_table': self.target_table, 'job_query': self.query, **fields
+        }
+        return Job.objects.create(created_by='system', **fields)
+
+    def query_rows(self):
+        return {self.query: self.rows}
+
+    def connect(self, connection_string=None, **kwargs):
+        return FakeConnection(self.description, self.query_rows(), connection_string)
+
+    def run_etl(self, **data):
+        return self.client.post(reverse('etl-run-etl'), {'source_id': self.source.id, **data}, format='json')
+
+class TargetSchemaTest(TestCase):
+    description = [
+        ('id', int, None, 10, 10, 0, False),
+        ('name', str, None, 100, 100, 0, True),
+        ('amount', decimal.Decimal, None, 18, 18, 2, True),
+    ]
+
+    def setUp(self):
+        self.source = SourceConnection.objects.create(
+            source_name='Schema Source', db_type='sqlserver', host='localhost',
+            port=1433, username='u', password='p', inserted_by='system'
+        )
+        self.job = Job.objects.create(
+            job_name='Load Orders', source=self.source, source_table='orders',
+            target_table='dw.orders', job_query='SELECT id, name, amount FROM orders',
+            created_by='system'
+        )
+
+    def test_infer_sql_type(self):
+        self.assertEqual(infer_sql_type(int), 'BIGINT')
+        self.assertEqual(infer_sql_type(str, 50), 'NVARCHAR(50)')
+        self.assertEqual(infer_sql_type(str, 0), 'NVARCHAR(MAX)')
+        self.assertEqual(infer_sql_type(decimal.Decimal, 18, 18, 2), 'DECIMAL(18,2)')
+
+    def test_create_table_sql(self):
+        sql = build_create_table_sql('dw.orders', describe_columns(self.description))
+        self.assertEqual(
+            sql,
+            'CREATE TABLE [dw].[orders] ([id] BIGINT NOT NULL, [name] NVARCHAR(100) NULL, [amount] DECIMAL(18,2) NULL)'
+        )
+
+    def test_resolve_target_creates_table_and_caches_mapping(self):
+        cursor = FakeCursor(self.description)
+        insert_sql = ETLViewSet()._resolve_target(self.job, cursor, self.description)
+        self.assertEqual(insert_sql, 'INSERT INTO [dw].[orders] ([id],[name],[amount]) VALUES (?,?,?)')
+        self.assertTrue(any(sql.startswith('CREATE TABLE') for sql in cursor.statements))
+
+        self.assertEqual(self.job.schema_fingerprint, schema_fingerprint('dw.orders', self.description, self.source.id))
+        self.assertEqual([column['target'] for column in self.job.column_mapping], ['id', 'name', 'amount'])
+
+        # Same fingerprint: no catalog queries or DDL on the next run
+        cached_cursor = FakeCursor(self.description)
+        self.assertEqual(ETLViewSet()._resolve_target(self.job, cached_cursor, self.description), insert_sql)
+        self.assertEqual(cached_cursor.statements, [])
+
+        # A new target database needs its own table even with the same result shape
+        self.job.target_connection = SourceConnection.objects.create(
+            source_name='Warehouse', db_type='sqlserver', host='dw.local', port=1433,
+            username='u', password='p', inserted_by='system', is_destination=True
+        )
+        moved_cursor = FakeCursor(self.description)
+        ETLViewSet()._resolve_target(self.job, moved_cursor, self.description)
+        self.assertTrue(any(sql.startswith('CREATE TABLE') for sql in moved_cursor.statements))
+
+    def test_resolve_target_alters_table_for_new_columns(self):
+        cursor = FakeCursor(self.description, catalog_rows=[('id',), ('name',)])
+        ETLViewSet()._resolve_target(self.job, cursor, self.description)
+        self.assertIn('ALTER TABLE [dw].[orders] ADD [amount] DECIMAL(18,2) NULL', cursor.statements)
+
+class TransformPipelineTest(TestCase):
+    description = [
+        ('qty', str, None, 10, 10, 0, True),
+        ('price', float, None, 8, 8, 0, True),
+        ('country', str, None, 2, 2, 0, True),
+    ]
+    rows = [('2', 1.5, 'PK'), ('3', 2.0, 'US'), (None, 4.0, 'PK')]
+
+    def test_pipeline_transforms_columns(self):
+        pipeline = TransformPipeline([
+            {'type': 'cast', 'columns': {'qty': 'int'}},
+            {'type': 'filter', 'column': 'qty', 'op': 'not_null'},
+            {'type': 'derive', 'column': 'total', 'op': 'multiply', 'args': ['qty', 'price']},
+            {'type': 'lookup', 'column': 'country', 'target': 'country_name', 'mapping': {'PK': 'Pakistan'}, 'default': 'Other'},
+            {'type': 'rename', 'columns': {'qty': 'quantity'}},
+        ])
+        batch = pipeline.apply(ColumnBatch.from_rows(self.description, self.rows))
+        self.assertEqual(batch.column_names, ['quantity', 'price', 'country', 'total', 'country_name'])
+        self.assertEqual(batch.to_rows(), [(2, 1.5, 'PK', 3.0, 'Pakistan'), (3, 2.0, 'US', 6.0, 'Other')])
+        self.assertEqual(batch.description[0][1], int)
+        self.assertEqual([timing['type'] for timing in pipeline.timing_report()], ['cast', 'filter', 'derive', 'lookup', 'rename'])
+
+    def test_batch_packs_numeric_columns_into_typed_buffers(self):
+        description = self.description + [('active', bool, None, 1, 1, 0, True)]
+        rows = [row + (flag,) for row, flag in zip(self.rows, [True, None, False])]
+        batch = ColumnBatch.from_rows(description, rows)
+        self.assertIsInstance(batch.column('price'), TypedColumn)
+        self.assertEqual(batch.column('price').data.typecode, 'd')
+        self.assertEqual(batch.column('active').null_count, 1)
+        self.assertEqual(batch.to_rows(), rows)
+
+        batch.filter([True, False, True])
+        self.assertEqual(batch.to_rows(), [rows[0], rows[2]])
+        self.assertEqual(list(batch.column('active')), [True, False])
+
+    def test_invalid_step_rejected(self):
+        with self.assertRaises(TransformError):
+            TransformPipeline([{'type': 'explode'}])
+        with self.assertRaises(TransformError):
+            TransformPipeline([{'type': 'cast', 'columns': {'qty': 'money'}}])
+        with self.assertRaises(TransformError):
+            TransformPipeline([{'type': 'rename', 'columns': ['qty']}])
+        with self.assertRaises(TransformError):
+            TransformPipeline([{'type': 'derive', 'column': 'total', 'op': 'multiply', 'args': ['qty']}])
+        with self.assertRaises(TransformError):
+            TransformPipeline([{'type': 'derive', 'column': 'code', 'op': 'upper', 'args': []}])
+        with self.assertRaises(TransformError):
+            TransformPipeline([{'type': 'derive', 'column': 'flag', 'op': 'constant'}])
+
+    def test_output_types_come_from_the_spec(self):
+        # Every qty is NULL, so nothing in the data says what the derived columns hold
+        rows = [(None, 1.5, 'PK'), (None, 2.0, 'US')]
+        pipeline = TransformPipeline([
+            {'type': 'cast', 'columns': {'qty': 'int'}},
+            {'type': 'derive', 'column': 'total', 'op': 'multiply', 'args': ['qty', 'price']},
+            {'type': 'derive', 'column': 'units', 'op': 'coalesce', 'args': ['qty']},
+            {'type': 'derive', 'column': 'ratio', 'op': 'divide', 'args': ['qty', {'value': 2}], 'output_type': 'decimal'},
+            {'type': 'lookup', 'column': 'country', 'target': 'region', 'mapping': {'PK': 1, 'US': 2}},
+        ])
+        batch = pipeline.apply(ColumnBatch.from_rows(self.description, rows))
+        types = {entry[0]: entry[1] for entry in batch.description}
+        self.assertEqual(types['total'], float)
+        self.assertEqual(types['units'], int)
+        self.assertEqual(types['ratio'], decimal.Decimal)
+        self.assertEqual(types['region'], int)
+        self.assertEqual(list(batch.column('region')), [1, 2])
+
+    def test_numeric_columns_are_computed_in_numpy(self):
+        description = [('qty', int, None, 10, 10, 0, True), ('price', float, None, 8, 8, 0, True)]
+        rows = [(2, 1.5), (None, 2.0), (4, 0.0), (3, None)]
+        pipeline = TransformPipeline([
+            {'type': 'derive', 'column': 'unit', 'op': 'divide', 'args': ['price', 'qty']},
+            {'type': 'derive', 'column': 'per_qty', 'op': 'divide', 'args': ['qty', 'price']},
+            {'type': 'derive', 'column': 'qty', 'op': 'coalesce', 'args': ['qty', {'value': 0}]},
+            {'type': 'derive', 'column': 'double', 'op': 'multiply', 'args': ['qty', {'value': 2}]},
+            {'type': 'filter', 'column': 'double', 'op': 'in', 'value': [0, 4, 8]},
+            {'type': 'cast', 'columns': {'price': 'int'}},
+        ])
+        batch = pipeline.apply(ColumnBatch.from_rows(description, rows))
+        self.assertTrue(all(isinstance(column, TypedColumn) for column in batch.columns))
+        self.assertEqual(batch.to_rows(), [(2, 1, 0.75, 2 / 1.5, 4), (0, 2, None, None, 0), (4, 0, 0.0, None, 8)])
+
+        # Results past int64 and values int() rejects take the per-value path
+        big = ColumnBatch.from_rows([('n', int, None, 19, 19, 0, True)], [(2 ** 62,), (None,)])
+        doubled = TransformPipeline([{'type': 'derive', 'column': 'n', 'op': 'multiply', 'args': ['n', {'value': 4}]}]).apply(big)
+        self.assertEqual(list(doubled.column('n')), [2 ** 64, None])
+        nan = ColumnBatch.from_rows([('x', float, None, 8, 8, 0, True)], [(float('nan'),)])
+        with self.assertRaises(TransformError):
+            TransformPipeline([{'type': 'cast', 'columns': {'x': 'int'}}]).apply(nan)
+
+    def test_computed_columns_keep_precision_scale_and_length(self):
+        description = [
+            ('price', decimal.Decimal, None, 18, 18, 2, True),
+            ('qty', int, None, 10, 10, 0, True),
+            ('rate', str, None, 10, 10, 0, True),
+            ('code', str, None, 3, 3, 0, True),
+        ]
+        rows = [(decimal.Decimal('12.34'), 3, '3.75', 'pk')]
+        pipeline = TransformPipeline([
+            {'type': 'derive', 'column': 'amt', 'op': 'multiply', 'args': ['price', 'qty']},
+            {'type': 'cast', 'columns': {'rate': 'decimal'}},
+            {'type': 'derive', 'column': 'fee', 'op': 'constant', 'value': 0, 'output_type': 'decimal', 'precision': 9, 'scale': 4},
+            {'type': 'derive', 'column': 'code', 'op': 'upper', 'args': ['code']},
+            {'type': 'derive', 'column': 'label', 'op': 'concat', 'args': ['code', 'qty'], 'separator': '-'},
+        ])
+        batch = pipeline.apply(ColumnBatch.from_rows(description, rows))
+        sql = build_create_table_sql('dw.sales', describe_columns(batch.description))
+        self.assertIn('[amt] DECIMAL(38,2)', sql)
+        self.assertIn('[rate] DECIMAL(38,10)', sql)
+        self.assertIn('[fee] DECIMAL(9,4)', sql)
+        self.assertIn('[code] NVARCHAR(3)', sql)
+        self.assertIn('[label] NVARCHAR(24)', sql)
+        # The fractional part reaches the loader intact
+        self.assertEqual(list(batch.column('amt')), [decimal.Decimal('37.02')])
+        self.assertEqual(list(batch.column('rate')), [decimal.Decimal('3.75')])
+        with self.assertRaises(TransformError):
+            TransformPipeline([{'type': 'cast', 'columns': {'rate': {'type': 'decimal', 'precision': 4, 'scale': 6}}}])
+
+class ExecutionRetentionTest(APITestCase):
+    def setUp(self):
+        source = SourceConnection.objects.create(
+            source_name='Retention Source', db_type='sqlserver', host='localhost',
+            port=1433, username='u', password='p', inserted_by='system'
+        )
+        self.job = Job.objects.create(
+            job_name='Nightly', source=source, source_table='a', target_table='b',
+            job_query='SELECT 1', created_by='system'
+        )
+        old = timezone.now() - timedelta(days=120)
+        for seconds, status_value in ((2.0, 'completed'), (4.0, 'completed'), (1.0, 'running')):
+            execution = JobExecution.objects.create(
+                job=self.job, source_name='Retention Source', job_name='Nightly', status=status_value,
+                execution_time_seconds=seconds, records_processed=10, executed_by='system',
+                execution_log='x' * 1000
+            )
+            JobExecution.objects.filter(id=execution.id).update(executed_at=old)
+        JobExecution.objects.create(
+            job=self.job, source_name='Retention Source', job_name='Nightly', status='completed',
+            execution_time_seconds=3.0, records_processed=5, executed_by='system'
+        )
+
+    def test_archive_moves_old_finished_executions(self):
+        stats = archive_executions(older_than_days=90, batch_size=1)
+        self.assertEqual(stats['archived'], 2)
+        self.assertEqual(stats['batches'], 2)
+        # Running and recent executions stay in bi_job_executions
+        self.assertEqual(JobExecution.objects.count(), 2)
+
+        rollup = JobExecutionRollup.objects.get()
+        self.assertEqual(rollup.executions, 2)
+        self.assertEqual(rollup.total_records, 20)
+        self.assertEqual(rollup.min_execution_seconds, 2.0)
+        self.assertEqual(rollup.max_execution_seconds, 4.0)
+
+        archived = JobExecutionArchive.objects.first()
+        self.assertEqual(archived.get_payload()['execution_log'], 'x' * 1000)
+
+    def test_archived_endpoints(self):
+        archive_executions(older_than_days=90)
+        response = self.client.get(reverse('etl-archived-history'), {'job_id': self.job.id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+
+        archived_id = response.data['results'][0]['id']
+        response = self.client.get(reverse('etl-archived-execution', args=[archived_id]))
+        self.assertEqual(response.data['execution_log'], 'x' * 1000)
+
+    def test_rollups_filter_by_day_and_reject_bad_dates(self):
+        archive_executions(older_than_days=90)
+        day = JobExecutionRollup.objects.get().day
+        response = self.client.get(reverse('etl-execution-rollups'), {'date_from': day.isoformat()})
+        self.assertEqual(response.data['count'], 1)
+        response = self.client.get(reverse('etl-execution-rollups'), {'date_to': (day - timedelta(days=1)).isoformat()})
+        self.assertEqual(response.data['count'], 0)
+        for params in ({'date_from': 'yesterday'}, {'date_to': '2024-13-45'}, {'job_id': 'x'}):
+            response = self.client.get(reverse('etl-execution-rollups'), params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_archive_keeps_the_run_metrics(self):
+        JobExecution.objects.filter(status='completed').update(
+            query_time_seconds=1.5, throttle_wait_seconds=0.25, is_query_regression=True, quality_passed=False,
+            read_rows_per_second=200.0, write_rows_per_second=150.0, load_time_seconds=0.5,
+            extract_fanout=3, is_anomaly=True
+        )
+        archive_executions(older_than_days=90)
+        payload = JobExecutionArchive.objects.first().get_payload()
+        self.assertEqual(payload['query_time_seconds'], 1.5)
+        self.assertEqual(payload['throttle_wait_seconds'], 0.25)
+        self.assertEqual(payload['extract_fanout'], 3)
+        self.assertIs(payload['quality_passed'], False)
+        self.assertIs(payload['is_anomaly'], True)
+
+        archived_id = JobExecutionArchive.objects.first().id
+        response = self.client.get(reverse('etl-archived-execution', args=[archived_id]))
+        self.assertEqual(response.data['read_rows_per_second'], 200.0)
+        self.assertEqual(response.data['write_rows_per_second'], 150.0)
+        self.assertIs(response.data['is_query_regression'], True)
+
+class QueryProfilingTest(TestCase):
+    def setUp(self):
+        source = SourceConnection.objects.create(
+            source_name='Profiling Source', db_type='sqlserver', host='localhost',
+            port=1433, username='u', password='p', inserted_by='system'
+        )
+        self.job = Job.objects.create(
+            job_name='Orders', source=source, source_table='orders', target_table='dw_orders',
+            job_query='SELECT * FROM orders;', created_by='system'
+        )
+
+    def test_sqlserver_plan_uses_showplan(self):
+        cursor = FakeCursor([])
+        capture_query_plan(cursor, 'sqlserver', self.job.job_query)
+        self.assertEqual(cursor.statements, ['SET SHOWPLAN_XML ON', 'SELECT * FROM orders', 'SET SHOWPLAN_XML OFF'])
+
+    @override_settings(ETL_QUERY_BASELINE_MIN_SAMPLES=3, ETL_QUERY_REGRESSION_FACTOR=2.0)
+    def test_regression_flagged_after_baseline_is_established(self):
+        for _ in range(3):
+            self.assertFalse(update_query_baseline(self.job, 1.0))
+        self.assertFalse(update_query_baseline(self.job, 1.5))
+        self.assertTrue(update_query_baseline(self.job, 5.0))
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.query_time_samples, 5)
+
+    def test_baseline_is_folded_from_the_stored_row(self):
+        stale = Job.objects.get(pk=self.job.pk)
+        update_query_baseline(self.job, 2.0)
+        # A second run holding an older copy of the job still builds on the first run's sample
+        update_query_baseline(stale, 4.0)
+        self.assertEqual(stale.query_time_samples, 2)
+        stored = Job.objects.get(pk=self.job.pk)
+        self.assertEqual(stored.query_time_samples, 2)
+        self.assertAlmostEqual(stored.query_time_baseline, 2.0 + settings.ETL_QUERY_BASELINE_ALPHA * 2.0)
+
+class RunEstimateTest(APITestCase):
+    def test_plan_concurrency_fits_window(self):
+        self.assertEqual(plan_concurrency([60, 60, 60, 60], 130, max_concurrency=8)[:2], (2, 120))
+        concurrency, predicted, fits = plan_concurrency([300, 10], 100, max_concurrency=8)
+        self.assertEqual((concurrency, predicted, fits), (2, 300, False))
+
+    def test_source_table_names_are_quoted_and_scoped(self):
+        cursor = FakeCursor([])
+        sampled_row_count(cursor, 'postgresql', 'sales.orders; DROP TABLE x')
+        self.assertEqual(cursor.statements, ['SELECT COUNT(*) FROM "sales"."orders; DROP TABLE x" TABLESAMPLE SYSTEM (1)'])
+        cursor = FakeCursor([])
+        catalog_table_stats(cursor, 'mysql', 'orders')
+        self.assertIn('TABLE_SCHEMA = COALESCE(?, DATABASE())', cursor.statements[0])
+
+    def test_estimate_falls_back_to_history(self):
+        source = SourceConnection.objects.create(
+            source_name='Estimate Source', db_type='sqlserver', host='localhost',
+            port=1433, username='u', password='p', inserted_by='system'
+        )
+        job = Job.objects.create(
+            job_name='Customers', source=source, source_table='customers', target_table='dw_customers',
+            job_query='SELECT * FROM customers', created_by='system'
+        )
+        Job.objects.create(
+            job_name='Orders', source=source, source_table='orders', target_table='dw_orders',
+            job_query='SELECT * FROM orders', created_by='system'
+        )
+        JobExecution.objects.create(
+            job=job, source_name='Estimate Source', job_name='Customers', status='completed',
+            execution_time_seconds=10, records_processed=1000, executed_by='system'
+        )
+
+        with override_settings(ETL_DEFAULT_ROWS_PER_SECOND=50):
+            response = self.client.get(reverse('etl-estimate'), {'source_id': source.id, 'target_window_seconds': 60})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        estimates = {estimate['job_name']: estimate for estimate in response.data['jobs']}
+        self.assertEqual(estimates['Customers']['row_estimate_basis'], 'history')
+        self.assertEqual(estimates['Customers']['rows_per_second'], 100)
+        self.assertEqual(estimates['Customers']['predicted_seconds'], 10)
+        self.assertEqual(estimates['Orders']['row_estimate_basis'], 'unknown')
+        self.assertEqual(estimates['Orders']['throughput_basis'], 'source_history')
+        self.assertTrue(response.data['fits_window'])
+
+class ExtractFanOutTest(FakeSourceTestCase):
+    description = [('id', int, None, 10, 10, 0, False), ('name', str, None, 50, 50, 0, True)]
+    query = 'SELECT id, name FROM customers'
+    rows = [(1, 'a'), (2, 'b')]
+    source_name = 'Fan Out Source'
+    job_name = None
+
+    def setUp(self):
+        super().setUp()
+        self.create_job(job_name='Load dw_customers', source_table='customers', target_table='dw_customers')
+        self.create_job(
+            job_name='Load crm_customers', source_table='customers', target_table='crm_customers',
+            job_query=self.query + ' ;'
+        )
+
+    def query_rows(self):
+        return {self.query: self.rows, self.query + ' ;': self.rows}
+
+    def test_identical_queries_are_extracted_once(self):
+        response = self.run_etl()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        cursors = [cursor for conn in FakeConnection.opened for cursor in conn.cursors]
+        extracts = [sql for cursor in cursors for sql in cursor.statements if sql.startswith('SELECT id')]
+        self.assertEqual(len(extracts), 1)
+
+        loaded = {sql.split(' ')[2]: inserted for cursor in cursors for sql, inserted in cursor.inserted}
+        self.assertEqual(loaded, {'[dw_customers]': self.rows, '[crm_customers]': self.rows})
+        executions = JobExecution.objects.filter(status='completed')
+        self.assertEqual(executions.count(), 2)
+        self.assertTrue(all(execution.extract_fanout == 2 for execution in executions))
+
+    def test_failure_recording_one_job_leaves_the_others_completed(self):
+        with mock.patch('api.views.update_query_baseline', side_effect=[RuntimeError('deadlock'), False]):
+            response = self.run_etl()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            sorted(result['status'] for result in response.data['execution_results']), ['completed', 'failed']
+        )
+        self.assertFalse(JobExecution.objects.filter(status='running').exists())
+
+    def test_loaders_into_the_source_take_connection_slots(self):
+        self.source.max_concurrent_connections = 3
+        self.source.save()
+        throttle = get_throttle(self.source)
+        with mock.patch.object(throttle.slots, 'acquire', wraps=throttle.slots.acquire) as acquire:
+            response = self.run_etl()
+        self.assertTrue(all(result['status'] == 'completed' for result in response.data['execution_results']))
+        # The reader plus one slot per loader writing back into the source
+        self.assertEqual(acquire.call_count, 3)
+        self.assertEqual(throttle.slots.in_use, 0)
+
+    def test_fan_out_beyond_the_connection_cap_is_refused(self):
+        self.source.max_concurrent_connections = 2
+        self.source.save()
+        response = self.run_etl()
+        results = response.data['execution_results']
+        self.assertEqual([result['status'] for result in results], ['failed', 'failed'])
+        self.assertIn('needs 3 source connections', results[0]['error'])
+        self.assertEqual(FakeConnection.opened, [])
+
+    def test_whitespace_inside_literals_keeps_queries_apart(self):
+        jobs = [
+            Job(job_name='single', job_query="SELECT id FROM customers WHERE name = 'a b'"),
+            Job(job_name='double', job_query="SELECT id FROM customers WHERE name = 'a  b'"),
+            Job(job_name='padded', job_query="  SELECT id FROM customers WHERE name = 'a b';\n"),
+        ]
+        groups = ETLViewSet._group_jobs_by_query(jobs)
+        self.assertEqual([[job.job_name for job in group] for group in groups], [['single', 'padded'], ['double']])
+
+class TargetConnectionTest(FakeSourceTestCase):
+    rows = [(1,), (2,), (3,)]
+    source_name = 'OLTP'
+    source_host = 'oltp.local'
+    job_name = None
+    target_table = 'fact_events'
+
+    def setUp(self):
+        super().setUp()
+        self.warehouse = self.create_source('Warehouse', host='dw.local', database='Warehouse', is_destination=True)
+        self.create_job(job_name='Events', target_connection=self.warehouse)
+
+    @override_settings(ETL_FETCH_BATCH_SIZE=2, ETL_ADAPTIVE_BATCH_SIZE=False)
+    def test_rows_are_written_on_the_target_connection(self):
+        response = self.run_etl()
+
+        self.assertEqual(response.data['execution_results'][0]['status'], 'completed')
+        source_conn, target_conn = FakeConnection.opened
+        self.assertIn('SERVER=oltp.local', source_conn.connection_string)
+        self.assertIn('SERVER=dw.local', target_conn.connection_string)
+        self.assertIn('DATABASE=Warehouse;', target_conn.connection_string)
+        self.assertEqual(source_conn.cursors[0].inserted, [])
+        inserted = [batch for cursor in target_conn.cursors for _sql, batch in cursor.inserted]
+        self.assertEqual(inserted, [[(1,), (2,)], [(3,)]])
+        execution = JobExecution.objects.get()
+        self.assertEqual(execution.records_processed, 3)
+        self.assertIsNotNone(execution.write_rows_per_second)
+
+    def test_target_connection_must_be_a_destination(self):
+        response = self.client.patch(
+            reverse('job-detail', args=[Job.objects.get().id]),
+            {'target_connection': self.source.id}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+class BatchSizeTuningTest(TestCase):
+    def test_grows_while_throughput_improves_then_settles(self):
+        tuner = BatchSizeTuner(1000, 100, 100000)
+        self.assertEqual(tuner.record(1000, 1.0), 2000)
+        self.assertEqual(tuner.record(2000, 1.0), 4000)
+        # Twice the rows in twice the time is no gain: settle on the best size
+        self.assertEqual(tuner.record(4000, 2.0), 2000)
+        self.assertTrue(tuner.converged)
+        self.assertEqual(tuner.record(2000, 0.1), 2000)
+
+    def test_memory_budget_caps_wide_rows(self):
+        tuner = BatchSizeTuner(1000, 100, 100000, memory_budget=10 * 1024 * 1024, buffered_batches=5)
+        # 8 KB rows: five buffered batches of 256 rows fill the 10 MB budget
+        self.assertEqual(tuner.record(1000, 1.0, nbytes=1000 * 8192), 256)
+
+    @override_settings(ETL_MIN_BATCH_SIZE=1, ETL_FETCH_BATCH_SIZE=100)
+    def test_learned_sizes_start_the_next_run(self):
+        job = Job(fetch_batch_size=4000, insert_batch_size=None)
+        self.assertEqual(fetch_tuner(job).size, 4000)
+        self.assertEqual(insert_tuner(job).size, 100)
+        with override_settings(ETL_ADAPTIVE_BATCH_SIZE=False):
+            self.assertEqual(fetch_tuner(job).size, 100)
+
+class DataQualityTest(FakeSourceTestCase):
+    description = [('id', int, None, 10, 10, 0, False), ('name', str, None, 50, 50, 0, True)]
+    query = 'SELECT id, name FROM customers'
+    source_name = 'Quality Source'
+    job_name = 'Customers'
+    source_table = 'customers'
+    target_table = 'dw_customers'
+
+    def test_profile_is_order_independent(self):
+        rows = [(3, 'c'), (1, None), (2, 'a')]
+        profiles = []
+        for ordering in (rows, list(reversed(rows))):
+            profile = QualityProfile()
+            profile.add(ColumnBatch.from_rows(self.description, ordering[:1]))
+            profile.add(ColumnBatch.from_rows(self.description, ordering[1:]))
+            profiles.append(profile.report())
+        self.assertEqual(profiles[0], profiles[1])
+        self.assertEqual(profiles[0]['columns']['id'], {'nulls': 0, 'min': 1, 'max': 3})
+        self.assertEqual(profiles[0]['columns']['name'], {'nulls': 1, 'min': 'a', 'max': 'c'})
+
+    def test_thresholds(self):
+        profile = QualityProfile()
+        profile.add(ColumnBatch.from_rows(self.description, [(1, None), (5, 'a')]))
+        violations = check_quality(
+            {'max_null_ratio': {'name': 0.25}, 'ranges': {'id': {'max': 4}}, 'min_rows': 2}, profile, target_rows_added=3
+        )
+        # No max_row_count_difference: the target count drift is not a violation
+        self.assertEqual(len(violations), 2)
+        self.assertEqual(check_quality({'max_row_count_difference': 1, 'min_rows': 2}, profile, target_rows_added=3), [])
+        self.assertEqual(len(check_quality({'max_row_count_difference': 0}, profile, target_rows_added=3)), 1)
+        with self.assertRaises(QualityCheckError):
+            validate_quality_checks({'max_null_ratio': 2})
+
+    def test_failed_checks_fail_the_execution(self):
+        self.job.quality_checks = {'not_null': ['name']}
+        self.job.save()
+        self.rows = [(1, 'a'), (2, None)]
+        response = self.run_etl()
+
+        self.assertEqual(response.data['execution_results'][0]['status'], 'failed')
+        execution = JobExecution.objects.get()
+        self.assertFalse(execution.quality_passed)
+        self.assertEqual(execution.records_processed, 2)
+        self.assertEqual(execution.quality_report['columns']['name']['nulls'], 1)
+        self.assertIn('not_null', execution.error_message)
+        # Rejected rows are not left behind on the target
+        loader_cursor = next(cursor for conn in FakeConnection.opened for cursor in conn.cursors if cursor.inserted)
+        self.assertTrue(loader_cursor.rolled_back)
+        # Only the target DDL was committed, before any insert
+        self.assertEqual(loader_cursor.committed, 0)
+
+    def test_target_count_drift_is_only_recorded_without_checks(self):
+        self.rows = [(1, 'a'), (2, 'b')]
+        # Another writer added rows to the target while the job loaded
+        with mock.patch.object(ETLViewSet, '_count_target_rows', side_effect=[100, 150]):
+            response = self.run_etl()
+
+        self.assertEqual(response.data['execution_results'][0]['status'], 'completed')
+        execution = JobExecution.objects.get()
+        self.assertTrue(execution.quality_passed)
+        self.assertEqual(execution.quality_report['target_rows_added'], 50)
+        self.assertEqual(execution.quality_report['row_count_difference'], 48)
+        # One commit after the last insert
+        loader_cursor = next(cursor for conn in FakeConnection.opened for cursor in conn.cursors if cursor.inserted)
+        self.assertEqual(loader_cursor.committed, len(loader_cursor.inserted))
+        self.assertFalse(loader_cursor.rolled_back)
+
+class SourceThrottleTest(FakeSourceTestCase):
+    source_name = 'Busy OLTP'
+
+    def test_extract_windows_wrap_midnight(self):
+        windows = [{'start': '22:00', 'end': '06:00'}]
+        today = timezone.localtime().replace(minute=0, second=0, microsecond=0)
+        self.assertTrue(in_extract_window(windows, today.replace(hour=23)))
+        self.assertTrue(in_extract_window(windows, today.replace(hour=5)))
+        self.assertFalse(in_extract_window(windows, today.replace(hour=12)))
+        with self.assertRaises(ValueError):
+            validate_extract_windows([{'start': '25:00', 'end': '06:00'}])
+
+    def test_rate_limit_wait_is_reported_apart_from_query_time(self):
+        self.source.max_rows_per_second = 100
+        self.source.save()
+        with mock.patch('api.throttling.time.sleep') as sleep:
+            self.rows = [(i,) for i in range(300)]
+            response = self.run_etl()
+        result = response.data['execution_results'][0]
+        self.assertEqual(result['status'], 'completed')
+        # 100 rows of burst allowance, the remaining 200 rows at 100 rows/sec
+        self.assertAlmostEqual(result['throttle_wait_seconds'], 2.0, places=1)
+        self.assertAlmostEqual(sleep.call_args[0][0], 2.0, places=1)
+        self.assertLess(result['query_time_seconds'], 1.0)
+
+    def test_outside_window_cancels_the_execution(self):
+        now = timezone.localtime()
+        start = (now + timedelta(hours=2)).strftime('%H:%M')
+        end = (now + timedelta(hours=3)).strftime('%H:%M')
+        self.source.extract_windows = [{'start': start, 'end': end}]
+        self.source.save()
+        self.rows = [(1,)]
+        response = self.run_etl()
+        self.assertEqual(response.data['execution_results'][0]['status'], 'cancelled')
+        self.assertEqual(FakeConnection.opened, [])
+
+    @override_settings(ETL_THROTTLE_CONNECTION_TIMEOUT=0.01)
+    def test_connection_cap_is_shared_by_all_jobs(self):
+        self.source.max_concurrent_connections = 1
+        throttle = get_throttle(self.source)
+        with throttle.connection_slot():
+            with self.assertRaises(ThrottleTimeout):
+                with throttle.connection_slot():
+                    pass
+        with throttle.connection_slot() as waited:
+            self.assertLess(waited, 1)
+
+    @override_settings(ETL_THROTTLE_CONNECTION_TIMEOUT=0.01)
+    def test_changed_limits_resize_the_held_slots(self):
+        self.source.max_concurrent_connections = 2
+        throttle = get_throttle(self.source)
+        with throttle.connection_slot():
+            self.source.max_concurrent_connections = 1
+            # The running extract keeps its slot and counts against the lower cap
+            self.assertIs(get_throttle(self.source), throttle)
+            with self.assertRaises(ThrottleTimeout):
+                with throttle.connection_slot():
+                    pass
+
+    @override_settings(ETL_THROTTLE_WORKER_PROCESSES=8)
+    def test_connection_cap_below_worker_count_is_rejected(self):
+        response = self.client.patch(
+            reverse('sourceconnection-detail', args=[self.source.id]), {'max_concurrent_connections': 4}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('max_concurrent_connections', response.data)
+
+class ExecutionProfilingTest(FakeSourceTestCase):
+    rows = [(1,), (2,)]
+    source_name = 'Profiled Source'
+
+    def test_sampler_records_stacks_and_allocations(self):
+        def busy_loop():
+            deadline = time.perf_counter() + 0.1
+            data = []
+            while time.perf_counter() < deadline:
+                data.append(str(len(data)))
+            return data
+
+        profiler = ExecutionProfiler(interval=0.001).start()
+        busy_loop()
+        profile = profiler.stop()
+        self.assertGreater(profile['cpu_samples'], 0)
+        self.assertIn('busy_loop (tests.py:', profile['cpu'])
+        self.assertTrue(profile['memory'])
+        self.assertGreater(profile['peak_memory_bytes'], 0)
+        self.assertEqual(profile['memory_scope'], 'execution')
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_overlapping_profiles_share_tracing_and_are_marked_process_wide(self):
+        first = ExecutionProfiler(interval=0.01).start()
+        second = ExecutionProfiler(interval=0.01).start()
+        self.assertEqual(first.stop()['memory_scope'], 'process')
+        # The run still profiling keeps its session
+        self.assertTrue(tracemalloc.is_tracing())
+        self.assertEqual(second.stop()['memory_scope'], 'process')
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_tracing_started_elsewhere_is_left_running(self):
+        tracemalloc.start()
+        try:
+            profile = ExecutionProfiler(interval=0.01).start().stop()
+            self.assertEqual(profile['memory_scope'], 'process')
+            self.assertTrue(tracemalloc.is_tracing())
+        finally:
+            tracemalloc.stop()
+
+    def test_profile_is_stored_and_downloadable(self):
+        response = self.run_etl(profile_execution=True)
+        profile_id = response.data['execution_results'][0]['profile_id']
+        self.assertIsNotNone(profile_id)
+
+        execution = JobExecution.objects.get()
+        url = reverse('etl-execution-profile', args=[execution.id])
+        self.assertEqual(self.client.get(url).data['id'], profile_id)
+        cpu = self.client.get(url, {'kind': 'cpu'})
+        self.assertEqual(cpu['Content-Type'], 'text/plain; charset=utf-8')
+        memory = self.client.get(url, {'kind': 'memory'})
+        self.assertIsInstance(json.loads(memory.content), list)
+
+    def test_no_profile_without_the_flag(self):
+        self.run_etl()
+        self.assertEqual(ExecutionProfile.objects.count(), 0)
+        response = self.client.get(reverse('etl-execution-profile', args=[JobExecution.objects.get().id]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+class LargeTableAdminTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        self.client.force_login(user)
+        self.source = SourceConnection.objects.create(
+            source_name='Admin Source', db_type='sqlserver', host='localhost', port=1433,
+            username='u', password='p', inserted_by='system'
+        )
+        job = Job.objects.create(
+            job_name='Orders', source=self.source, source_table='orders', target_table='dw_orders',
+            job_query='SELECT 1', created_by='system'
+        )
+        for state in ('completed', 'failed', 'completed'):
+            JobExecution.objects.create(
+                job=job, source_name='Admin Source', job_name='Orders', status=state,
+                executed_by='system', execution_log='x' * 1000
+            )
+
+    def test_unfiltered_changelist_uses_catalog_estimate(self):
+        url = reverse('admin:api_jobexecution_changelist')
+        with mock.patch('api.admin.estimated_row_count', return_value=10_000_000) as estimate:
+            response = self.client.get(url)
+            self.assertEqual(response.context['cl'].result_count, 10_000_000)
+            filtered = self.client.get(url, {'status__exact': 'completed', 'source_name': 'Admin Source'})
+        self.assertEqual(estimate.call_count, 1)
+        self.assertEqual(filtered.context['cl'].result_count, 2)
+        self.assertIn('execution_log', response.context['cl'].queryset.query.deferred_loading[0])
+
+    def test_filtered_changelist_is_counted_exactly(self):
+        paginator = EstimatedCountPaginator(JobExecution.objects.filter(status='completed').order_by('id'), 1)
+        with mock.patch('api.admin.estimated_row_count') as estimate, CaptureQueriesContext(connection) as queries:
+            self.assertEqual(paginator.num_pages, 2)
+        estimate.assert_not_called()
+        self.assertNotIn('LIMIT', queries[0]['sql'])
+        self.assertEqual(len(paginator.page(2).object_list), 1)
+
+    def test_source_filter_choices_are_cached(self):
+        url = reverse('admin:api_job_changelist')
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'source_id': self.source.id})
+        self.assertEqual(response.context['cl'].result_count, 1)
+        # Sources are only joined into the job rows; filter choices come from the cache
+        self.assertFalse(any('FROM "source_connection"' in query['sql'] for query in queries))
+
+class ResultStreamingTest(FakeSourceTestCase):
+    description = [('id', int, None, 10, 10, 0, False), ('amount', decimal.Decimal, None, 10, 10, 2, True)]
+    query = 'SELECT id, amount FROM orders'
+    rows = [(i, decimal.Decimal(f'{i}.50') if i % 2 else None) for i in range(25)]
+    source_name = 'Orders DB'
+    job_name = 'Orders'
+    source_table = 'orders'
+    target_table = 'dw_orders'
+
+    @override_settings(ETL_STREAM_BATCH_SIZE=4)
+    def test_preview_streams_first_rows_and_cancels_the_rest(self):
+        response = self.client.get(reverse('job-preview', args=[self.job.id]), {'rows': 5})
+        chunks = list(response.streaming_content)
+        self.assertEqual(len(chunks), 3)
+        lines = [json.loads(line) for line in b''.join(chunks).decode().splitlines()]
+        self.assertEqual(lines[:2], [{'id': 0, 'amount': None}, {'id': 1, 'amount': '1.50'}])
+        self.assertEqual(lines[5:], [{'truncated': True, 'rows': 5, 'reason': 'row_limit'}])
+        self.assertTrue(FakeConnection.opened[0].cursors[0].cancelled)
+
+    @override_settings(ETL_STREAM_BATCH_SIZE=2, ETL_EXPORT_MAX_SECONDS=0.05)
+    def test_time_limit_is_marked_at_the_end_of_the_stream(self):
+        fetchmany = FakeCursor.fetchmany
+
+        def slow_fetchmany(cursor, size):
+            time.sleep(0.03)
+            return fetchmany(cursor, size)
+
+        with mock.patch.object(FakeCursor, 'fetchmany', slow_fetchmany):
+            response = self.client.get(reverse('job-export-results', args=[self.job.id]), {'output': 'ndjson'})
+            lines = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        marker = lines[-1]
+        self.assertEqual(marker['reason'], 'time_limit')
+        self.assertEqual(marker['rows'], len(lines) - 1)
+        self.assertLess(marker['rows'], len(self.rows))
+
+    @override_settings(ETL_EXPORT_MAX_ROWS=10)
+    def test_truncated_csv_export_ends_abnormally(self):
+        response = self.client.get(reverse('job-export-results', args=[self.job.id]), {'output': 'csv'})
+        with self.assertRaises(ResultTruncated):
+            b''.join(response.streaming_content)
+
+    @override_settings(ETL_STREAM_BATCH_SIZE=10)
+    def test_export_completes_and_reuses_the_connection(self):
+        for _ in range(2):
+            response = self.client.get(reverse('job-export-results', args=[self.job.id]), {'output': 'csv'})
+            body = b''.join(response.streaming_content).decode()
+        lines = body.splitlines()
+        self.assertEqual(lines[0], 'id,amount')
+        self.assertEqual(lines[1:3], ['0,', '1,1.50'])
+        self.assertEqual(len(lines), 26)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="Orders.csv"')
+        self.assertEqual(len(FakeConnection.opened), 1)
+        self.assertFalse(FakeConnection.opened[0].cursors[0].cancelled)
+
+    @override_settings(ETL_STREAM_BATCH_SIZE=5)
+    def test_client_disconnect_cancels_the_query_and_drops_the_connection(self):
+        response = self.client.get(reverse('job-export-results', args=[self.job.id]), {'output': 'ndjson'})
+        next(iter(response.streaming_content))
+        response.close()
+        self.assertTrue(FakeConnection.opened[0].cursors[0].cancelled)
+        response = self.client.get(reverse('job-export-results', args=[self.job.id]), {'output': 'ndjson'})
+        self.assertEqual(len(b''.join(response.streaming_content).splitlines()), 25)
+        self.assertEqual(len(FakeConnection.opened), 2)
+
+class RuntimeAnomalyTest(FakeSourceTestCase):
+    query = 'SELECT id FROM payments'
+    rows = [(i,) for i in range(20)]
+    source_name = 'Payments'
+    job_name = 'Payments'
+    source_table = 'payments'
+    target_table = 'dw_payments'
+
+    def record(self, seconds, rows):
+        execution = JobExecution(execution_time_seconds=seconds, records_processed=rows)
+        return [anomaly['kind'] for anomaly in update_runtime_baseline(self.job, execution)]
+
+    def test_baseline_flags_collapse_but_not_noise(self):
+        for seconds in (10.0, 11.0, 9.5, 10.5, 10.0, 9.8):
+            self.assertEqual(self.record(seconds, 1000), [])
+        self.assertEqual(self.job.runtime_baseline_samples, 6)
+        self.assertAlmostEqual(self.job.runtime_baseline['rows']['mean'], 1000)
+        # Ordinary variation stays quiet
+        self.assertEqual(self.record(12.0, 950), [])
+        self.assertEqual(sorted(self.record(60.0, 1000)), ['duration_spike', 'throughput_collapse'])
+        self.assertEqual(self.record(10.0, 100), ['row_count_drop'])
+
+    def test_row_count_drop_is_flagged_and_listed(self):
+        self.job.runtime_baseline = {
+            'duration': {'mean': 1.0, 'var': 0.01},
+            'rows': {'mean': 500.0, 'var': 25.0},
+            'throughput': {'mean': 500.0, 'var': 25.0},
+        }
+        self.job.runtime_baseline_samples = 10
+        self.job.save()
+        result = self.run_etl().data['execution_results'][0]
+        self.assertEqual(result['status'], 'completed')
+        self.assertIn('row_count_drop', [anomaly['kind'] for anomaly in result['anomalies']])
+
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.runtime_baseline_samples, 11)
+        response = self.client.get(reverse('etl-anomalies'), {'job_id': self.job.id, 'days': 1})
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(response.data['results'][0]['records_processed'], 20)
+
+    def test_anomaly_filters_are_validated(self):
+        for params in ({'days': 'inf'}, {'days': '1e10'}, {'days': 'nan'}, {'days': '-1'}, {'job_id': 'x'}, {'source_id': '1;'}):
+            response = self.client.get(reverse('etl-anomalies'), params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+
+    def test_baseline_is_folded_from_the_stored_row(self):
+        stale = Job.objects.get(pk=self.job.pk)
+        self.record(10.0, 1000)
+        # A second run holding an older copy of the job still builds on the first run's fold
+        update_runtime_baseline(stale, JobExecution(execution_time_seconds=10.0, records_processed=1000))
+        self.assertEqual(stale.runtime_baseline_samples, 2)
+        self.assertEqual(Job.objects.get(pk=self.job.pk).runtime_baseline_samples, 2)
+
+class BulkJobAPITest(APITestCase):
+    def setUp(self):
+        self.source = SourceConnection.objects.create(
+            source_name='Bulk Source', db_type='sqlserver', host='localhost',
+            port=1433, username='u', password='p', inserted_by='system'
+        )
+        self.existing = Job.objects.create(
+            job_name='job_0', source=self.source, source_table='t0', target_table='old_target',
+            job_query='SELECT 0', created_by='system'
+        )
+
+    def definitions(self, count):
+        return [
+            {
+                'job_name': f'job_{i}', 'source_name': 'Bulk Source', 'source_table': f't{i}',
+                'target_table': f'dw_t{i}', 'job_query': f'SELECT {i}'
+            }
+            for i in range(count)
+        ]
+
+    def test_bulk_create_and_update(self):
+        response = self.client.post(reverse('job-bulk'), self.definitions(300), format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual((response.data['created'], response.data['updated']), (299, 1))
+        self.assertEqual(Job.objects.count(), 300)
+        self.existing.refresh_from_db()
+        self.assertEqual(self.existing.target_table, 'dw_t0')
+
+    def test_bulk_rejects_everything_on_any_error(self):
+        definitions = self.definitions(3)
+        definitions[2]['source_name'] = 'Missing Source'
+        definitions[1]['transforms'] = [{'type': 'explode'}]
+        response = self.client.post(reverse('job-bulk'), definitions, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 2])
+        self.assertEqual(Job.objects.count(), 1)
+
+    def test_bulk_reports_bad_field_types_and_lengths(self):
+        definitions = self.definitions(4)
+        definitions[0]['job_name'] = 'x' * 256
+        definitions[1]['job_query'] = ['SELECT 1']
+        definitions[2]['id'] = [1]
+        definitions[3]['profile_query'] = 'yes'
+        response = self.client.post(reverse('job-bulk'), definitions, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = {error['index']: set(error['errors']) for error in response.data['errors']}
+        self.assertEqual(errors, {0: {'job_name'}, 1: {'job_query'}, 2: {'id'}, 3: {'profile_query'}})
+
+    def test_export_round_trips_through_ndjson_import(self):
+        response = self.client.get(reverse('job-export'), {'source_id': self.source.id})
+        body = b''.join(response.streaming_content)
+        self.assertEqual(json.loads(body.splitlines()[0])['source_name'], 'Bulk Source')
+
+        Job.objects.all().delete()
+        response = self.client.post(reverse('job-bulk'), body, content_type='application/x-ndjson')
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(Job.objects.get().job_query, 'SELECT 0')
+
+class ReplicaRoutingTest(TestCase):
+    router = ReplicaRouter()
+
+    def setUp(self):
+        reset_replica_lag()
+        self.databases_with_replica = {**settings.DATABASES, 'replica': settings.DATABASES['default']}
+
+    def test_reads_outside_read_only_requests_use_primary(self):
+        with override_settings(DATABASES=self.databases_with_replica):
+            self.assertEqual(self.router.db_for_read(Job), 'default')
+            with read_only():
+                self.assertEqual(self.router.db_for_write(Job), 'default')
+
+    def test_read_only_requests_use_healthy_replica(self):
+        with override_settings(DATABASES=self.databases_with_replica, DATABASE_REPLICA_MAX_LAG_SECONDS=30):
+            with mock.patch('crasbi.db_routing.measure_replica_lag', return_value=5.0), read_only():
+                self.assertEqual(self.router.db_for_read(Job), 'replica')
+                with use_primary():
+                    self.assertEqual(self.router.db_for_read(Job), 'default')
+
+    def test_lagging_or_unreachable_replica_falls_back_to_primary(self):
+        with override_settings(DATABASES=self.databases_with_replica, DATABASE_REPLICA_MAX_LAG_SECONDS=30):
+            with mock.patch('crasbi.db_routing.measure_replica_lag', return_value=120.0), read_only():
+                self.assertEqual(self.router.db_for_read(Job), 'default')
+            reset_replica_lag()
+            with mock.patch('crasbi.db_routing.measure_replica_lag', side_effect=Exception('down')), read_only():
+                self.assertEqual(self.router.db_for_read(Job), 'default')
+
+    def test_middleware_pins_writers_to_primary(self):
+        seen = []
+        middleware = ReplicaRoutingMiddleware(lambda request: seen.append(db_routing._read_only.get()) or HttpResponse())
+        factory = RequestFactory()
+        with override_settings(DATABASES=self.databases_with_replica):
+            response = middleware(factory.post('/api/jobs/'))
+            middleware(factory.get('/api/jobs/'))
+            request = factory.get('/api/jobs/')
+            request.COOKIES[PIN_COOKIE] = response.cookies[PIN_COOKIE].value
+            middleware(request)
+        self.assertEqual(seen, [False, True, False])
+
+    def test_sql_server_lag_is_read_from_the_primary_for_this_database(self):
+        primary, replica = mock.MagicMock(vendor='microsoft'), mock.MagicMock(vendor='microsoft')
+        primary_cursor = primary.cursor.return_value.__enter__.return_value
+        primary_cursor.fetchone.return_value = (3,)
+        with mock.patch('crasbi.db_routing.connections', {'default': primary, 'replica': replica}):
+            self.assertEqual(db_routing.measure_replica_lag('replica'), 3.0)
+        query = primary_cursor.execute.call_args[0][0]
+        self.assertIn('secondary_lag_seconds', query)
+        self.assertIn('DB_ID()', query)
+        replica.cursor.return_value.__enter__.return_value.execute.assert_called_once_with('SELECT 1')
+
+class FastListSerializationTest(APITestCase):
+    def setUp(self):
+        self.source = SourceConnection.objects.create(
+            source_name='Fast Source', db_type='postgresql', host='localhost',
+            port=5432, username='u', password='p', inserted_by='system'
+        )
+        job = Job.objects.create(
+            job_name='fast_job', source=self.source, source_table='t', target_table='dw_t',
+            job_query='SELECT 1', transforms=[{'type': 'rename', 'column': 'a', 'to': 'b'}],
+            created_by='system'
+        )
+        Job.objects.create(
+            job_name='plain_job', source=self.source, source_table='t2', target_table='dw_t2',
+            job_query='SELECT 2', created_by='system'
+        )
+        JobExecution.objects.create(
+            job=job, source_name='Fast Source', job_name='fast_job', status='failed', executed_by='system'
+        )
+        JobExecution.objects.create(
+            job=job, source_name='Fast Source', job_name='fast_job', status='completed',
+            execution_time_seconds=1.5, records_processed=10, executed_by='system', query_time_seconds=0.25
+        )
+        JobExecution.objects.create(
+            job=job, source_name='Fast Source', job_name='fast_job', status='completed',
+            execution_time_seconds=9.0, records_processed=10, executed_by='system', read_rows_per_second=1.25,
+            is_anomaly=True, anomalies=[{'kind': 'duration_spike', 'metric': 'duration', 'value': 9.0,
+                                         'baseline': 1.5, 'deviations': None}]
+        )
+
+    def test_fast_lists_match_model_serializers(self):
+        urls = [
+            (reverse('sourceconnection-list'), {}),
+            (reverse('sourceconnection-active-connections'), {}),
+            (reverse('sourceconnection-by-db-type'), {'db_type': 'postgresql'}),
+            (reverse('job-list'), {}),
+            (reverse('job-by-source'), {'source_id': self.source.id}),
+            (reverse('etl-active-sources'), {}),
+            (reverse('etl-execution-history'), {}),
+            (reverse('etl-execution-history'), {'status': 'failed'}),
+            (reverse('etl-query-regressions'), {}),
+            (reverse('etl-anomalies'), {}),
+        ]
+        for url, params in urls:
+            with override_settings(API_FAST_LIST_SERIALIZATION=False):
+                expected = self.client.get(url, params)
+            fast = self.client.get(url, params)
+            self.assertEqual(fast.status_code, status.HTTP_200_OK, url)
+            self.assertEqual(fast.content, expected.content, url)
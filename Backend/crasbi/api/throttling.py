@@ -0,0 +1,244 @@
+import datetime
+import threading
+import time
+from contextlib import contextmanager
+from django.conf import settings
+from django.utils import timezone
+
+
+class ThrottleTimeout(Exception):
+    """Raised when no extract connection slot frees up within ETL_THROTTLE_CONNECTION_TIMEOUT"""
+
+
+class ConnectionCapExceeded(Exception):
+    """Raised when a run needs more simultaneous source connections than the source allows"""
+
+
+class OutsideExtractWindow(Exception):
+    """Raised when a source may not be extracted at the current time of day"""
+
+
+def _parse_time(value):
+    return datetime.time.fromisoformat(value)
+
+
+def validate_extract_windows(windows):
+    """Check a source's extract_windows ([{'start': 'HH:MM', 'end': 'HH:MM'}, ...]); raises ValueError"""
+    if windows in (None, []):
+        return windows
+    if not isinstance(windows, list):
+        raise ValueError("Extract windows must be a list of {'start': 'HH:MM', 'end': 'HH:MM'}.")
+    for window in windows:
+        if not isinstance(window, dict) or set(window) != {'start', 'end'}:
+            raise ValueError("Each extract window needs exactly a start and an end.")
+        try:
+            _parse_time(window['start'])
+            _parse_time(window['end'])
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid extract window times: {window['start']} - {window['end']}")
+    return windows
+
+
+def in_extract_window(windows, now=None):
+    """Whether the local time falls inside any window; windows may wrap past midnight"""
+    if not windows:
+        return True
+    current = (now or timezone.localtime()).time()
+    for window in windows:
+        start, end = _parse_time(window['start']), _parse_time(window['end'])
+        if start <= end:
+            if start <= current < end:
+                return True
+        elif current >= start or current < end:
+            return True
+    return False
+
+
+class TokenBucket:
+    """
+    Rate limiter shared by every thread extracting from a source. Rows (or
+    bytes) are taken after each fetch; the bucket may go into debt and the
+    caller sleeps until the debt is repaid, so the long-run rate stays at the
+    limit even with batches larger than one second's allowance.
+    """
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.capacity = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def set_rate(self, rate):
+        with self.lock:
+            self.rate = rate
+            self.capacity = rate
+            self.tokens = min(self.tokens, rate)
+
+    def consume(self, amount):
+        """Take amount tokens and sleep off any deficit; returns seconds waited"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= amount
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class ConnectionSlots:
+    """
+    Counting semaphore whose limit can change while slots are held: lowering
+    it makes new callers wait until enough holders release, raising it wakes
+    waiters. A limit of None means no cap.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.in_use = 0
+        self.condition = threading.Condition()
+
+    def acquire(self, timeout):
+        with self.condition:
+            available = self.condition.wait_for(
+                lambda: self.limit is None or self.in_use < self.limit, timeout=timeout
+            )
+            if available:
+                self.in_use += 1
+            return available
+
+    def release(self):
+        with self.condition:
+            self.in_use -= 1
+            self.condition.notify()
+
+    def resize(self, limit):
+        with self.condition:
+            self.limit = limit
+            self.condition.notify_all()
+
+
+def per_worker_connections(max_connections, workers):
+    """Connection slots per worker process; raises ValueError when the cap cannot be split"""
+    if not max_connections:
+        return None
+    if max_connections < workers:
+        raise ValueError(
+            f"max_concurrent_connections ({max_connections}) must be at least "
+            f"ETL_THROTTLE_WORKER_PROCESSES ({workers}) so every worker process gets a connection"
+        )
+    return max_connections // workers
+
+
+class SourceThrottle:
+    """
+    Extract limits for one SourceConnection, shared by every job and thread
+    in this process. Limits are divided by ETL_THROTTLE_WORKER_PROCESSES so
+    the configured totals hold across all server worker processes. When a
+    source's limits change the throttle is resized in place, so slots held
+    by running extracts still count against the new cap.
+    """
+
+    def __init__(self, source_connection):
+        self.slots = ConnectionSlots(None)
+        self.rows = None
+        self.bytes = None
+        self.configure(source_connection)
+
+    def configure(self, source_connection):
+        workers = max(1, settings.ETL_THROTTLE_WORKER_PROCESSES)
+        self.config = self.config_for(source_connection)
+        max_connections, rows_per_second, bytes_per_second, windows = self.config
+        self.windows = windows
+        try:
+            limit = per_worker_connections(max_connections, workers)
+        except ValueError as e:
+            # Saved before the worker count was raised; one slot per worker exceeds the cap
+            print(f"⚠️ {source_connection.source_name}: {str(e)}; allowing 1 connection per worker process")
+            limit = 1
+        self.slots.resize(limit)
+        self.rows = self._bucket(self.rows, rows_per_second, workers)
+        self.bytes = self._bucket(self.bytes, bytes_per_second, workers)
+
+    @staticmethod
+    def _bucket(bucket, rate, workers):
+        if not rate:
+            return None
+        if bucket is None:
+            return TokenBucket(rate / workers)
+        bucket.set_rate(rate / workers)
+        return bucket
+
+    @staticmethod
+    def config_for(source_connection):
+        return (
+            source_connection.max_concurrent_connections,
+            source_connection.max_rows_per_second,
+            source_connection.max_bytes_per_second,
+            source_connection.extract_windows or None,
+        )
+
+    @property
+    def measures_bytes(self):
+        return self.bytes is not None
+
+    def check_window(self):
+        if not in_extract_window(self.windows):
+            windows = ', '.join(f"{window['start']}-{window['end']}" for window in self.windows)
+            raise OutsideExtractWindow(f"Source may only be extracted during {windows}")
+
+    def check_connections(self, connections):
+        """Refuse a run whose reader and source-bound loaders could never all hold a slot at once"""
+        limit = self.slots.limit
+        if limit is not None and connections > limit:
+            raise ConnectionCapExceeded(
+                f"Run needs {connections} source connections (extract plus loads into the source) "
+                f"but only {limit} are allowed per worker process"
+            )
+
+    @contextmanager
+    def connection_slot(self, timeout=None):
+        """
+        Hold one of the source's connection slots; yields the seconds spent
+        waiting. timeout defaults to ETL_THROTTLE_CONNECTION_TIMEOUT.
+        """
+        timeout = settings.ETL_THROTTLE_CONNECTION_TIMEOUT if timeout is None else timeout
+        started = time.monotonic()
+        if not self.slots.acquire(timeout=timeout):
+            raise ThrottleTimeout(f"No source connection slot freed up within {timeout} seconds")
+        try:
+            yield time.monotonic() - started
+        finally:
+            self.slots.release()
+
+    def consume(self, rows, nbytes=None):
+        """Account for a fetched batch; returns seconds slept to stay under the rate limits"""
+        waited = 0.0
+        if self.rows is not None:
+            waited += self.rows.consume(rows)
+        if self.bytes is not None and nbytes is not None:
+            waited += self.bytes.consume(nbytes)
+        return waited
+
+
+_throttles = {}
+_throttles_lock = threading.Lock()
+
+
+def get_throttle(source_connection):
+    """Return the process-wide throttle for a source, reconfigured in place when its limits change"""
+    config = SourceThrottle.config_for(source_connection)
+    with _throttles_lock:
+        throttle = _throttles.get(source_connection.id)
+        if throttle is None:
+            throttle = _throttles[source_connection.id] = SourceThrottle(source_connection)
+        elif throttle.config != config:
+            throttle.configure(source_connection)
+        return throttle
+
+
+def reset_throttles():
+    with _throttles_lock:
+        _throttles.clear()
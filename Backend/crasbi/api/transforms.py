@@ -0,0 +1,635 @@
+import datetime
+import decimal
+import operator
+import time
+from itertools import compress
+import numpy as np
+from .batches import ARRAY_TYPECODES, TypedColumn, pack_column, column_nbytes
+
+
+class TransformError(ValueError):
+    """Raised when a job's transform definition is invalid or cannot be applied"""
+
+
+CAST_TYPES = {
+    'int': int,
+    'float': float,
+    'decimal': decimal.Decimal,
+    'str': str,
+    'bool': bool,
+    'date': datetime.date,
+    'datetime': datetime.datetime,
+}
+
+COMPARISON_OPS = {
+    'eq': operator.eq,
+    'ne': operator.ne,
+    'gt': operator.gt,
+    'ge': operator.ge,
+    'lt': operator.lt,
+    'le': operator.le,
+}
+
+ARITHMETIC_OPS = {
+    'add': operator.add,
+    'subtract': operator.sub,
+    'multiply': operator.mul,
+    'divide': operator.truediv,
+}
+
+DERIVE_OPS = ('concat', 'coalesce', 'upper', 'lower', 'constant')
+
+# derive op -> (min, max) operands in args; None means no upper bound
+DERIVE_ARITY = dict(
+    {op: (2, 2) for op in ARITHMETIC_OPS},
+    concat=(1, None), coalesce=(1, None), upper=(1, 1), lower=(1, 1), constant=(0, 0),
+)
+
+# Result types of arithmetic on numeric operands, widest first
+NUMERIC_PROMOTION = (decimal.Decimal, float, int)
+
+# SQL Server's widest DECIMAL; wider arithmetic results give up scale first, as SQL Server does
+MAX_DECIMAL_PRECISION = 38
+
+# Precision of an integer operand in DECIMAL arithmetic, and the text length of a number
+INT_PRECISION = 19
+INT_TEXT_LENGTH = 20
+
+
+class ColumnBatch:
+    """
+    A batch of rows held column-wise: one compact buffer per column (see
+    api/batches.py) plus the DB-API style description for each column.
+    Built once from the fetched rows, then transforms work on whole columns
+    and loaders write it without keeping a row object per record. Numeric
+    columns (TypedColumn) are cast, filtered and combined as NumPy arrays;
+    str, Decimal, date and other object columns go value by value.
+    """
+
+    def __init__(self, description, columns):
+        self.description = list(description)
+        self.columns = columns
+
+    @classmethod
+    def from_rows(cls, description, rows):
+        if rows:
+            columns = [pack_column(values, entry[1]) for entry, values in zip(description, zip(*rows))]
+        else:
+            columns = [[] for _ in description]
+        return cls(description, columns)
+
+    def copy(self):
+        """Independent batch sharing the column buffers, which are replaced but never mutated in place"""
+        return ColumnBatch(self.description, list(self.columns))
+
+    @property
+    def column_names(self):
+        return [column[0] for column in self.description]
+
+    def __len__(self):
+        return len(self.columns[0]) if self.columns else 0
+
+    def index(self, name):
+        try:
+            return self.column_names.index(name)
+        except ValueError:
+            raise TransformError(f"Unknown column: {name}")
+
+    def column(self, name):
+        return self.columns[self.index(name)]
+
+    def shape(self, name):
+        """(type_code, internal_size, precision, scale) of a column, as its description has them"""
+        entry = self.description[self.index(name)]
+        return entry[1], entry[3], entry[4], entry[5]
+
+    def set_column(self, name, values, type_code, size=None, precision=None, scale=None):
+        """
+        Replace a column or append a new one, updating its description. size
+        is the string length, precision/scale apply to Decimal columns; None
+        leaves the target type to its wide default (NVARCHAR(MAX), DECIMAL(38,10)).
+        """
+        if type_code is decimal.Decimal:
+            size = precision
+        entry = (name, type_code, None, size, precision, scale, True)
+        if not isinstance(values, TypedColumn):
+            values = pack_column(values, type_code)
+        if name in self.column_names:
+            position = self.index(name)
+            self.columns[position] = values
+            self.description[position] = entry
+        else:
+            self.columns.append(values)
+            self.description.append(entry)
+
+    def filter(self, mask):
+        """Keep only the rows whose mask entry is true"""
+        mask = np.asarray(mask, dtype=np.bool_)
+        keep = mask.tolist()
+        self.columns = [
+            column.compress(mask) if isinstance(column, TypedColumn) else list(compress(column, keep))
+            for column in self.columns
+        ]
+        return self
+
+    @property
+    def nbytes(self):
+        return sum(column_nbytes(column) for column in self.columns)
+
+    def iter_rows(self):
+        """Row tuples produced one at a time, for DB-API executemany"""
+        return zip(*self.columns)
+
+    def to_rows(self):
+        return list(self.iter_rows())
+
+
+def _cast_value(type_code):
+    if type_code is datetime.datetime:
+        return lambda value: value if isinstance(value, datetime.datetime) else datetime.datetime.fromisoformat(str(value))
+    if type_code is datetime.date:
+        return lambda value: value if isinstance(value, datetime.date) else datetime.date.fromisoformat(str(value))
+    if type_code is decimal.Decimal:
+        return lambda value: decimal.Decimal(str(value))
+    return type_code
+
+
+# Python ints past int64 would wrap in NumPy; batches reaching this far take the per-value path
+INT64_LIMIT = 2.0 ** 63
+
+
+def _is_vector_scalar(value):
+    """A constant NumPy can combine with a typed column with Python's result"""
+    if isinstance(value, bool) or isinstance(value, float):
+        return True
+    return isinstance(value, int) and -INT64_LIMIT <= value < INT64_LIMIT
+
+
+def _vector_operand(batch, arg):
+    """(values, nulls) arrays of a typed numeric column or numeric constant, or None"""
+    if isinstance(arg, dict):
+        value = arg['value']
+        if value is None:
+            return np.zeros(len(batch), dtype=np.int64), np.ones(len(batch), dtype=np.bool_)
+        if _is_vector_scalar(value):
+            return np.full(len(batch), value), np.zeros(len(batch), dtype=np.bool_)
+        return None
+    column = batch.column(arg)
+    return column.numpy() if isinstance(column, TypedColumn) else None
+
+
+def _typed(type_code, values, nulls):
+    """Pack NumPy results into a TypedColumn of type_code, zeroing the slots under NULLs"""
+    values = np.where(nulls, 0, values)
+    return TypedColumn.from_numpy(ARRAY_TYPECODES[type_code], values, nulls, type_code is bool)
+
+
+def _vector_cast(column, type_code):
+    """Numeric-to-numeric cast of a typed column in NumPy, or None where it needs the per-value path"""
+    if not isinstance(column, TypedColumn) or type_code not in ARRAY_TYPECODES:
+        return None
+    values, nulls = column.numpy()
+    if type_code is bool:
+        return _typed(bool, values != 0, nulls)
+    if type_code is int and values.dtype.kind == 'f':
+        present = values[~nulls]
+        # int() raises on NaN/inf and Python ints do not overflow
+        if not np.all(np.isfinite(present)) or np.any(np.abs(present) >= INT64_LIMIT):
+            return None
+        values = np.trunc(values)
+    return _typed(type_code, values, nulls)
+
+
+def _convert(column, type_code):
+    """Convert every value of a column to type_code, keeping NULLs"""
+    converted = _vector_cast(column, type_code)
+    if converted is not None:
+        return converted
+    convert = _cast_value(type_code)
+    return [None if value is None else convert(value) for value in column]
+
+
+def _apply_rename(batch, step):
+    for old, new in step['columns'].items():
+        position = batch.index(old)
+        batch.description[position] = (new,) + tuple(batch.description[position][1:])
+    return batch
+
+
+def _decimal_digits(value):
+    """(precision, scale) that holds a Decimal or int constant"""
+    if isinstance(value, int):
+        return max(len(str(abs(value))), 1), 0
+    _sign, digits, exponent = value.as_tuple()
+    scale = max(-exponent, 0)
+    return max(len(digits) + max(exponent, 0), scale, 1), scale
+
+
+def _text_length(shape):
+    """Longest text a value of this shape turns into, or None if unbounded"""
+    type_code, size, precision, _scale = shape
+    if type_code is str:
+        return size or None
+    if type_code in (int, bool):
+        return INT_TEXT_LENGTH
+    if type_code is decimal.Decimal and precision:
+        # Sign and decimal point
+        return precision + 2
+    return None
+
+
+def _cast_shape(shape, type_code):
+    """Size, precision and scale a column of this shape keeps when converted to type_code"""
+    source_type, size, precision, scale = shape
+    if type_code is str:
+        return _text_length(shape), None, None
+    if type_code is decimal.Decimal:
+        if source_type is decimal.Decimal:
+            return None, precision, scale
+        if source_type in (int, bool):
+            return None, INT_PRECISION, 0
+    return None, None, None
+
+
+def _declared_shape(spec, size, precision, scale):
+    """Override an inferred shape with the length/precision/scale a cast or derive spec declares"""
+    return spec.get('length', size), spec.get('precision', precision), spec.get('scale', scale)
+
+
+def _cast_spec(spec):
+    """A cast target is a type name or {"type": ..., "precision"/"scale"/"length": ...}"""
+    return spec if isinstance(spec, dict) else {'type': spec}
+
+
+def _apply_cast(batch, step):
+    for name, spec in step['columns'].items():
+        spec = _cast_spec(spec)
+        type_code = CAST_TYPES[spec['type']]
+        shape = _declared_shape(spec, *_cast_shape(batch.shape(name), type_code))
+        batch.set_column(name, _convert(batch.column(name), type_code), type_code, *shape)
+    return batch
+
+
+def _operand(batch, arg):
+    """Resolve a derive/filter argument to a column list or a repeated constant"""
+    if isinstance(arg, dict) and 'value' in arg:
+        return [arg['value']] * len(batch)
+    return batch.column(arg)
+
+
+def _constant_shape(value):
+    """(type_code, size, precision, scale) of a literal in a transform spec"""
+    if value is None:
+        return str, None, None, None
+    if isinstance(value, str):
+        return str, max(len(value), 1), None, None
+    if isinstance(value, decimal.Decimal):
+        return (decimal.Decimal, None) + _decimal_digits(value)
+    return type(value), None, None, None
+
+
+def _operand_shape(batch, arg):
+    """Shape of a derive argument: the column's description, or the constant's"""
+    if isinstance(arg, dict):
+        return _constant_shape(arg['value'])
+    return batch.shape(arg)
+
+
+def _decimal_operand(shape):
+    type_code, _size, precision, scale = shape
+    if type_code in (int, bool):
+        return INT_PRECISION, 0
+    if type_code is decimal.Decimal and precision:
+        return precision, scale or 0
+    return None
+
+
+def _decimal_result(op, left, right):
+    """Precision and scale of DECIMAL arithmetic, by SQL Server's rules for the result type"""
+    if left is None or right is None:
+        return None, None
+    (p1, s1), (p2, s2) = left, right
+    if op in ('add', 'subtract'):
+        scale = max(s1, s2)
+        precision = max(p1 - s1, p2 - s2) + scale + 1
+    elif op == 'multiply':
+        precision, scale = p1 + p2 + 1, s1 + s2
+    else:
+        scale = max(6, s1 + p2 + 1)
+        precision = p1 - s1 + s2 + scale
+    if precision > MAX_DECIMAL_PRECISION:
+        # Keep the integer digits and give up fractional ones, down to 6
+        scale = max(min(scale, 6), scale - (precision - MAX_DECIMAL_PRECISION))
+        precision = MAX_DECIMAL_PRECISION
+    return precision, scale
+
+
+def _widest(shapes):
+    """Shape that holds the values of every shape of the same type (coalesce)"""
+    type_code = shapes[0][0]
+    if any(shape[0] is not type_code for shape in shapes):
+        return shapes[0]
+    if type_code is str:
+        sizes = [shape[1] for shape in shapes]
+        return str, max(sizes) if all(sizes) else None, None, None
+    if type_code is decimal.Decimal:
+        digits = [_decimal_operand(shape) for shape in shapes]
+        if None in digits:
+            return decimal.Decimal, None, None, None
+        scale = max(s for _p, s in digits)
+        precision = min(max(p - s for p, s in digits) + scale, MAX_DECIMAL_PRECISION)
+        return decimal.Decimal, precision, precision, scale
+    return shapes[0]
+
+
+def _derive_shape(batch, step):
+    """
+    (type_code, size, precision, scale) of a derive step's output, taken from
+    the spec and the input column descriptions rather than from the values,
+    so a batch of all-NULL results still gets the column's real type, and a
+    DECIMAL(18,2) input does not come out as a scale-0 decimal. An explicit
+    output_type, length, precision or scale wins.
+    """
+    op = step['op']
+    args = step.get('args', [])
+    shapes = [_operand_shape(batch, arg) for arg in args]
+    if op in ARITHMETIC_OPS:
+        types = {int if shape[0] is bool else shape[0] for shape in shapes}
+        if not types <= set(NUMERIC_PROMOTION):
+            if 'output_type' not in step:
+                raise TransformError(f"derive {op} on non-numeric columns needs an output_type")
+            shape = (CAST_TYPES[step['output_type']], None, None, None)
+        elif decimal.Decimal in types:
+            precision, scale = _decimal_result(op, *map(_decimal_operand, shapes))
+            shape = (decimal.Decimal, precision, precision, scale)
+        elif op == 'divide':
+            shape = (float, None, None, None)
+        else:
+            shape = (next(t for t in NUMERIC_PROMOTION if t in types), None, None, None)
+    elif op == 'coalesce':
+        shape = _widest(shapes)
+    elif op == 'constant':
+        shape = _constant_shape(step['value'])
+    elif op == 'concat':
+        lengths = [_text_length(shape) for shape in shapes]
+        separator = len(step.get('separator', '')) * (len(shapes) - 1)
+        shape = (str, None if None in lengths else sum(lengths) + separator, None, None)
+    else:
+        shape = (str, _text_length(shapes[0]), None, None)
+    type_code = shape[0]
+    if 'output_type' in step and CAST_TYPES[step['output_type']] is not type_code:
+        type_code = CAST_TYPES[step['output_type']]
+        shape = (type_code,) + _cast_shape(shape, type_code)
+    return (type_code,) + _declared_shape(step, *shape[1:])
+
+
+def _vector_derive(batch, step):
+    """
+    Arithmetic, coalesce and constants over typed numeric columns and numeric
+    constants, computed in NumPy with Python's result types. None when an
+    operand is not numeric or an int result would leave int64.
+    """
+    op = step['op']
+    if op == 'constant':
+        operands = [_vector_operand(batch, {'value': step['value']})] if step['value'] is not None else [None]
+    elif op in ARITHMETIC_OPS or op == 'coalesce':
+        operands = [_vector_operand(batch, arg) for arg in step.get('args', [])]
+    else:
+        return None
+    if any(operand is None for operand in operands):
+        return None
+    kinds = {values.dtype.kind for values, _nulls in operands}
+
+    if op in ARITHMETIC_OPS:
+        (left, left_nulls), (right, right_nulls) = operands
+        nulls = left_nulls | right_nulls
+        if op == 'divide':
+            nulls = nulls | (right == 0)
+        # bool + bool is an int in Python
+        left, right = (values.astype(np.int64) if values.dtype.kind == 'b' else values for values in (left, right))
+        with np.errstate(all='ignore'):
+            values = ARITHMETIC_OPS[op](left, right)
+        if values.dtype.kind == 'f':
+            return _typed(float, values, nulls)
+        exact = ARITHMETIC_OPS[op](left.astype(np.float64), right.astype(np.float64))
+        if np.any(np.abs(exact[~nulls]) >= INT64_LIMIT / 2):
+            return None
+        return _typed(int, values, nulls)
+
+    # coalesce and constant keep their operands' type, so mixed kinds stay per value
+    if len(kinds) > 1:
+        return None
+    type_code = {'b': bool, 'i': int, 'f': float}[kinds.pop()]
+    values, nulls = operands[0]
+    for other, other_nulls in operands[1:]:
+        values = np.where(nulls, other, values)
+        nulls = nulls & other_nulls
+    return _typed(type_code, values, nulls)
+
+
+def _apply_derive(batch, step):
+    op = step['op']
+    type_code, *shape = _derive_shape(batch, step)
+    values = _vector_derive(batch, step)
+    if values is None:
+        values = _derive_values(batch, step)
+    if 'output_type' in step:
+        values = _convert(values, type_code)
+    batch.set_column(step['column'], values, type_code, *shape)
+    return batch
+
+
+def _derive_values(batch, step):
+    """Per-value derive, for text ops and operands NumPy cannot hold"""
+    op = step['op']
+    operands = [_operand(batch, arg) for arg in step.get('args', [])]
+    if op in ARITHMETIC_OPS:
+        func = ARITHMETIC_OPS[op]
+        left, right = operands
+        values = [
+            None if a is None or b is None or (op == 'divide' and b == 0) else func(a, b)
+            for a, b in zip(left, right)
+        ]
+    elif op == 'concat':
+        separator = step.get('separator', '')
+        values = [separator.join('' if v is None else str(v) for v in parts) for parts in zip(*operands)]
+    elif op == 'coalesce':
+        values = [next((v for v in parts if v is not None), None) for parts in zip(*operands)]
+    elif op == 'upper':
+        values = [None if v is None else str(v).upper() for v in operands[0]]
+    elif op == 'lower':
+        values = [None if v is None else str(v).lower() for v in operands[0]]
+    elif op == 'constant':
+        values = [step['value']] * len(batch)
+    else:
+        raise TransformError(f"Unknown derive op: {op}")
+    return values
+
+
+def _vector_filter_mask(column, step):
+    """Boolean mask for a filter on a typed numeric column, or None where it needs the per-value path"""
+    op = step['op']
+    values, nulls = column.numpy()
+    if op == 'is_null':
+        return nulls.copy()
+    if op == 'not_null':
+        return ~nulls
+    if op in ('in', 'not_in'):
+        allowed = list(step['value'])
+        if not all(value is None or _is_vector_scalar(value) for value in allowed):
+            return None
+        hits = np.isin(values, [value for value in allowed if value is not None]) & ~nulls
+        if None in allowed:
+            hits |= nulls
+        return hits if op == 'in' else ~hits
+    if not _is_vector_scalar(step['value']):
+        return None
+    return COMPARISON_OPS[op](values, step['value']) & ~nulls
+
+
+def _filter_mask(batch, step):
+    values = batch.column(step['column'])
+    if isinstance(values, TypedColumn):
+        mask = _vector_filter_mask(values, step)
+        if mask is not None:
+            return mask
+    op = step['op']
+    if op == 'is_null':
+        return [value is None for value in values]
+    if op == 'not_null':
+        return [value is not None for value in values]
+    if op in ('in', 'not_in'):
+        allowed = set(step['value'])
+        keep = op == 'in'
+        return [(value in allowed) == keep for value in values]
+    compare = COMPARISON_OPS[op]
+    target = step['value']
+    return [value is not None and compare(value, target) for value in values]
+
+
+def _apply_filter(batch, step):
+    return batch.filter(_filter_mask(batch, step))
+
+
+def _lookup_shape(step):
+    """
+    Output shape of a lookup, from its mapped values and default: their
+    shared type (str when they differ), sized to hold the widest of them
+    """
+    shapes = [_constant_shape(value) for value in list(step['mapping'].values()) + [step.get('default')] if value is not None]
+    if not shapes:
+        return str, None, None, None
+    if len({shape[0] for shape in shapes}) > 1:
+        shapes = [_constant_shape(str(value)) for value in list(step['mapping'].values()) + [step.get('default')] if value is not None]
+    return _widest(shapes)
+
+
+def _apply_lookup(batch, step):
+    mapping = step['mapping']
+    default = step.get('default')
+    lookup = mapping.get
+    type_code, *shape = _lookup_shape(step)
+    values = [default if value is None else lookup(str(value), default) for value in batch.column(step['column'])]
+    if type_code is str:
+        values = [None if value is None else str(value) for value in values]
+    batch.set_column(step.get('target', step['column']), values, type_code, *shape)
+    return batch
+
+
+TRANSFORM_STEPS = {
+    'rename': (_apply_rename, ('columns',)),
+    'cast': (_apply_cast, ('columns',)),
+    'derive': (_apply_derive, ('column', 'op')),
+    'filter': (_apply_filter, ('column', 'op')),
+    'lookup': (_apply_lookup, ('column', 'mapping')),
+}
+
+
+class TransformPipeline:
+    """Ordered list of transform steps applied to each batch between extract and load"""
+
+    def __init__(self, steps):
+        self.steps = [self._validate(index, step) for index, step in enumerate(steps or [])]
+        self.timings = [0.0 for _ in self.steps]
+
+    @staticmethod
+    def _validate(index, step):
+        if not isinstance(step, dict) or step.get('type') not in TRANSFORM_STEPS:
+            raise TransformError(f"Transform {index}: type must be one of {', '.join(TRANSFORM_STEPS)}")
+        _func, required = TRANSFORM_STEPS[step['type']]
+        missing = [key for key in required if key not in step]
+        if missing:
+            raise TransformError(f"Transform {index} ({step['type']}): missing {', '.join(missing)}")
+        if step['type'] in ('rename', 'cast') and not isinstance(step['columns'], dict):
+            raise TransformError(f"Transform {index} ({step['type']}): columns must be an object")
+        if step['type'] == 'rename':
+            invalid = [old for old, new in step['columns'].items() if not isinstance(new, str) or not new]
+            if invalid:
+                raise TransformError(f"Transform {index} (rename): new names must be non-empty strings ({', '.join(invalid)})")
+        if step['type'] == 'cast':
+            specs = [_cast_spec(spec) for spec in step['columns'].values()]
+            unknown = [str(spec.get('type')) for spec in specs if not isinstance(spec.get('type'), str) or spec['type'] not in CAST_TYPES]
+            if unknown:
+                raise TransformError(f"Transform {index} (cast): unknown types {', '.join(unknown)}")
+            for spec in specs:
+                TransformPipeline._validate_shape(index, 'cast', spec)
+        if step['type'] == 'derive':
+            TransformPipeline._validate_derive(index, step)
+            TransformPipeline._validate_shape(index, 'derive', step)
+        if step['type'] == 'lookup' and not isinstance(step['mapping'], dict):
+            raise TransformError(f"Transform {index} (lookup): mapping must be an object")
+        if step['type'] == 'filter' and step['op'] not in COMPARISON_OPS and step['op'] not in ('in', 'not_in', 'is_null', 'not_null'):
+            raise TransformError(f"Transform {index} (filter): unknown op {step['op']}")
+        return step
+
+    @staticmethod
+    def _validate_derive(index, step):
+        op = step['op']
+        if op not in DERIVE_ARITY:
+            raise TransformError(f"Transform {index} (derive): unknown op {op}")
+        args = step.get('args', [])
+        if not isinstance(args, list) or not all(isinstance(arg, str) or (isinstance(arg, dict) and 'value' in arg) for arg in args):
+            raise TransformError(f"Transform {index} (derive): args must be a list of column names or {{\"value\": ...}} constants")
+        least, most = DERIVE_ARITY[op]
+        if len(args) < least or (most is not None and len(args) > most):
+            expected = str(least) if least == most else f"at least {least}"
+            raise TransformError(f"Transform {index} (derive): {op} takes {expected} args, got {len(args)}")
+        if op == 'constant' and 'value' not in step:
+            raise TransformError(f"Transform {index} (derive): constant needs a value")
+        if 'output_type' in step and (not isinstance(step['output_type'], str) or step['output_type'] not in CAST_TYPES):
+            raise TransformError(f"Transform {index} (derive): unknown output_type {step['output_type']}")
+
+    @staticmethod
+    def _validate_shape(index, step_type, spec):
+        declared = {key: spec[key] for key in ('length', 'precision', 'scale') if key in spec}
+        if not all(isinstance(value, int) and not isinstance(value, bool) and value >= 0 for value in declared.values()):
+            raise TransformError(f"Transform {index} ({step_type}): length, precision and scale must be whole numbers")
+        if not 1 <= declared.get('precision', 1) <= MAX_DECIMAL_PRECISION:
+            raise TransformError(f"Transform {index} ({step_type}): precision must be 1-{MAX_DECIMAL_PRECISION}")
+        if declared.get('scale', 0) > declared.get('precision', MAX_DECIMAL_PRECISION):
+            raise TransformError(f"Transform {index} ({step_type}): scale cannot exceed precision")
+        if declared.get('length', 1) < 1:
+            raise TransformError(f"Transform {index} ({step_type}): length must be at least 1")
+
+    def __bool__(self):
+        return bool(self.steps)
+
+    def apply(self, batch):
+        """Run every step over the batch, accumulating per-step wall time"""
+        for index, step in enumerate(self.steps):
+            func, _required = TRANSFORM_STEPS[step['type']]
+            started = time.perf_counter()
+            try:
+                batch = func(batch, step)
+            except TransformError:
+                raise
+            except Exception as e:
+                raise TransformError(f"Transform {index} ({step['type']}) failed: {e}")
+            self.timings[index] += time.perf_counter() - started
+        return batch
+
+    def timing_report(self):
+        return [
+            {'step': index, 'type': step['type'], 'seconds': round(seconds, 4)}
+            for index, (step, seconds) in enumerate(zip(self.steps, self.timings))
+        ]
@@ -0,0 +1,96 @@
+from django.conf import settings
+
+
+class BatchSizeTuner:
+    """
+    Hill-climbs a batch size towards the best measured rows/sec. The size
+    doubles while each step is at least MIN_GAIN faster than the best seen so
+    far, then settles on the best size. A memory budget caps the size using
+    the measured bytes per row times the number of batches held at once, so
+    wide rows (NVARCHAR(MAX), blobs) get small batches and narrow rows large
+    ones.
+    """
+
+    GROWTH = 2
+    MIN_GAIN = 1.05
+
+    def __init__(self, initial, minimum, maximum, memory_budget=None, buffered_batches=1):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.memory_budget = memory_budget
+        self.buffered_batches = buffered_batches
+        self.size = self._clamp(initial or minimum, maximum)
+        self.best_size = self.size
+        self.best_rate = None
+        self.bytes_per_row = None
+        self.converged = False
+
+    def _clamp(self, size, cap):
+        return max(self.minimum, min(int(size), cap))
+
+    @property
+    def memory_cap(self):
+        """Largest size whose buffered batches fit the memory budget"""
+        if not self.memory_budget or not self.bytes_per_row:
+            return self.maximum
+        return int(self.memory_budget / (self.bytes_per_row * self.buffered_batches))
+
+    @property
+    def measuring_bytes(self):
+        """Whether the caller should pass the batch's byte size to record()"""
+        return bool(self.memory_budget) and (not self.converged or self.bytes_per_row is None)
+
+    def record(self, rows, seconds, nbytes=None):
+        """Feed one batch's measurements; returns the size to use next"""
+        if nbytes is not None and rows:
+            self.bytes_per_row = max(self.bytes_per_row or 0, nbytes / rows)
+        cap = min(self.maximum, self.memory_cap)
+
+        # Short (final) batches and unmeasurable ones say nothing about the size
+        if rows >= self.size and seconds > 0 and not self.converged:
+            rate = rows / seconds
+            if self.best_rate is None or rate >= self.best_rate * self.MIN_GAIN:
+                self.best_rate = rate
+                self.best_size = self.size
+                if self.size >= cap:
+                    self.converged = True
+                self.size = self.size * self.GROWTH
+            else:
+                self.size = self.best_size
+                self.converged = True
+
+        self.size = self._clamp(self.size, cap)
+        self.best_size = self._clamp(self.best_size, cap)
+        return self.size
+
+
+def _fixed(size):
+    # Tuning switched off: always the configured size
+    tuner = BatchSizeTuner(size, size, size)
+    tuner.converged = True
+    return tuner
+
+
+def fetch_tuner(job):
+    """Tuner for a job's fetchmany size, warm-started from the size its last run learned"""
+    if not settings.ETL_ADAPTIVE_BATCH_SIZE:
+        return _fixed(settings.ETL_FETCH_BATCH_SIZE)
+    return BatchSizeTuner(
+        job.fetch_batch_size or settings.ETL_FETCH_BATCH_SIZE,
+        settings.ETL_MIN_BATCH_SIZE,
+        settings.ETL_MAX_BATCH_SIZE,
+        memory_budget=settings.ETL_BATCH_MEMORY_BUDGET_MB * 1024 * 1024,
+        # Queued batches plus the one being read and the one being written
+        buffered_batches=settings.ETL_PIPELINE_QUEUE_DEPTH + 2,
+    )
+
+
+def insert_tuner(job):
+    """Tuner for the rows per executemany() on a job's target"""
+    if not settings.ETL_ADAPTIVE_BATCH_SIZE:
+        return _fixed(settings.ETL_FETCH_BATCH_SIZE)
+    return BatchSizeTuner(
+        job.insert_batch_size or settings.ETL_FETCH_BATCH_SIZE,
+        settings.ETL_MIN_BATCH_SIZE,
+        settings.ETL_MAX_BATCH_SIZE,
+    )
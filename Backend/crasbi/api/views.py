@@ -2,18 +2,53 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.parsers import JSONParser
 from django_filters.rest_framework import DjangoFilterBackend
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.utils import timezone
-from django.db import transaction
+from django.utils.dateparse import parse_date
 import time
-import pyodbc
-from .models import SourceConnection, Job, JobExecution
+from datetime import timedelta
+from contextlib import ExitStack
+from functools import partial
+from .models import SourceConnection, Job, JobExecution, JobExecutionArchive, JobExecutionRollup, ExecutionProfile
+from .schema import schema_fingerprint, ensure_target_table
+from .transforms import ColumnBatch
+from .tuning import fetch_tuner
+from .throttling import get_throttle, OutsideExtractWindow, ThrottleTimeout
+from .profiling import capture_query_plan, update_query_baseline, ExecutionProfiler
+from .anomalies import update_runtime_baseline
+from .estimation import catalog_table_stats, sampled_row_count, historical_throughput, plan_concurrency
+from .connections import get_pool, odbc_connection_string
+from .loading import TargetLoader
+from .streaming import QueryResultStream, STREAM_FORMATS, stream_content
+from .bulk import NDJSONParser, export_jobs, prepare_bulk_jobs, save_bulk_jobs
+from .fast_serialization import (
+    SOURCE_CONNECTION_LIST, SOURCE_CONNECTION_LIST_NO_REQUEST, JOB_LIST, JOB_EXECUTION_SUMMARY, JOB_EXECUTION_ANOMALIES
+)
 from .serializers import (
     SourceConnectionSerializer, JobSerializer, JobDetailSerializer,
-    JobExecutionSerializer, JobExecutionSummarySerializer
+    JobExecutionSerializer, JobExecutionSummarySerializer, JobExecutionAnomalySerializer,
+    JobExecutionArchiveSerializer, JobExecutionArchiveDetailSerializer, JobExecutionRollupSerializer
 )
 
-class SourceConnectionViewSet(viewsets.ModelViewSet):
+class FastListMixin:
+    """
+    Serve list responses from values_list() rows through a FastListSerializer
+    (see api/fast_serialization.py) instead of per-row ModelSerializers,
+    unless API_FAST_LIST_SERIALIZATION is switched off
+    """
+
+    def fast_list_response(self, queryset, fast_serializer, paginate=True):
+        rows = fast_serializer.values(queryset)
+        if paginate:
+            page = self.paginate_queryset(rows)
+            if page is not None:
+                return self.get_paginated_response(fast_serializer.serialize(page))
+        return Response(fast_serializer.serialize(rows))
+
+class SourceConnectionViewSet(FastListMixin, viewsets.ModelViewSet):
     queryset = SourceConnection.objects.all()
     serializer_class = SourceConnectionSerializer
     permission_classes = []  # No authentication required
@@ -23,6 +58,11 @@ class SourceConnectionViewSet(viewsets.ModelViewSet):
     ordering = ['-created_at']
     filterset_fields = ['db_type', 'is_active']
 
+    def list(self, request, *args, **kwargs):
+        if not settings.API_FAST_LIST_SERIALIZATION:
+            return super().list(request, *args, **kwargs)
+        return self.fast_list_response(self.filter_queryset(self.get_queryset()), SOURCE_CONNECTION_LIST)
+
     @action(detail=True, methods=['post'])
     def toggle_active(self, request, pk=None):
         """Toggle the active status of a source connection"""
@@ -36,6 +76,8 @@ class SourceConnectionViewSet(viewsets.ModelViewSet):
     def active_connections(self, request):
         """Get only active source connections"""
         connections = SourceConnection.objects.filter(is_active=True)
+        if settings.API_FAST_LIST_SERIALIZATION:
+            return self.fast_list_response(connections, SOURCE_CONNECTION_LIST, paginate=False)
         serializer = self.get_serializer(connections, many=True)
         return Response(serializer.data)
 
@@ -48,6 +90,8 @@ class SourceConnectionViewSet(viewsets.ModelViewSet):
         else:
             connections = SourceConnection.objects.all()
         
+        if settings.API_FAST_LIST_SERIALIZATION:
+            return self.fast_list_response(connections, SOURCE_CONNECTION_LIST, paginate=False)
         serializer = self.get_serializer(connections, many=True)
         return Response(serializer.data)
 
@@ -61,13 +105,14 @@ class SourceConnectionViewSet(viewsets.ModelViewSet):
             'db_type': source_connection.db_type,
             'host': source_connection.host,
             'port': source_connection.port,
+            'database': source_connection.database,
             'username': source_connection.username,
             'is_active': source_connection.is_active,
             'connection_string': source_connection.get_connection_string()
         }
         return Response(data)
 
-class JobViewSet(viewsets.ModelViewSet):
+class JobViewSet(FastListMixin, viewsets.ModelViewSet):
     queryset = Job.objects.select_related('source').all()
     permission_classes = []
     filter_backends = [SearchFilter, OrderingFilter, DjangoFilterBackend]
@@ -81,12 +126,110 @@ class JobViewSet(viewsets.ModelViewSet):
             return JobDetailSerializer
         return JobSerializer
 
+    def list(self, request, *args, **kwargs):
+        if not settings.API_FAST_LIST_SERIALIZATION:
+            return super().list(request, *args, **kwargs)
+        return self.fast_list_response(self.filter_queryset(self.get_queryset()), JOB_LIST)
+
+    @action(detail=False, methods=['post'], parser_classes=[JSONParser, NDJSONParser])
+    def bulk(self, request):
+        """
+        Create or update many jobs in one request (JSON list or NDJSON).
+        Everything is validated before anything is written; jobs match
+        existing ones by id or by (source, job_name).
+        """
+        items = request.data
+        if isinstance(items, dict) and 'jobs' in items:
+            items = items['jobs']
+
+        if request.user and request.user.is_authenticated:
+            created_by = str(request.user)
+        else:
+            created_by = 'system'
+
+        to_create, to_update, errors = prepare_bulk_jobs(items, created_by)
+        if errors:
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        save_bulk_jobs(to_create, to_update, settings.ETL_BULK_BATCH_SIZE)
+        return Response({
+            'message': 'Jobs saved successfully',
+            'created': len(to_create),
+            'updated': len(to_update)
+        })
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Stream job definitions as NDJSON, optionally filtered by source_id"""
+        qs = Job.objects.all()
+        source_id = request.query_params.get('source_id')
+        if source_id:
+            qs = qs.filter(source_id=source_id)
+        response = StreamingHttpResponse(export_jobs(qs), content_type='application/x-ndjson')
+        response['Content-Disposition'] = 'attachment; filename="jobs.ndjson"'
+        return response
+
+    @action(detail=True, methods=['get'])
+    def preview(self, request, pk=None):
+        """Stream the first ?rows= rows of the job's query as NDJSON (at most ETL_PREVIEW_MAX_ROWS)"""
+        try:
+            rows = int(request.query_params.get('rows', settings.ETL_PREVIEW_ROWS))
+        except ValueError:
+            return Response({'error': 'rows must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        rows = max(0, min(rows, settings.ETL_PREVIEW_MAX_ROWS))
+        return self._stream_results(self.get_object(), 'ndjson', rows, settings.ETL_PREVIEW_MAX_SECONDS)
+
+    @action(detail=True, methods=['get'])
+    def export_results(self, request, pk=None):
+        """
+        Stream the job's full query result as a download (?output=csv or
+        ndjson), fetched from the source batch by batch and cut off at
+        ETL_EXPORT_MAX_ROWS rows or ETL_EXPORT_MAX_SECONDS. A cut-off NDJSON
+        export ends with a {"truncated": true, ...} line; a cut-off CSV
+        export ends abnormally (see api/streaming.py)
+        """
+        output = request.query_params.get('output', 'csv')
+        if output not in STREAM_FORMATS:
+            return Response(
+                {'error': f"output must be one of: {', '.join(STREAM_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        job = self.get_object()
+        response = self._stream_results(job, output, settings.ETL_EXPORT_MAX_ROWS, settings.ETL_EXPORT_MAX_SECONDS)
+        if isinstance(response, StreamingHttpResponse):
+            response['Content-Disposition'] = f'attachment; filename="{job.job_name}.{output}"'
+        return response
+
+    def _stream_results(self, job, output, max_rows, max_seconds):
+        try:
+            stream = QueryResultStream(
+                job, odbc_connection_string(job.source), get_throttle(job.source),
+                max_rows, max_seconds, settings.ETL_STREAM_BATCH_SIZE
+            ).open()
+        except (OutsideExtractWindow, ThrottleTimeout) as e:
+            return Response({'error': str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        except Exception as e:
+            print(f"❌ Query for {job.job_name} failed: {str(e)}")
+            return Response({'error': f'Query failed: {str(e)}'}, status=status.HTTP_400_BAD_REQUEST)
+
+        print(f"📤 Streaming {job.job_name} results as {output} (up to {max_rows} rows, {max_seconds}s)")
+        content, content_type = stream_content(stream, output)
+        response = StreamingHttpResponse(content, content_type=content_type)
+        response['X-Row-Limit'] = str(max_rows)
+        response['X-Time-Limit-Seconds'] = str(max_seconds)
+        response['Cache-Control'] = 'no-cache'
+        # Keep reverse proxies from buffering the whole export
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
     @action(detail=False, methods=['get'])
     def by_source(self, request):
         source_id = request.query_params.get('source_id')
         qs = self.queryset
         if source_id:
             qs = qs.filter(source_id=source_id)
+        if settings.API_FAST_LIST_SERIALIZATION:
+            return self.fast_list_response(qs, JOB_LIST)
         page = self.paginate_queryset(qs)
         if page is not None:
             serializer = JobSerializer(page, many=True)
@@ -94,7 +237,7 @@ class JobViewSet(viewsets.ModelViewSet):
         serializer = JobSerializer(qs, many=True)
         return Response(serializer.data)
 
-class ETLViewSet(viewsets.ViewSet):
+class ETLViewSet(FastListMixin, viewsets.GenericViewSet):
     """
     ETL ViewSet for executing ETL jobs
     """
@@ -104,10 +247,13 @@ class ETLViewSet(viewsets.ViewSet):
     def active_sources(self, request):
         """Get all active source connections for ETL menu"""
         sources = SourceConnection.objects.filter(is_active=True)
-        serializer = SourceConnectionSerializer(sources, many=True)
+        if settings.API_FAST_LIST_SERIALIZATION:
+            data = SOURCE_CONNECTION_LIST_NO_REQUEST.serialize(SOURCE_CONNECTION_LIST_NO_REQUEST.values(sources))
+        else:
+            data = SourceConnectionSerializer(sources, many=True).data
         return Response({
             'message': 'Active source connections retrieved successfully',
-            'sources': serializer.data
+            'sources': data
         })
 
     @action(detail=False, methods=['post'])
@@ -121,6 +267,8 @@ class ETLViewSet(viewsets.ViewSet):
         
         source_id = request.data.get('source_id')
         executed_by = request.data.get('executed_by', 'system')
+        profile_query = bool(request.data.get('profile_query', False))
+        profile_execution = bool(request.data.get('profile_execution', False))
 
         print(f"🎯 Source ID: {source_id}")
         print(f"👤 Executed by: {executed_by}")
@@ -140,7 +288,7 @@ class ETLViewSet(viewsets.ViewSet):
             
             # Step 2: Fetch all jobs for this source
             print(f"🔍 Step 2: Fetching jobs for source: {source_connection.source_name}")
-            jobs = Job.objects.filter(source_id=source_id)
+            jobs = Job.objects.filter(source_id=source_id).select_related('target_connection')
             print(f"📊 Found {jobs.count()} jobs for this source")
             
             if not jobs.exists():
@@ -151,49 +299,34 @@ class ETLViewSet(viewsets.ViewSet):
                     'jobs_count': 0
                 })
 
-            # Step 3: Execute jobs sequentially (not in parallel)
-            print(f"🔄 Step 3: Starting sequential job execution for {jobs.count()} jobs")
+            # Step 3: Group jobs sharing an identical query so each distinct extract runs once
+            groups = self._group_jobs_by_query(jobs)
+            print(f"🔄 Step 3: Starting sequential execution of {len(groups)} extracts for {len(jobs)} jobs")
             execution_results = []
             
-            for index, job in enumerate(jobs, 1):
-                print(f"\n📋 Job {index}/{len(jobs)}: {job.job_name}")
-                print(f"   Source table: {job.source_table}")
-                print(f"   Target table: {job.target_table}")
-                
-                try:
+            for index, group in enumerate(groups, 1):
+                print(f"\n📋 Extract {index}/{len(groups)}: {', '.join(job.job_name for job in group)}")
+                members = []
+                for job in group:
+                    print(f"   Source table: {job.source_table} → Target table: {job.target_table}")
                     # Create execution record
-                    print(f"   📝 Creating execution record...")
                     execution = JobExecution.objects.create(
                         job=job,
                         source_name=source_connection.source_name,
                         job_name=job.job_name,
                         status='running',
-                        executed_by=executed_by
+                        executed_by=executed_by,
+                        extract_fanout=len(group)
                     )
                     print(f"   ✅ Execution record created with ID: {execution.id}")
+                    members.append((job, execution))
 
-                    # Execute the job
-                    print(f"   ⚡ Executing job...")
-                    result = self._execute_job(job, source_connection, execution)
-                    execution_results.append(result)
-                    print(f"   ✅ Job completed successfully: {result}")
-
-                except Exception as e:
-                    print(f"   ❌ Job failed with error: {str(e)}")
-                    # Mark execution as failed
-                    if 'execution' in locals():
-                        execution.status = 'failed'
-                        execution.error_message = str(e)
-                        execution.completed_at = timezone.now()
-                        execution.save()
-                        print(f"   📝 Execution record updated with failure status")
-
-                    execution_results.append({
-                        'job_id': job.id,
-                        'job_name': job.job_name,
-                        'status': 'failed',
-                        'error': str(e)
-                    })
+                # Execute the extract and load every target fed by it
+                print(f"   ⚡ Executing extract...")
+                results = self._execute_job_group(members, source_connection, profile_query, profile_execution)
+                for result in results:
+                    print(f"   {'✅' if result['status'] == 'completed' else '❌'} {result['job_name']}: {result['status']}")
+                execution_results.extend(results)
 
             print(f"\n🎉 ETL PROCESS COMPLETED")
             print(f"📊 Total jobs processed: {len(jobs)}")
@@ -220,113 +353,456 @@ class ETLViewSet(viewsets.ViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
-    def _execute_job(self, job, source_connection, execution):
+    @action(detail=False, methods=['get'])
+    def estimate(self, request):
         """
-        Execute a single ETL job
+        Dry-run estimate for run_etl: predicted runtime per job from source
+        catalog statistics and historical throughput, plus a proposed
+        concurrency level for an optional target completion window
+        """
+        source_id = request.query_params.get('source_id')
+        target_window = request.query_params.get('target_window_seconds')
+        use_sampling = request.query_params.get('sample', '').lower() in ('1', 'true', 'yes')
+
+        if not source_id:
+            return Response(
+                {'error': 'source_id is required'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            target_window = float(target_window) if target_window else None
+        except ValueError:
+            return Response(
+                {'error': 'target_window_seconds must be a number'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            source_connection = SourceConnection.objects.get(id=source_id, is_active=True)
+        except SourceConnection.DoesNotExist:
+            return Response(
+                {'error': f'Source connection with id {source_id} not found or inactive'}, 
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        jobs = list(Job.objects.filter(source_id=source_id).only('id', 'job_name', 'source_table'))
+        history = historical_throughput([job.id for job in jobs])
+        warnings = []
+
+        # Source-wide throughput is the fallback for jobs that never completed
+        weighted_rates = sum((entry['rows_per_second'] or 0) * entry['samples'] for entry in history.values())
+        rated_samples = sum(entry['samples'] for entry in history.values() if entry['rows_per_second'])
+        source_rows_per_second = weighted_rates / rated_samples if rated_samples else None
+
+        # Catalog statistics are read once per distinct source table
+        table_stats = {}
+        cursor = None
+        resources = ExitStack()
+        try:
+            # Catalog reads count against the source's connection cap like extracts,
+            # but never wait behind running extracts
+            resources.enter_context(get_throttle(source_connection).connection_slot(timeout=0))
+            conn = resources.enter_context(get_pool(self._build_connection_string(source_connection)).connection())
+            cursor = conn.cursor()
+        except Exception as e:
+            resources.close()
+            warnings.append(f"Source catalog unavailable, using execution history only: {str(e)}")
+
+        try:
+            estimates = []
+            for job in jobs:
+                if cursor is not None and job.source_table not in table_stats:
+                    try:
+                        stats = catalog_table_stats(cursor, source_connection.db_type, job.source_table)
+                        basis = 'catalog'
+                        if stats is None and use_sampling:
+                            sampled = sampled_row_count(cursor, source_connection.db_type, job.source_table)
+                            stats = (sampled, None) if sampled is not None else None
+                            basis = 'sample'
+                        table_stats[job.source_table] = (stats, basis)
+                    except Exception as e:
+                        warnings.append(f"Could not read statistics for {job.source_table}: {str(e)}")
+                        table_stats[job.source_table] = (None, None)
+                stats, basis = table_stats.get(job.source_table, (None, None))
+
+                job_history = history.get(job.id, {})
+                if stats is not None:
+                    estimated_rows, estimated_bytes = stats
+                elif job_history.get('avg_rows') is not None:
+                    estimated_rows, estimated_bytes, basis = int(job_history['avg_rows']), None, 'history'
+                else:
+                    estimated_rows, estimated_bytes, basis = None, None, 'unknown'
+
+                if job_history.get('rows_per_second'):
+                    rows_per_second, throughput_basis = job_history['rows_per_second'], 'job_history'
+                elif source_rows_per_second:
+                    rows_per_second, throughput_basis = source_rows_per_second, 'source_history'
+                else:
+                    rows_per_second, throughput_basis = settings.ETL_DEFAULT_ROWS_PER_SECOND, 'default'
+
+                predicted_seconds = estimated_rows / rows_per_second if estimated_rows is not None else None
+                estimates.append({
+                    'job_id': job.id,
+                    'job_name': job.job_name,
+                    'source_table': job.source_table,
+                    'estimated_rows': estimated_rows,
+                    'estimated_bytes': estimated_bytes,
+                    'row_estimate_basis': basis,
+                    'rows_per_second': round(rows_per_second, 2),
+                    'throughput_basis': throughput_basis,
+                    'history_samples': job_history.get('samples', 0),
+                    'predicted_seconds': round(predicted_seconds, 2) if predicted_seconds is not None else None,
+                })
+        finally:
+            if cursor is not None:
+                cursor.close()
+            resources.close()
+
+        runtimes = [estimate['predicted_seconds'] for estimate in estimates]
+        concurrency, predicted_makespan, fits_window = plan_concurrency(runtimes, target_window)
+        if not fits_window:
+            warnings.append(
+                f"Predicted runtime {predicted_makespan:.0f}s exceeds the target window even at concurrency {concurrency}"
+            )
+
+        return Response({
+            'source_name': source_connection.source_name,
+            'total_jobs': len(jobs),
+            'estimated_total_rows': sum(estimate['estimated_rows'] or 0 for estimate in estimates),
+            'sequential_seconds': round(sum(runtime or 0 for runtime in runtimes), 2),
+            'target_window_seconds': target_window,
+            'proposed_concurrency': concurrency,
+            'predicted_seconds': round(predicted_makespan, 2),
+            'fits_window': fits_window,
+            'jobs': estimates,
+            'warnings': warnings
+        })
+
+    @staticmethod
+    def _group_jobs_by_query(jobs):
+        """
+        Group jobs whose job_query is identical apart from surrounding
+        whitespace and a trailing ';'. Inner whitespace is kept: it can be
+        part of a string literal or a bracketed identifier.
+        """
+        groups = {}
+        for job in jobs:
+            key = job.job_query.strip().rstrip(';').strip()
+            groups.setdefault(key, []).append(job)
+        return list(groups.values())
+
+    def _execute_job_group(self, members, source_connection, profile_query=False, profile_execution=False):
+        """
+        Execute one extract and stream its batches to a loader per
+        (job, execution) member. The source is read on a pooled reader
+        connection while every loader writes on its own pooled connection
+        to the job's target, so reads and writes run in parallel.
+        Returns one result dict per member.
         """
         print(f"   ⏱️ Starting job execution timer...")
         start_time = time.time()
-        
+        lead_job = members[0][0]
+        loaders = []
+        stream_closed = False
+        throttle = get_throttle(source_connection)
+        profiler = None
+
         try:
+            throttle.check_window()
+
+            if profile_execution or any(job.profile_execution for job, _execution in members):
+                print(f"   🔬 Sampling CPU and memory profile for this run...")
+                profiler = ExecutionProfiler().start()
+
             # Step 1: Connect to source database
             print(f"   🔌 Step 1: Connecting to source database...")
             connection_string = self._build_connection_string(source_connection)
             print(f"   📡 Connection string: {connection_string[:50]}...")
-            
-            conn = pyodbc.connect(connection_string)
-            cursor = conn.cursor()
-            print(f"   ✅ Database connection established successfully")
 
-            # Step 2: Execute the job query
-            print(f"   🔍 Step 2: Executing job query...")
-            print(f"   📝 Query: {job.job_query[:100]}...")
-            
-            cursor.execute(job.job_query)
-            rows = cursor.fetchall()
-            records_processed = len(rows)
-            print(f"   📊 Query executed successfully. Records fetched: {records_processed}")
-
-            # Step 3: Insert data into target table (same database for now)
-            # This is a simplified version - you might want to customize this
-            if records_processed > 0:
-                print(f"   📥 Step 3: Inserting {records_processed} records into target table: {job.target_table}")
-                self._insert_into_target(cursor, job.target_table, rows)
-                print(f"   ✅ Data inserted into target table successfully")
-            else:
-                print(f"   ⚠️ No records to insert (records_processed = 0)")
-
-            # Step 4: Calculate execution time and update status
-            execution_time = time.time() - start_time
-            print(f"   ⏱️ Execution completed in {execution_time:.2f} seconds")
-            
-            execution.status = 'completed'
-            execution.execution_time_seconds = round(execution_time, 2)
-            execution.records_processed = records_processed
-            execution.completed_at = timezone.now()
-            execution.execution_log = f"Successfully processed {records_processed} records in {execution_time:.2f} seconds"
-            execution.save()
-            print(f"   📝 Execution record updated with success status")
-
-            cursor.close()
-            conn.close()
-            print(f"   🔌 Database connection closed")
-
-            return {
-                'job_id': job.id,
-                'job_name': job.job_name,
-                'status': 'completed',
-                'records_processed': records_processed,
-                'execution_time_seconds': round(execution_time, 2)
-            }
+            # Loaders without their own target write back into the source and count against its cap
+            writes_to_source = [
+                (job.target_connection or source_connection).id == source_connection.id for job, _execution in members
+            ]
+            throttle.check_connections(1 + sum(writes_to_source))
+
+            with throttle.connection_slot() as throttle_wait, get_pool(connection_string).connection() as conn:
+                cursor = conn.cursor()
+                if throttle_wait:
+                    print(f"   🚦 Waited {throttle_wait:.2f}s for a free extract connection slot")
+                print(f"   ✅ Database connection established successfully")
+
+                # Step 2: Execute the job query
+                print(f"   🔍 Step 2: Executing job query...")
+                print(f"   📝 Query: {lead_job.job_query[:100]}...")
 
+                query_plan = None
+                if profile_query or any(job.profile_query for job, _execution in members):
+                    print(f"   🔬 Capturing source execution plan...")
+                    try:
+                        query_plan = capture_query_plan(cursor, source_connection.db_type, lead_job.job_query)
+                    except Exception as e:
+                        # Profiling must never fail the job itself
+                        print(f"   ⚠️ Could not capture execution plan: {str(e)}")
+
+                query_start = time.time()
+                cursor.execute(lead_job.job_query)
+                query_time = time.time() - query_start
+                description = cursor.description
+
+                # Step 3: Start a loader per target and stream batches to all of them
+                for (job, _execution), to_source in zip(members, writes_to_source):
+                    target_connection = job.target_connection or source_connection
+                    print(f"   📥 Step 3: Loading {job.target_table} on {target_connection.source_name}")
+                    loader = TargetLoader(
+                        job,
+                        get_pool(self._build_connection_string(target_connection)),
+                        description,
+                        self._resolve_target,
+                        self._insert_into_target,
+                        settings.ETL_PIPELINE_QUEUE_DEPTH,
+                        partial(self._count_target_rows, target_connection.db_type),
+                        throttle.connection_slot if to_source else None,
+                    )
+                    loader.start()
+                    loaders.append(loader)
+                    if profiler is not None:
+                        profiler.track(loader)
+
+                records_read = 0
+                tuner = fetch_tuner(lead_job)
+                while True:
+                    fetch_start = time.time()
+                    rows = cursor.fetchmany(tuner.size)
+                    fetch_time = time.time() - fetch_start
+                    query_time += fetch_time
+                    if not rows:
+                        break
+                    # Pack once into column buffers so queued batches hold no row objects
+                    batch = ColumnBatch.from_rows(description, rows)
+                    del rows
+                    records_read += len(batch)
+                    nbytes = batch.nbytes if tuner.measuring_bytes or throttle.measures_bytes else None
+                    tuner.record(len(batch), fetch_time, nbytes)
+                    # Rate limit waits are kept out of query_time
+                    throttle_wait += throttle.consume(len(batch), nbytes)
+                    for loader in loaders:
+                        loader.put(batch)
+                for loader in loaders:
+                    loader.finish()
+                stream_closed = True
+                cursor.close()
+            print(f"   📊 Query executed successfully in {query_time:.2f} seconds. Records fetched: {records_read}")
+            if throttle_wait:
+                print(f"   🚦 Throttled for {throttle_wait:.2f} seconds")
+        except OutsideExtractWindow as e:
+            return [self._fail_execution(job, execution, e, start_time, status='cancelled') for job, execution in members]
         except Exception as e:
-            execution_time = time.time() - start_time
-            print(f"   ❌ Job execution failed after {execution_time:.2f} seconds")
-            print(f"   🚨 Error details: {str(e)}")
-            
-            execution.status = 'failed'
-            execution.execution_time_seconds = round(execution_time, 2)
-            execution.error_message = str(e)
-            execution.completed_at = timezone.now()
-            execution.execution_log = f"Failed after {execution_time:.2f} seconds: {str(e)}"
-            execution.save()
-            print(f"   📝 Execution record updated with failure status")
+            for loader in loaders:
+                if not stream_closed:
+                    loader.abort(e)
+                loader.join()
+            self._save_profile(profiler, members)
+            return [self._fail_execution(job, execution, e, start_time) for job, execution in members]
+
+        extract = {
+            'fetch_batch_size': tuner.best_size,
+            'query_time': query_time,
+            'throttle_wait': throttle_wait,
+            'query_plan': query_plan,
+            'records_read': records_read,
+            'start_time': start_time,
+        }
+        for loader in loaders:
+            loader.join()
+        self._save_profile(profiler, members)
+        results = []
+        for (job, execution), loader in zip(members, loaders):
+            try:
+                results.append(self._complete_execution(job, execution, loader, extract))
+            except Exception as e:
+                # Recording one job's outcome must not fail the rest of the run
+                results.append(self._fail_execution(job, execution, e, start_time))
+        print(f"   🔌 Database connections returned to the pool")
+        return results
+
+    def _save_profile(self, profiler, members):
+        """Stop the run's profiler and link the stored profile to every execution it covered"""
+        if profiler is None:
+            return
+        try:
+            profile = ExecutionProfile.from_profile(profiler.stop())
+            profile.save()
+        except Exception as e:
+            # Profiling must never fail the job itself
+            print(f"   ⚠️ Could not store execution profile: {str(e)}")
+            return
+        print(f"   🔬 Stored profile {profile.id}: {profile.cpu_samples} samples, peak {profile.peak_memory_bytes} bytes")
+        for _job, execution in members:
+            execution.profile = profile
+
+    def _complete_execution(self, job, execution, loader, extract):
+        """Record a finished loader's outcome on the execution (runs on the request thread)"""
+        query_time = extract['query_time']
+        execution.query_time_seconds = round(query_time, 3)
+        execution.throttle_wait_seconds = round(extract['throttle_wait'], 3)
+        execution.query_plan = extract['query_plan']
+        if query_time:
+            execution.read_rows_per_second = round(extract['records_read'] / query_time, 2)
+        if loader.pipeline:
+            execution.transform_timings = loader.pipeline.timing_report()
+
+        if loader.error is not None:
+            return self._fail_execution(job, execution, loader.error, extract['start_time'])
+
+        # The loader resolved the target on its own thread; persist the cache here
+        if loader.initial_fingerprint != job.schema_fingerprint:
+            job.save(update_fields=['schema_fingerprint', 'column_mapping', 'insert_sql'])
+
+        # Keep the learned batch sizes so the next run starts warm
+        if settings.ETL_ADAPTIVE_BATCH_SIZE and (job.fetch_batch_size, job.insert_batch_size) != (
+            extract['fetch_batch_size'], loader.insert_tuner.best_size
+        ):
+            job.fetch_batch_size = extract['fetch_batch_size']
+            job.insert_batch_size = loader.insert_tuner.best_size
+            job.save(update_fields=['fetch_batch_size', 'insert_batch_size'])
+
+        records_processed = loader.records_loaded
+        execution_time = time.time() - extract['start_time']
+        print(f"   ⏱️ {job.job_name}: {records_processed} records loaded, execution completed in {execution_time:.2f} seconds")
+
+        if loader.quality is not None:
+            violations = loader.violations
+            execution.quality_report = {
+                **loader.quality.report(),
+                'source_rows': extract['records_read'],
+                'target_rows_added': loader.target_rows_added,
+                'row_count_difference': (
+                    None if loader.target_rows_added is None else loader.target_rows_added - loader.quality.rows
+                ),
+                'violations': violations,
+            }
+            execution.quality_passed = not violations
+            if violations:
+                print(f"   🧪 Data quality checks failed: {'; '.join(violations)}")
+                execution.records_processed = records_processed
+                return self._fail_execution(
+                    job, execution,
+                    f"Data quality checks failed, {records_processed} loaded records rolled back: {'; '.join(violations)}",
+                    extract['start_time']
+                )
+
+        baseline = job.query_time_baseline
+        execution.is_query_regression = update_query_baseline(job, query_time)
+        if execution.is_query_regression:
+            print(f"   🐢 Query phase regression: {query_time:.2f}s against a baseline of {baseline:.2f}s")
 
-            raise e
+        execution.status = 'completed'
+        execution.execution_time_seconds = round(execution_time, 2)
+        execution.load_time_seconds = round(loader.load_time, 3)
+        if loader.write_rows_per_second is not None:
+            execution.write_rows_per_second = round(loader.write_rows_per_second, 2)
+        execution.records_processed = records_processed
+        execution.completed_at = timezone.now()
+
+        execution.anomalies = update_runtime_baseline(job, execution) or None
+        execution.is_anomaly = bool(execution.anomalies)
+        for anomaly in execution.anomalies or []:
+            print(f"   📉 {anomaly['kind']}: {anomaly['metric']} {anomaly['value']} against a baseline of {anomaly['baseline']}")
+
+        execution.execution_log = f"Successfully processed {records_processed} records in {execution_time:.2f} seconds"
+        if execution.extract_fanout > 1:
+            execution.execution_log += f" (extract shared with {execution.extract_fanout - 1} other jobs)"
+        if execution.is_query_regression:
+            execution.execution_log += f" (query phase {query_time:.2f}s exceeded baseline {baseline:.2f}s)"
+        if execution.is_anomaly:
+            execution.execution_log += f" (anomalies: {', '.join(anomaly['kind'] for anomaly in execution.anomalies)})"
+        execution.save()
+        print(f"   📝 Execution record updated with success status")
+
+        return {
+            'job_id': job.id,
+            'job_name': job.job_name,
+            'status': 'completed',
+            'records_processed': records_processed,
+            'execution_time_seconds': round(execution_time, 2),
+            'load_time_seconds': execution.load_time_seconds,
+            'fetch_batch_size': extract['fetch_batch_size'],
+            'insert_batch_size': loader.insert_tuner.best_size,
+            'extract_fanout': execution.extract_fanout,
+            'read_rows_per_second': execution.read_rows_per_second,
+            'write_rows_per_second': execution.write_rows_per_second,
+            'transform_timings': execution.transform_timings,
+            'query_time_seconds': execution.query_time_seconds,
+            'throttle_wait_seconds': execution.throttle_wait_seconds,
+            'profile_id': execution.profile_id,
+            'is_query_regression': execution.is_query_regression,
+            'anomalies': execution.anomalies
+        }
+
+    def _fail_execution(self, job, execution, error, start_time, status='failed'):
+        """Mark an execution as failed (or cancelled) and return its result entry"""
+        execution_time = time.time() - start_time
+        print(f"   ❌ Job {job.job_name} {status} after {execution_time:.2f} seconds")
+        print(f"   🚨 Error details: {str(error)}")
+
+        execution.status = status
+        execution.execution_time_seconds = round(execution_time, 2)
+        execution.error_message = str(error)
+        execution.completed_at = timezone.now()
+        execution.execution_log = f"{status.capitalize()} after {execution_time:.2f} seconds: {str(error)}"
+        execution.save()
+        print(f"   📝 Execution record updated with {status} status")
+
+        return {
+            'job_id': job.id,
+            'job_name': job.job_name,
+            'status': status,
+            'error': str(error)
+        }
 
     def _build_connection_string(self, source_connection):
         """Build ODBC connection string for the source database"""
-        if source_connection.db_type == 'sqlserver':
-            return (
-                f"DRIVER={{ODBC Driver 18 for SQL Server}};"
-                f"SERVER={source_connection.host},{source_connection.port};"
-                f"DATABASE=TestingDB19082025;"
-                f"UID={source_connection.username};"
-                f"PWD={source_connection.password};"
-                f"Encrypt=yes;TrustServerCertificate=yes;"
-            )
-        else:
-            # Add support for other database types as needed
-            raise ValueError(f"Database type {source_connection.db_type} not yet supported")
+        return odbc_connection_string(source_connection)
 
-    def _insert_into_target(self, cursor, target_table, rows):
+    def _resolve_target(self, job, cursor, description):
         """
-        Insert data into target table
-        This is a simplified version - customize based on your needs
+        Return the INSERT statement for the job's target table.
+        The column mapping is cached on the job and only re-resolved (with
+        auto-DDL on the target) when the source schema fingerprint changes.
         """
-        if not rows:
-            return
+        # Loads go to the source database when the job has no target connection
+        fingerprint = schema_fingerprint(job.target_table, description, job.target_connection_id or job.source_id)
+        if job.schema_fingerprint == fingerprint and job.insert_sql:
+            print(f"   ♻️ Using cached column mapping for target table: {job.target_table}")
+            return job.insert_sql
 
-        # Get column names from the first row
-        columns = [column[0] for column in cursor.description]
-        
-        # Build INSERT statement
-        placeholders = ','.join(['?' for _ in columns])
-        insert_sql = f"INSERT INTO {target_table} ({','.join(columns)}) VALUES ({placeholders})"
-        
-        # Execute batch insert
+        print(f"   🧬 Source schema changed or unknown, resolving target table: {job.target_table}")
+        column_mapping, insert_sql, ddl_statements = ensure_target_table(cursor, job.target_table, description)
+        for statement in ddl_statements:
+            print(f"   🛠️ Applied DDL: {statement[:100]}...")
+
+        # Saved by the caller; this may run on a loader thread
+        job.schema_fingerprint = fingerprint
+        job.column_mapping = column_mapping
+        job.insert_sql = insert_sql
+        return insert_sql
+
+    def _count_target_rows(self, db_type, job, cursor):
+        """Target table row count from catalog statistics, or None when unavailable (runs on a loader thread)"""
+        try:
+            stats = catalog_table_stats(cursor, db_type, job.target_table)
+        except Exception as e:
+            print(f"   ⚠️ Could not read target row count for {job.target_table}: {str(e)}")
+            return None
+        return stats[0] if stats else None
+
+    def _insert_into_target(self, cursor, insert_sql, rows):
+        """
+        Insert data into target table using the job's resolved INSERT statement.
+        rows is an iterable of row tuples produced one at a time from a ColumnBatch
+        """
+        # Committed once per job load by the TargetLoader
         cursor.executemany(insert_sql, rows)
-        cursor.commit()
 
     @action(detail=False, methods=['get'])
     def execution_history(self, request):
@@ -345,6 +821,8 @@ class ETLViewSet(viewsets.ViewSet):
         if status:
             executions = executions.filter(status=status)
 
+        if settings.API_FAST_LIST_SERIALIZATION:
+            return self.fast_list_response(executions, JOB_EXECUTION_SUMMARY)
         page = self.paginate_queryset(executions)
         if page is not None:
             serializer = JobExecutionSummarySerializer(page, many=True)
@@ -365,3 +843,187 @@ class ETLViewSet(viewsets.ViewSet):
                 {'error': 'Job execution not found'}, 
                 status=status.HTTP_404_NOT_FOUND
             )
+
+    @action(detail=False, methods=['get'])
+    def query_regressions(self, request):
+        """Get executions whose query phase regressed beyond the job's baseline"""
+        executions = JobExecution.objects.filter(is_query_regression=True).order_by('-executed_at')
+
+        source_id = request.query_params.get('source_id')
+        job_id = request.query_params.get('job_id')
+
+        if source_id:
+            executions = executions.filter(job__source_id=source_id)
+        if job_id:
+            executions = executions.filter(job_id=job_id)
+
+        if settings.API_FAST_LIST_SERIALIZATION:
+            return self.fast_list_response(executions, JOB_EXECUTION_SUMMARY)
+        page = self.paginate_queryset(executions)
+        if page is not None:
+            serializer = JobExecutionSummarySerializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = JobExecutionSummarySerializer(executions, many=True)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['get'])
+    def anomalies(self, request):
+        """
+        Get executions whose duration, throughput or row count deviated from
+        the job's runtime baseline, optionally only from the last ?days=
+        """
+        executions = JobExecution.objects.filter(is_anomaly=True).order_by('-executed_at')
+
+        source_id = request.query_params.get('source_id')
+        job_id = request.query_params.get('job_id')
+        days = request.query_params.get('days')
+
+        try:
+            source_id = int(source_id) if source_id else None
+            job_id = int(job_id) if job_id else None
+        except ValueError:
+            return Response(
+                {'error': 'source_id and job_id must be integers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if days:
+            try:
+                days = float(days)
+                if not days > 0:
+                    raise ValueError(days)
+                # inf, nan and spans past datetime's range raise here too
+                since = timezone.now() - timedelta(days=days)
+            except (ValueError, OverflowError):
+                return Response(
+                    {'error': 'days must be a positive number of days'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            executions = executions.filter(executed_at__gte=since)
+
+        if source_id:
+            executions = executions.filter(job__source_id=source_id)
+        if job_id:
+            executions = executions.filter(job_id=job_id)
+
+        if settings.API_FAST_LIST_SERIALIZATION:
+            return self.fast_list_response(executions, JOB_EXECUTION_ANOMALIES)
+        page = self.paginate_queryset(executions)
+        if page is not None:
+            serializer = JobExecutionAnomalySerializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = JobExecutionAnomalySerializer(executions, many=True)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['get'])
+    def archived_history(self, request):
+        """Get archived ETL executions moved out of bi_job_executions by the retention policy"""
+        executions = JobExecutionArchive.objects.defer('payload').order_by('-executed_at')
+
+        job_id = request.query_params.get('job_id')
+        source_name = request.query_params.get('source_name')
+        status = request.query_params.get('status')
+
+        if job_id:
+            executions = executions.filter(job_id=job_id)
+        if source_name:
+            executions = executions.filter(source_name=source_name)
+        if status:
+            executions = executions.filter(status=status)
+
+        page = self.paginate_queryset(executions)
+        if page is not None:
+            serializer = JobExecutionArchiveSerializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = JobExecutionArchiveSerializer(executions, many=True)
+        return Response(serializer.data)
+
+    @action(detail=True, methods=['get'])
+    def archived_execution(self, request, pk=None):
+        """Get a single archived execution including its decompressed logs"""
+        try:
+            execution = JobExecutionArchive.objects.get(id=pk)
+            serializer = JobExecutionArchiveDetailSerializer(execution)
+            return Response(serializer.data)
+        except JobExecutionArchive.DoesNotExist:
+            return Response(
+                {'error': 'Archived job execution not found'}, 
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+    @action(detail=True, methods=['get'])
+    def execution_profile(self, request, pk=None):
+        """
+        Download the CPU/memory profile captured for an execution.
+        ?kind=cpu returns collapsed stacks (flamegraph.pl / speedscope),
+        ?kind=memory the top allocations, otherwise the whole profile as JSON
+        """
+        execution = JobExecution.objects.select_related('profile').filter(id=pk).only('id', 'profile').first()
+        if execution is None or execution.profile is None:
+            return Response(
+                {'error': 'No profile was captured for this execution'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        profile = execution.profile
+        payload = profile.get_payload()
+        kind = request.query_params.get('kind')
+        if kind == 'cpu':
+            response = HttpResponse(payload['cpu'], content_type='text/plain; charset=utf-8')
+            response['Content-Disposition'] = f'attachment; filename="execution-{pk}-cpu.folded"'
+            return response
+        if kind == 'memory':
+            response = JsonResponse(payload['memory'], safe=False)
+            response['Content-Disposition'] = f'attachment; filename="execution-{pk}-memory.json"'
+            return response
+        return Response({
+            'id': profile.id,
+            'execution_id': execution.id,
+            'created_at': profile.created_at,
+            'duration_seconds': profile.duration_seconds,
+            'cpu_samples': profile.cpu_samples,
+            'sample_interval': profile.sample_interval,
+            'peak_memory_bytes': profile.peak_memory_bytes,
+            'memory_scope': profile.memory_scope,
+            'cpu': payload['cpu'],
+            'memory': payload['memory'],
+        })
+
+    @action(detail=False, methods=['get'])
+    def execution_rollups(self, request):
+        """Get daily execution statistics kept for archived executions"""
+        rollups = JobExecutionRollup.objects.all().order_by('-day', 'job_name')
+
+        job_id = request.query_params.get('job_id')
+        date_from = request.query_params.get('date_from')
+        date_to = request.query_params.get('date_to')
+
+        try:
+            job_id = int(job_id) if job_id else None
+            # parse_date returns None for malformed dates and raises on impossible ones (2024-13-45)
+            dates = [parse_date(value) if value else None for value in (date_from, date_to)]
+            if any(value and parsed is None for value, parsed in zip((date_from, date_to), dates)):
+                raise ValueError('invalid date')
+            date_from, date_to = dates
+        except ValueError:
+            return Response(
+                {'error': 'job_id must be an integer and date_from/date_to dates in YYYY-MM-DD format'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if job_id:
+            rollups = rollups.filter(job_id=job_id)
+        if date_from:
+            rollups = rollups.filter(day__gte=date_from)
+        if date_to:
+            rollups = rollups.filter(day__lte=date_to)
+
+        page = self.paginate_queryset(rollups)
+        if page is not None:
+            serializer = JobExecutionRollupSerializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = JobExecutionRollupSerializer(rollups, many=True)
+        return Response(serializer.data)
@@ -0,0 +1,164 @@
+"""
+Read/write routing for the metadata database.
+
+Safe (GET/HEAD/OPTIONS) API requests read from the replica alias while every
+write, and every read made while handling a write, stays on the primary.
+A client that just wrote is pinned to the primary for a few seconds through a
+cookie so it reads its own writes (cross-origin clients such as the SPA must
+send credentials for the cookie to come back), and the replica is skipped
+whenever its measured lag exceeds DATABASE_REPLICA_MAX_LAG_SECONDS.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+_read_only = ContextVar('read_only_request', default=False)
+
+PIN_COOKIE = 'db_primary_pin'
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Seconds the replica is behind the primary, per database vendor, and whether the
+# query runs on the primary. Both report 0 while the primary is idle rather than
+# the time since its last commit.
+LAG_QUERIES = {
+    # Only the primary reports secondary_lag_seconds, per secondary of this database
+    'microsoft': (True, (
+        "SELECT MAX(secondary_lag_seconds) FROM sys.dm_hadr_database_replica_states "
+        "WHERE is_local = 0 AND database_id = DB_ID()"
+    )),
+    'postgresql': (False, (
+        "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+        "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+    )),
+}
+
+_lag_lock = threading.Lock()
+_lag_cache = {'checked_at': None, 'lag': None}
+
+
+def replica_alias():
+    """The replica alias, or None when no replica is configured"""
+    alias = getattr(settings, 'DATABASE_REPLICA_ALIAS', None)
+    return alias if alias and alias in settings.DATABASES else None
+
+
+def measure_replica_lag(alias):
+    """Current replica lag in seconds; raises if the replica cannot be queried"""
+    replica = connections[alias]
+    on_primary, query = LAG_QUERIES.get(replica.vendor, (False, None))
+    if query is None or on_primary:
+        # The replica must still answer before reads are sent to it
+        with replica.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        if query is None:
+            return 0.0
+    connection = connections[DEFAULT_DB_ALIAS] if on_primary else replica
+    with connection.cursor() as cursor:
+        cursor.execute(query)
+        row = cursor.fetchone()
+    # No row / NULL means the database is not part of a replication set
+    return float(row[0]) if row and row[0] is not None else 0.0
+
+
+def replica_lag(alias):
+    """Replica lag cached for DATABASE_REPLICA_LAG_CHECK_SECONDS; None if the check failed"""
+    now = time.monotonic()
+    with _lag_lock:
+        checked_at = _lag_cache['checked_at']
+        if checked_at is not None and now - checked_at < settings.DATABASE_REPLICA_LAG_CHECK_SECONDS:
+            return _lag_cache['lag']
+    try:
+        lag = measure_replica_lag(alias)
+    except Exception:
+        lag = None
+    with _lag_lock:
+        _lag_cache['checked_at'] = now
+        _lag_cache['lag'] = lag
+    return lag
+
+
+def reset_replica_lag():
+    with _lag_lock:
+        _lag_cache['checked_at'] = None
+        _lag_cache['lag'] = None
+
+
+@contextmanager
+def read_only():
+    """Route reads in this block to the replica (when it is healthy)"""
+    token = _read_only.set(True)
+    try:
+        yield
+    finally:
+        _read_only.reset(token)
+
+
+@contextmanager
+def use_primary():
+    """Force reads in this block onto the primary, e.g. right after a write"""
+    token = _read_only.set(False)
+    try:
+        yield
+    finally:
+        _read_only.reset(token)
+
+
+class ReplicaRouter:
+    """Sends reads of read-only requests to the replica, everything else to the primary"""
+
+    def db_for_read(self, model, **hints):
+        if not _read_only.get():
+            return DEFAULT_DB_ALIAS
+        alias = replica_alias()
+        if alias is None:
+            return DEFAULT_DB_ALIAS
+        lag = replica_lag(alias)
+        if lag is None or lag > settings.DATABASE_REPLICA_MAX_LAG_SECONDS:
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Marks safe API requests as read-only for ReplicaRouter and pins clients
+    to the primary for DATABASE_REPLICA_PIN_SECONDS after they write.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def _is_read_only(self, request):
+        if request.method not in SAFE_METHODS:
+            return False
+        if not request.path.startswith(tuple(settings.DATABASE_REPLICA_PATH_PREFIXES)):
+            return False
+        try:
+            pinned_until = float(request.COOKIES.get(PIN_COOKIE, 0))
+        except ValueError:
+            pinned_until = 0
+        return pinned_until < time.time()
+
+    def __call__(self, request):
+        if not self._is_read_only(request):
+            response = self.get_response(request)
+            if request.method not in SAFE_METHODS and replica_alias() is not None:
+                pin_seconds = settings.DATABASE_REPLICA_PIN_SECONDS
+                response.set_cookie(PIN_COOKIE, str(time.time() + pin_seconds), max_age=pin_seconds, httponly=True)
+            return response
+        with read_only():
+            return self.get_response(request)
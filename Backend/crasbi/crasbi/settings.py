@@ -48,6 +48,7 @@ MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'crasbi.db_routing.ReplicaRoutingMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
@@ -101,6 +102,29 @@ DATABASES = {
 }
 
 
+# Optional read replica for dashboard reads (see crasbi/db_routing.py).
+# Reads of safe /api/ requests go to the replica unless it lags too far behind.
+DATABASE_REPLICA_ALIAS = 'replica'
+DATABASE_REPLICA_HOST = config('DATABASE_REPLICA_HOST', default='')
+if DATABASE_REPLICA_HOST:
+    DATABASES[DATABASE_REPLICA_ALIAS] = {
+        **DATABASES['default'],
+        'HOST': DATABASE_REPLICA_HOST,
+        'PORT': config('DATABASE_REPLICA_PORT', default=DATABASES['default']['PORT']),
+        'OPTIONS': {
+            **DATABASES['default']['OPTIONS'],
+            'extra_params': DATABASES['default']['OPTIONS']['extra_params'] + 'ApplicationIntent=ReadOnly;',
+        },
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['crasbi.db_routing.ReplicaRouter']
+DATABASE_REPLICA_PATH_PREFIXES = ['/api/']
+DATABASE_REPLICA_MAX_LAG_SECONDS = config('DATABASE_REPLICA_MAX_LAG_SECONDS', default=30, cast=int)
+DATABASE_REPLICA_LAG_CHECK_SECONDS = config('DATABASE_REPLICA_LAG_CHECK_SECONDS', default=10, cast=int)
+DATABASE_REPLICA_PIN_SECONDS = config('DATABASE_REPLICA_PIN_SECONDS', default=10, cast=int)
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -149,6 +173,69 @@ REST_FRAMEWORK = {
     ],
 }
 
+# ETL execution retention
+ETL_RETENTION_DAYS = config('ETL_RETENTION_DAYS', default=90, cast=int)
+ETL_ARCHIVE_BATCH_SIZE = config('ETL_ARCHIVE_BATCH_SIZE', default=500, cast=int)
+
+# Source query profiling
+ETL_QUERY_REGRESSION_FACTOR = config('ETL_QUERY_REGRESSION_FACTOR', default=2.0, cast=float)
+ETL_QUERY_BASELINE_MIN_SAMPLES = config('ETL_QUERY_BASELINE_MIN_SAMPLES', default=5, cast=int)
+ETL_QUERY_BASELINE_ALPHA = config('ETL_QUERY_BASELINE_ALPHA', default=0.2, cast=float)
+
+# Run estimation and capacity planning
+ETL_ESTIMATE_HISTORY_DAYS = config('ETL_ESTIMATE_HISTORY_DAYS', default=30, cast=int)
+ETL_DEFAULT_ROWS_PER_SECOND = config('ETL_DEFAULT_ROWS_PER_SECOND', default=5000, cast=float)
+ETL_MAX_CONCURRENCY = config('ETL_MAX_CONCURRENCY', default=8, cast=int)
+
+# Streaming extract/load: rows per fetchmany, batches buffered per loader, idle pooled connections per database
+ETL_FETCH_BATCH_SIZE = config('ETL_FETCH_BATCH_SIZE', default=10000, cast=int)
+ETL_PIPELINE_QUEUE_DEPTH = config('ETL_PIPELINE_QUEUE_DEPTH', default=4, cast=int)
+ETL_CONNECTION_POOL_SIZE = config('ETL_CONNECTION_POOL_SIZE', default=4, cast=int)
+
+# Per-job fetch/insert batch size tuning; ETL_FETCH_BATCH_SIZE is the starting size
+ETL_ADAPTIVE_BATCH_SIZE = config('ETL_ADAPTIVE_BATCH_SIZE', default=True, cast=bool)
+ETL_MIN_BATCH_SIZE = config('ETL_MIN_BATCH_SIZE', default=500, cast=int)
+ETL_MAX_BATCH_SIZE = config('ETL_MAX_BATCH_SIZE', default=200000, cast=int)
+ETL_BATCH_MEMORY_BUDGET_MB = config('ETL_BATCH_MEMORY_BUDGET_MB', default=256, cast=int)
+
+# Per-source extract throttling: seconds to wait for a connection slot, and server
+# worker processes the source limits are split across
+ETL_THROTTLE_CONNECTION_TIMEOUT = config('ETL_THROTTLE_CONNECTION_TIMEOUT', default=600, cast=float)
+ETL_THROTTLE_WORKER_PROCESSES = config('ETL_THROTTLE_WORKER_PROCESSES', default=1, cast=int)
+
+# On-demand execution profiling (run_etl profile_execution or Job.profile_execution)
+ETL_PROFILE_SAMPLE_INTERVAL = config('ETL_PROFILE_SAMPLE_INTERVAL', default=0.005, cast=float)
+ETL_PROFILE_MEMORY_FRAMES = config('ETL_PROFILE_MEMORY_FRAMES', default=1, cast=int)
+ETL_PROFILE_TOP_ALLOCATIONS = config('ETL_PROFILE_TOP_ALLOCATIONS', default=50, cast=int)
+
+# Profile loaded data in-stream (counts, nulls, min/max, checksum) and enforce per-job quality_checks
+ETL_QUALITY_CHECKS = config('ETL_QUALITY_CHECKS', default=True, cast=bool)
+
+# Streamed job result preview/export: default and largest preview, export row and time limits,
+# rows fetched per streamed chunk
+ETL_PREVIEW_ROWS = config('ETL_PREVIEW_ROWS', default=100, cast=int)
+ETL_PREVIEW_MAX_ROWS = config('ETL_PREVIEW_MAX_ROWS', default=1000, cast=int)
+ETL_PREVIEW_MAX_SECONDS = config('ETL_PREVIEW_MAX_SECONDS', default=30, cast=float)
+ETL_EXPORT_MAX_ROWS = config('ETL_EXPORT_MAX_ROWS', default=1000000, cast=int)
+ETL_EXPORT_MAX_SECONDS = config('ETL_EXPORT_MAX_SECONDS', default=900, cast=float)
+ETL_STREAM_BATCH_SIZE = config('ETL_STREAM_BATCH_SIZE', default=1000, cast=int)
+
+# Per-job runtime baselines (duration, throughput, row count): moving average weight, runs before
+# anomalies are flagged, standard deviations and relative change an execution must exceed
+ETL_ANOMALY_BASELINE_ALPHA = config('ETL_ANOMALY_BASELINE_ALPHA', default=0.2, cast=float)
+ETL_ANOMALY_MIN_SAMPLES = config('ETL_ANOMALY_MIN_SAMPLES', default=5, cast=int)
+ETL_ANOMALY_Z_SCORE = config('ETL_ANOMALY_Z_SCORE', default=3.0, cast=float)
+ETL_ANOMALY_MIN_CHANGE = config('ETL_ANOMALY_MIN_CHANGE', default=0.5, cast=float)
+
+# Rows per INSERT/UPDATE statement for the bulk job definition API
+ETL_BULK_BATCH_SIZE = config('ETL_BULK_BATCH_SIZE', default=200, cast=int)
+
+# Admin on large tables: seconds filter choices are cached
+ADMIN_FILTER_CACHE_SECONDS = config('ADMIN_FILTER_CACHE_SECONDS', default=300, cast=int)
+
+# Serve high-volume list endpoints from plain values instead of ModelSerializers
+API_FAST_LIST_SERIALIZATION = config('API_FAST_LIST_SERIALIZATION', default=True, cast=bool)
+
 # CORS Configuration
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
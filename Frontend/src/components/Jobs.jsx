@@ -27,6 +27,8 @@ const JobsManager = () => {
     try {
       const response = await fetch(url, {
         ...options,
+        // Send the backend's primary-pin cookie so reads right after a write see it
+        credentials: 'include',
         headers: {
           'Content-Type': 'application/json',
           ...options.headers,
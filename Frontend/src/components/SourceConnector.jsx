@@ -28,6 +28,8 @@ const SourceConnectionManager = () => {
     try {
       const response = await fetch(url, {
         ...options,
+        // Send the backend's primary-pin cookie so reads right after a write see it
+        credentials: 'include',
         headers: {
           'Content-Type': 'application/json',
           // Add any additional headers your backend needs